@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark calculation_steps detail levels (steps=none|summary|full)
+
+Measures engine latency per calculation and, through the FastAPI app in-process,
+single-call and batch endpoint latency and response payload size.
+
+Usage: python benchmark_calculation_steps.py [batch_rows]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+logging.disable(logging.INFO)
+
+from fastapi.testclient import TestClient
+from fastapi_app.main import app, calculation_engine
+from fastapi_app.finance_models import CompanyType, CalculationStepDetail
+
+LEVELS = ["none", "summary", "full"]
+
+SAMPLE_REQUESTS = [
+    {
+        "formula_id": "1a-listed-equity",
+        "company_type": "listed",
+        "inputs": {"outstanding_amount": 1000000, "evic": 5000000, "verified_emissions": 1000}
+    },
+    {
+        "formula_id": "2a-listed-equity",
+        "company_type": "listed",
+        "inputs": {"outstanding_amount": 1000000, "evic": 5000000, "total_assets": 8000000,
+                   "energy_consumption": 250000, "emission_factor": 0.0005}
+    },
+    {
+        "formula_id": "1a-facilitated-listed",
+        "company_type": "listed",
+        "inputs": {"facilitated_amount": 2000000, "evic": 9000000, "weighting_factor": 0.33,
+                   "verified_emissions": 4200}
+    },
+]
+
+
+def bench_engine(iterations: int = 20000) -> None:
+    print("\n⚙️  Engine: CalculationEngine.calculate (µs per call)")
+    for request in SAMPLE_REQUESTS:
+        company_type = CompanyType.LISTED if request["company_type"] == "listed" else CompanyType.PRIVATE
+        timings = []
+        for level in LEVELS:
+            steps = CalculationStepDetail(level)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                calculation_engine.calculate(request["formula_id"], request["inputs"], company_type, steps)
+            timings.append((time.perf_counter() - start) / iterations * 1e6)
+        row = "  ".join(f"{level}={timing:7.2f}" for level, timing in zip(LEVELS, timings))
+        print(f"  {request['formula_id']:<24} {row}  (full/none = {timings[2] / timings[0]:.2f}x)")
+
+
+def bench_single_endpoint(client: TestClient, iterations: int = 500) -> None:
+    print("\n🌐 Endpoint: POST /finance-emission (ms per call, response bytes)")
+    for level in LEVELS:
+        body = dict(SAMPLE_REQUESTS[1], steps=level)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            response = client.post("/finance-emission", json=body)
+        elapsed = (time.perf_counter() - start) / iterations * 1e3
+        print(f"  steps={level:<8} {elapsed:6.3f} ms  {len(response.content):6d} bytes")
+
+
+def bench_batch_endpoint(client: TestClient, rows: int) -> None:
+    print(f"\n📦 Endpoint: POST /finance-emission/batch with {rows} rows")
+    body = "\n".join(json.dumps(SAMPLE_REQUESTS[i % 2]) for i in range(rows)).encode()
+    for level in LEVELS:
+        start = time.perf_counter()
+        response = client.post(f"/finance-emission/batch?steps={level}", content=body)
+        elapsed = time.perf_counter() - start
+        print(f"  steps={level:<8} {elapsed * 1e3:8.1f} ms  {len(response.content) / 1024:9.1f} KiB  "
+              f"({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    batch_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print("📊 calculation_steps detail benchmark")
+    print("=" * 60)
+    client = TestClient(app)
+    bench_engine()
+    bench_single_endpoint(client)
+    bench_batch_endpoint(client, batch_rows)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark serverless cold starts
+
+Every measurement runs in a fresh interpreter, as a new Lambda / Vercel
+instance would. Reports the cold import time of the main dependencies and
+app modules, which heavy modules the entry point loads, and the first and
+second request latency through the Mangum handler (API Gateway HTTP API v2
+events) for /health, /finance-emission and /scenario/calculate.
+
+Usage: python benchmark_startup.py [runs] [budget_ms]
+
+With budget_ms, exits with status 1 when the median entry-point import
+(api/index.py) takes longer.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "fastapi",
+    "numpy",
+    "supabase",
+    "fastapi_app.models",
+    "fastapi_app.formula_registry",
+    "fastapi_app.calculation_engine",
+    "fastapi_app.scenario_engine",
+    "fastapi_app.database",
+    "fastapi_app.main",
+]
+
+ENTRY_POINTS = ["api/index.py", "main.py"]
+
+# Loaded on first use; none of these should be imported by the entry point
+HEAVY_MODULES = ["numpy", "multiprocessing", "supabase", "httpx", "fastapi_app.scenario_engine"]
+
+REQUESTS = [
+    ("GET", "/health", None),
+    ("POST", "/finance-emission", {
+        "formula_id": "1a-listed-equity",
+        "company_type": "listed",
+        "inputs": {"outstanding_amount": 1000000, "evic": 5000000, "verified_emissions": 1000}
+    }),
+    ("POST", "/scenario/calculate", {
+        "scenario_type": "combined",
+        "portfolio_entries": [{
+            "id": "1", "company": "Acme", "amount": 1000000, "counterparty": "Acme",
+            "sector": "Energy", "geography": "US", "probability_of_default": 2.0,
+            "loss_given_default": 45.0, "tenor": 36
+        }]
+    }),
+]
+
+IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+ENTRY_SCRIPT = """
+import json, runpy, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+runpy.run_path({path!r})
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+REQUEST_SCRIPT = """
+import json, runpy, sys, time
+sys.path.insert(0, {root!r})
+handler = runpy.run_path({path!r})["handler"]
+method, path, body = {method!r}, {request_path!r}, {body!r}
+event = {{
+    "version": "2.0",
+    "routeKey": "$default",
+    "rawPath": path,
+    "rawQueryString": "",
+    "headers": {{"host": "localhost", "content-type": "application/json"}},
+    "requestContext": {{
+        "http": {{"method": method, "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1"}},
+        "stage": "$default",
+    }},
+    "body": body,
+    "isBase64Encoded": False,
+}}
+timings = []
+for _ in range(2):
+    start = time.perf_counter()
+    response = handler(dict(event), None)
+    timings.append(time.perf_counter() - start)
+print(json.dumps([timings, response["statusCode"]]))
+"""
+
+
+def run_fresh(script: str) -> str:
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "child failed")
+    return result.stdout.strip().splitlines()[-1]
+
+
+def bench_imports(runs: int) -> None:
+    print("\n📦 Cold import (ms, median of fresh interpreters)")
+    for module in MODULES:
+        try:
+            timings = [float(run_fresh(IMPORT_SCRIPT.format(root=ROOT, module=module))) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"  {module:<32} unavailable ({e})")
+            continue
+        print(f"  {module:<32} {statistics.median(timings) * 1e3:8.1f}")
+
+
+def bench_entry_points(runs: int) -> float:
+    """Returns the median api/index.py import time in ms"""
+    print("\n🚀 Entry point import (ms, median) and heavy modules loaded")
+    medians = {}
+    for path in ENTRY_POINTS:
+        samples = [json.loads(run_fresh(ENTRY_SCRIPT.format(root=ROOT, path=path, heavy=HEAVY_MODULES)))
+                   for _ in range(runs)]
+        medians[path] = statistics.median(elapsed for elapsed, _ in samples) * 1e3
+        loaded = ", ".join(samples[-1][1]) or "none"
+        print(f"  {path:<16} {medians[path]:8.1f}  heavy: {loaded}")
+    return medians[ENTRY_POINTS[0]]
+
+
+def bench_first_requests(runs: int) -> None:
+    print("\n🌐 Mangum handler, fresh instance (ms: first request, second request)")
+    for method, path, body in REQUESTS:
+        samples = [json.loads(run_fresh(REQUEST_SCRIPT.format(
+            root=ROOT, path=ENTRY_POINTS[0], method=method, request_path=path,
+            body=json.dumps(body) if body is not None else None
+        ))) for _ in range(runs)]
+        first = statistics.median(timings[0] for timings, _ in samples) * 1e3
+        second = statistics.median(timings[1] for timings, _ in samples) * 1e3
+        print(f"  {method:<4} {path:<22} {first:8.1f} {second:8.1f}  (status {samples[-1][1]})")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    print("❄️  Cold start benchmark")
+    print("=" * 60)
+    bench_imports(runs)
+    entry_ms = bench_entry_points(runs)
+    bench_first_requests(runs)
+    if budget_ms is not None:
+        if entry_ms > budget_ms:
+            print(f"\n❌ {ENTRY_POINTS[0]} import {entry_ms:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+            sys.exit(1)
+        print(f"\n✅ {ENTRY_POINTS[0]} import {entry_ms:.1f} ms is within the {budget_ms:.0f} ms budget")
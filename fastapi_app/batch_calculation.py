@@ -0,0 +1,240 @@
+"""
+Batch Calculation
+Vectorized financed/facilitated emission calculation over many exposure rows
+
+Rows are grouped by (formula_id, company_type). Each group is validated with
+the formula's compiled ValidationPlan, then denominators are resolved and the
+formula's CalculatorKernel computes attribution factors and financed emissions
+as NumPy column operations using the same arithmetic as its scalar variant, so
+results match the single-row path exactly. Rows carrying non-numeric values
+(and kernels without a vectorized variant) fall back to the single-row path so
+they fail (or succeed) with the same messages.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
+from .finance_models import CalculationStepDetail, CompanyType
+from .shared_formula_utils import get_denominator_for_company_type
+
+if TYPE_CHECKING:
+    from .calculation_engine import CalculationEngine
+
+
+# Denominator lookup order - mirrors get_denominator_for_company_type
+FORMULA_SPECIFIC_DENOMINATORS = (
+    'property_value_at_origination',
+    'total_value_at_origination',
+    'total_project_equity_plus_debt',
+    'ppp_adjusted_gdp'
+)
+DENOMINATOR_CANDIDATES = {
+    CompanyType.LISTED: ('evic', 'total_equity_plus_debt', 'total_assets') + FORMULA_SPECIFIC_DENOMINATORS,
+    CompanyType.PRIVATE: ('total_equity_plus_debt', 'evic', 'total_assets') + FORMULA_SPECIFIC_DENOMINATORS,
+}
+
+
+@dataclass
+class BatchCalculationResult:
+    """
+    Columnar batch calculation result
+    Row i of every column corresponds to row i of the input. Failed rows have
+    success=False, an error message, and NaN numeric values.
+    """
+    formula_id: List[str]
+    company_type: List[str]
+    success: np.ndarray
+    attribution_factor: np.ndarray
+    emission_factor: np.ndarray
+    financed_emissions: np.ndarray
+    denominator: np.ndarray
+    data_quality_score: np.ndarray
+    errors: List[Optional[str]]
+    warnings: List[List[str]] = field(default_factory=list)  # [] for rows without warnings
+
+    def __len__(self) -> int:
+        return len(self.formula_id)
+
+    @property
+    def error_count(self) -> int:
+        return int(len(self) - np.count_nonzero(self.success))
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """Plain-Python columns for JSON serialization (NaN becomes None)"""
+        def floats(values: np.ndarray) -> List[Optional[float]]:
+            return [None if value != value else value for value in values.tolist()]
+
+        return {
+            'formula_id': self.formula_id,
+            'company_type': self.company_type,
+            'success': self.success.tolist(),
+            'attribution_factor': floats(self.attribution_factor),
+            'emission_factor': floats(self.emission_factor),
+            'financed_emissions': floats(self.financed_emissions),
+            'denominator': floats(self.denominator),
+            'data_quality_score': self.data_quality_score.tolist(),
+            'errors': self.errors,
+            'warnings': self.warnings,
+        }
+
+
+# ============================================================================
+# ROW / COLUMN HELPERS
+# ============================================================================
+
+def normalize_company_type(company_type: Any) -> CompanyType:
+    """Map request company types ('listed' / 'unlisted' / enum) to CompanyType"""
+    if isinstance(company_type, CompanyType):
+        return company_type
+    return CompanyType.LISTED if company_type == "listed" else CompanyType.PRIVATE
+
+
+def _row_fields(row: Any) -> Tuple[str, Any, Dict[str, Any]]:
+    if isinstance(row, dict):
+        return row['formula_id'], row.get('company_type'), row.get('inputs') or {}
+    return row.formula_id, row.company_type, row.inputs or {}
+
+
+def _coerce_number(value: Any) -> Optional[float]:
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return None
+
+
+def _numeric_column(inputs_list: Sequence[Dict[str, Any]], key: str, bad: np.ndarray) -> np.ndarray:
+    """
+    Extract one input as a float64 column (missing/None -> 0)
+    Rows holding non-numeric values are flagged in `bad` and set to 0.
+    """
+    values = [inputs.get(key) for inputs in inputs_list]
+    column = np.array([0 if value is None else value for value in values])
+    if column.dtype.kind in 'fiub':
+        return column.astype(np.float64, copy=False)
+
+    # Slow path: mixed or non-numeric data
+    column = np.zeros(len(values), dtype=np.float64)
+    for index, value in enumerate(values):
+        number = _coerce_number(value)
+        if number is None:
+            bad[index] = True
+        else:
+            column[index] = number
+    return column
+
+
+# ============================================================================
+# BATCH ENTRY POINT
+# ============================================================================
+
+def calculate_batch(engine: 'CalculationEngine', rows: Sequence[Any]) -> BatchCalculationResult:
+    """
+    Calculate many rows, grouped by formula and company type
+    Each row is a dict (or request model) with formula_id, company_type and inputs.
+    """
+    size = len(rows)
+    formula_ids: List[str] = [''] * size
+    company_types: List[str] = [''] * size
+    success = np.zeros(size, dtype=bool)
+    attribution = np.full(size, np.nan)
+    emission_factor = np.full(size, np.nan)
+    financed = np.full(size, np.nan)
+    denominators = np.full(size, np.nan)
+    quality = np.zeros(size, dtype=np.int64)
+    errors: List[Optional[str]] = [None] * size
+    warnings: List[List[str]] = [[] for _ in range(size)]
+
+    # Group row indexes by (formula_id, company_type)
+    groups: Dict[Tuple[str, CompanyType], List[int]] = {}
+    inputs_by_row: List[Dict[str, Any]] = [{}] * size
+    for index, row in enumerate(rows):
+        formula_id, raw_company_type, inputs = _row_fields(row)
+        company_type = normalize_company_type(raw_company_type)
+        formula_ids[index] = formula_id
+        company_types[index] = company_type.value
+        inputs_by_row[index] = inputs
+        groups.setdefault((formula_id, company_type), []).append(index)
+
+    for (formula_id, company_type), indexes in groups.items():
+        formula = engine.get_formula_by_id(formula_id)
+        if formula is None:
+            for index in indexes:
+                errors[index] = f"Formula '{formula_id}' not found"
+            continue
+
+        # Validate the whole group with the compiled plan
+        plan = engine.registry.validation_plan(formula_id)
+        valid: List[int] = []
+        for index, (row_errors, row_warnings, _) in zip(indexes, plan.evaluate_batch(inputs_by_row[i] for i in indexes)):
+            if row_errors:
+                errors[index] = f"Validation failed: {', '.join(row_errors)}"
+            else:
+                warnings[index] = list(row_warnings)
+                valid.append(index)
+        if not valid:
+            continue
+
+        group_inputs = [inputs_by_row[i] for i in valid]
+        bad = np.zeros(len(valid), dtype=bool)
+        cache: Dict[str, np.ndarray] = {}
+
+        def column(key: str) -> np.ndarray:
+            if key not in cache:
+                cache[key] = _numeric_column(group_inputs, key, bad)
+            return cache[key]
+
+        # Resolve denominators: first candidate with a positive value
+        denominator = np.zeros(len(valid))
+        for key in DENOMINATOR_CANDIDATES[company_type]:
+            values = column(key)
+            denominator = np.where((denominator == 0) & (values > 0), values, denominator)
+
+        # Kernels without a vectorized variant run every row on the single-row path
+        kernel = engine.registry.kernel(formula_id)
+        if kernel.vector is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                group_attribution, group_emission_factor, group_financed = kernel.vector(column, denominator)
+            ok = (denominator > 0) & ~bad
+            rows_ok = np.asarray(valid)[ok]
+            success[rows_ok] = True
+            attribution[rows_ok] = group_attribution[ok]
+            emission_factor[rows_ok] = group_emission_factor[ok]
+            financed[rows_ok] = group_financed[ok]
+            denominators[rows_ok] = denominator[ok]
+            quality[rows_ok] = formula.data_quality_score
+        else:
+            ok = np.zeros(len(valid), dtype=bool)
+
+        # Rows with unusual data take the single-row path for identical errors/results
+        for position in np.flatnonzero(~ok):
+            index = valid[position]
+            inputs = inputs_by_row[index]
+            try:
+                if not bad[position]:
+                    get_denominator_for_company_type(inputs, company_type.value)
+                result = engine.calculate(formula_id, inputs, company_type, CalculationStepDetail.NONE)
+            except Exception as error:
+                errors[index] = str(error)
+                warnings[index] = []
+                continue
+            success[index] = True
+            if denominator[position] > 0 and not bad[position]:
+                denominators[index] = denominator[position]
+            attribution[index] = result.attribution_factor
+            emission_factor[index] = result.emission_factor
+            financed[index] = result.financed_emissions
+            quality[index] = result.data_quality_score
+
+    return BatchCalculationResult(
+        formula_id=formula_ids,
+        company_type=company_types,
+        success=success,
+        attribution_factor=attribution,
+        emission_factor=emission_factor,
+        financed_emissions=financed,
+        denominator=denominators,
+        data_quality_score=quality,
+        errors=errors,
+        warnings=warnings
+    )
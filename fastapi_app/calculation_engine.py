@@ -7,26 +7,24 @@ Migrated from: src/pages/finance_facilitated/engines/CalculationEngine.ts
 No formulas or working logic has been changed - only converted from TypeScript to Python.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 import logging
 from .finance_models import (
     FormulaConfig, CalculationResult, FormulaValidationResult, 
-    CompanyType, FormulaCategory, CalculationStep
+    CompanyType, FormulaCategory, ScopeType, CalculationStepDetail
 )
 from .shared_formula_utils import (
-    calculate_attribution_factor_listed, calculate_attribution_factor_unlisted,
-    validate_financial_inputs, get_denominator_for_company_type,
-    create_emission_calculation_steps, create_activity_calculation_steps
+    validate_financial_inputs, create_summary_calculation_steps
 )
 from .unit_conversions import smart_convert_unit
-from .formula_configs import BASIC_FORMULAS
-from .corporate_bond_business_loan_configs import CORPORATE_BOND_BUSINESS_LOAN_FORMULAS
-from .commercial_real_estate_configs import COMMERCIAL_REAL_ESTATE_FORMULAS
-from .mortgage_configs import MORTGAGE_FORMULAS
-from .motor_vehicle_loan_configs import MOTOR_VEHICLE_LOAN_FORMULAS
-from .project_finance_configs import PROJECT_FINANCE_FORMULAS
-from .sovereign_debt_configs import SOVEREIGN_DEBT_FORMULAS
-from .facilitated_emission_configs import FACILITATED_EMISSION_FORMULAS
+from .formula_registry import FormulaRegistry, DEFAULT_FORMULA_REGISTRY
+from .tracing import tracer
+from .result_cache import CacheKey, ResultCache, create_default_cache, make_cache_key
+from .calculators import CalculationContext
+from .multi_calculation import ExecutorOption, MultipleCalculationResult, calculate_multiple
+
+if TYPE_CHECKING:
+    from .batch_calculation import BatchCalculationResult
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -39,36 +37,45 @@ class CalculationEngine:
     Handles validation, calculation, and result processing
     """
     
-    def __init__(self):
-        """Initialize the calculation engine with all formulas"""
-        # Load all formula configurations
-        self.formulas: List[FormulaConfig] = (
-            BASIC_FORMULAS +
-            CORPORATE_BOND_BUSINESS_LOAN_FORMULAS +
-            COMMERCIAL_REAL_ESTATE_FORMULAS +
-            MORTGAGE_FORMULAS +
-            MOTOR_VEHICLE_LOAN_FORMULAS +
-            PROJECT_FINANCE_FORMULAS +
-            SOVEREIGN_DEBT_FORMULAS +
-            FACILITATED_EMISSION_FORMULAS
-        )
-        logger.info(f"Loaded {len(self.formulas)} formula configurations")
+    def __init__(self, registry: Optional[FormulaRegistry] = None, cache: Optional[ResultCache] = None):
+        """
+        Initialize the calculation engine with all formulas
+        `cache` memoizes calculate() results; by default it is configured from
+        CALC_CACHE_* environment variables (CALC_CACHE_ENABLED=0 disables it).
+        """
+        # The default registry is built once at import time and shared between engines
+        self.registry = registry if registry is not None else DEFAULT_FORMULA_REGISTRY
+        self.cache = cache if cache is not None else create_default_cache()
+        logger.info(f"Loaded {len(self.registry)} formula configurations")
+    
+    @property
+    def formulas(self) -> List[FormulaConfig]:
+        """All formula configurations in lookup priority order"""
+        return self.registry.formulas
     
     def get_all_formulas(self) -> List[FormulaConfig]:
         """Get all available formulas"""
         return self.formulas
     
-    def get_formulas_by_category(self, category: FormulaCategory) -> List[FormulaConfig]:
-        """Get formulas by category"""
-        return [formula for formula in self.formulas if formula.category == category]
+    def get_formulas_by_category(self, category: FormulaCategory) -> Sequence[FormulaConfig]:
+        """Get formulas by category (precomputed, read-only)"""
+        return self.registry.by_category(category)
+    
+    def get_formulas_by_score(self, score: int) -> Sequence[FormulaConfig]:
+        """Get formulas by data quality score (precomputed, read-only)"""
+        return self.registry.by_score(score)
     
-    def get_formulas_by_score(self, score: int) -> List[FormulaConfig]:
-        """Get formulas by data quality score"""
-        return [formula for formula in self.formulas if formula.data_quality_score == score]
+    def get_formulas_by_option_code(self, option_code: str) -> Sequence[FormulaConfig]:
+        """Get formulas by PCAF option code (precomputed, read-only)"""
+        return self.registry.by_option_code(option_code)
+    
+    def get_formulas_by_scope(self, scope: ScopeType) -> Sequence[FormulaConfig]:
+        """Get formulas applicable to an emission scope (precomputed, read-only)"""
+        return self.registry.by_scope(scope)
     
     def get_formula_by_id(self, formula_id: str) -> Optional[FormulaConfig]:
         """Get formula by ID"""
-        return next((formula for formula in self.formulas if formula.id == formula_id), None)
+        return self.registry.get(formula_id)
     
     def get_applicable_formulas(self, company_type: CompanyType) -> List[FormulaConfig]:
         """Get applicable formulas for a company type"""
@@ -82,14 +89,9 @@ class CalculationEngine:
         Migrated from: validateInputs
         """
         formula = self.get_formula_by_id(formula_id)
-        
-        # DEBUG: Log validation details
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Formula ID: {formula_id}')
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Formula: {formula.name if formula else "Not found"}')
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Inputs received: {inputs}')
-        if formula:
-            required_inputs = [input_field.name for input_field in formula.inputs if input_field.required]
-            logger.info(f'🔍 CALCULATION ENGINE DEBUG - Required inputs: {required_inputs}')
+        traced = tracer.sample()
+        if traced:
+            self._trace_request(formula_id, formula, inputs)
         
         if not formula:
             return FormulaValidationResult(
@@ -99,108 +101,122 @@ class CalculationEngine:
                 missing_inputs=[]
             )
         
-        errors: List[str] = []
-        warnings: List[str] = []
-        missing_inputs: List[str] = []
-        
-        # Check required inputs
-        for input_field in formula.inputs:
-            if input_field.required:
-                logger.info(f'🔍 CALCULATION ENGINE DEBUG - Checking required input: {input_field.name} = {inputs.get(input_field.name)}')
-                if input_field.name not in inputs or inputs[input_field.name] is None:
-                    logger.info(f'❌ CALCULATION ENGINE DEBUG - Missing required input: {input_field.name}')
-                    missing_inputs.append(input_field.name)
-                    errors.append(f"{input_field.label} is required")
-                elif input_field.type == 'number' and (not isinstance(inputs[input_field.name], (int, float)) or inputs[input_field.name] < 0):
-                    logger.info(f'❌ CALCULATION ENGINE DEBUG - Invalid number input: {input_field.name} = {inputs[input_field.name]}')
-                    errors.append(f"{input_field.label} must be a non-negative number")
-                else:
-                    logger.info(f'✅ CALCULATION ENGINE DEBUG - Valid required input: {input_field.name} = {inputs[input_field.name]}')
-        
-        # Check input validation rules
-        for input_field in formula.inputs:
-            if input_field.name in inputs and input_field.validation:
-                value = inputs[input_field.name]
-                
-                if 'min' in input_field.validation and value < input_field.validation['min']:
-                    errors.append(f"{input_field.label} must be at least {input_field.validation['min']}")
-                
-                if 'max' in input_field.validation and value > input_field.validation['max']:
-                    errors.append(f"{input_field.label} must be at most {input_field.validation['max']}")
-                
-                if 'pattern' in input_field.validation and isinstance(value, str):
-                    import re
-                    if not re.match(input_field.validation['pattern'], value):
-                        errors.append(f"{input_field.label} format is invalid")
-        
-        # Add formula-specific validations
-        self._add_formula_specific_validations(formula, inputs, errors, warnings)
-        
-        # DEBUG: Log final validation result
-        logger.info('🔍 CALCULATION ENGINE DEBUG - Final validation result:')
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Is Valid: {len(errors) == 0}')
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Errors: {errors}')
-        logger.info(f'🔍 CALCULATION ENGINE DEBUG - Missing Inputs: {missing_inputs}')
-        
-        return FormulaValidationResult(
-            is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings,
-            missing_inputs=missing_inputs
-        )
+        return self._validate(formula, inputs, traced)
+    
+    def validate_inputs_batch(self, formula_id: str, rows: List[Dict[str, Any]]) -> List[FormulaValidationResult]:
+        """
+        Validate many input rows against a single formula
+        """
+        plan = self.registry.validation_plan(formula_id)
+        if plan is None:
+            not_found = f"Formula '{formula_id}' not found"
+            return [
+                FormulaValidationResult(is_valid=False, errors=[not_found], warnings=[], missing_inputs=[])
+                for _ in rows
+            ]
+        return plan.validate_batch(rows)
     
     def calculate(
         self,
         formula_id: str,
         inputs: Dict[str, Any],
-        company_type: CompanyType
+        company_type: CompanyType,
+        steps: CalculationStepDetail = CalculationStepDetail.FULL
     ) -> CalculationResult:
         """
         Calculate financed emissions using a specific formula
         Migrated from: calculate
+        
+        `steps` controls how much calculation_steps detail is built; NONE skips
+        step construction entirely. Successful results are memoized in the
+        result cache (when enabled); failures are never cached.
         """
+        steps = CalculationStepDetail(steps)
+        cache_key, cached = self._cache_lookup(formula_id, inputs, company_type, steps)
+        if cached is not None:
+            return cached
+        
         formula = self.get_formula_by_id(formula_id)
+        traced = tracer.sample()
+        if traced:
+            self._trace_request(formula_id, formula, inputs)
         
         if not formula:
             raise ValueError(f"Formula '{formula_id}' not found")
         
         # Validate inputs first
-        validation = self.validate_inputs(formula_id, inputs)
+        validation = self._validate(formula, inputs, traced)
         if not validation.is_valid:
             raise ValueError(f"Validation failed: {', '.join(validation.errors)}")
         
         # Execute calculation based on formula type
-        result = self._execute_calculation(formula, inputs, company_type)
-        
-        # Add validation warnings to result metadata
-        if validation.warnings:
-            if result.metadata is None:
-                result.metadata = {}
-            result.metadata['validationWarnings'] = validation.warnings
+        result = self._execute_calculation(formula, inputs, company_type, steps)
+        self._add_validation_warnings(result, validation)
         
+        self._cache_store(cache_key, result)
         return result
     
+    def cache_stats(self) -> Dict[str, Any]:
+        """Result cache hit/miss counters and occupancy"""
+        if self.cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.cache.stats()}
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized calculation results"""
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def calculate_batch(self, rows: List[Any]) -> 'BatchCalculationResult':
+        """
+        Calculate many exposure rows at once
+        Each row is a dict (or request model) with formula_id, company_type and inputs.
+        Rows are grouped by formula and company type and computed as NumPy column
+        operations; per-row failures are reported in the result's errors column.
+        """
+        # Imported on first use: it loads NumPy, which the scalar path never needs
+        from .batch_calculation import calculate_batch
+        return calculate_batch(self, rows)
+    
     def calculate_multiple(
         self,
         formula_ids: List[str],
         inputs: Dict[str, Any],
-        company_type: CompanyType
+        company_type: CompanyType,
+        steps: CalculationStepDetail = CalculationStepDetail.FULL
     ) -> Dict[str, CalculationResult]:
         """
         Calculate multiple formulas and return results
         Migrated from: calculateMultiple
-        """
-        results = {}
         
-        for formula_id in formula_ids:
-            try:
-                result = self.calculate(formula_id, inputs, company_type)
-                results[formula_id] = result
-            except Exception as error:
-                logger.error(f"Failed to calculate {formula_id}: {error}")
-                # Continue with other calculations
-        
-        return results
+        Failed formulas are logged and left out; use calculate_multiple_detailed
+        to get per-formula errors.
+        """
+        outcome = self.calculate_multiple_detailed(formula_ids, inputs, company_type, steps)
+        for formula_id, error in outcome.errors.items():
+            logger.error("Failed to calculate %s: %s", formula_id, error.message)
+        return outcome.results
+    
+    def calculate_multiple_detailed(
+        self,
+        formula_ids: List[str],
+        inputs: Dict[str, Any],
+        company_type: CompanyType,
+        steps: CalculationStepDetail = CalculationStepDetail.FULL,
+        executor: ExecutorOption = None,
+        max_workers: Optional[int] = None
+    ) -> MultipleCalculationResult:
+        """
+        Calculate several formulas over one input set
+        The denominator and attribution factors are resolved once and shared by
+        every formula kernel. Per-formula failures are returned as structured
+        errors. `executor` ('thread', 'process' or an Executor) fans large
+        formula sets out across a pool.
+        """
+        return calculate_multiple(
+            self, formula_ids, inputs, company_type, CalculationStepDetail(steps),
+            executor=executor, max_workers=max_workers
+        )
     
     def get_best_formula(
         self,
@@ -212,15 +228,34 @@ class CalculationEngine:
         Get the best available formula based on data quality and available inputs
         Migrated from: getBestFormula
         """
-        applicable_formulas = [
-            formula for formula in self.get_formulas_by_category(category)
-            if self._has_required_inputs(formula, available_inputs)
-        ]
-        
-        # Sort by data quality score (lower is better)
-        applicable_formulas.sort(key=lambda f: f.data_quality_score)
-        
-        return applicable_formulas[0] if applicable_formulas else None
+        return self.registry.best_formula(self.registry.input_mask(available_inputs), category)
+    
+    def get_best_formulas(
+        self,
+        rows: Iterable[Union[Iterable[str], Dict[str, Any]]],
+        company_type: CompanyType,
+        category: FormulaCategory
+    ) -> List[Optional[FormulaConfig]]:
+        """
+        Pick the best formula for every row of a portfolio
+        Each row is either a collection of available input names or an inputs
+        dict (keys with a None value count as unavailable). Rows with the same
+        set of known inputs share one lookup.
+        """
+        registry = self.registry
+        input_mask = registry.input_mask
+        best_by_mask: Dict[int, Optional[FormulaConfig]] = {}
+        selected: List[Optional[FormulaConfig]] = []
+        
+        for row in rows:
+            if isinstance(row, dict):
+                row = [name for name, value in row.items() if value is not None]
+            mask = input_mask(row)
+            if mask not in best_by_mask:
+                best_by_mask[mask] = registry.best_formula(mask, category)
+            selected.append(best_by_mask[mask])
+        
+        return selected
     
     def get_calculation_summary(self, result: CalculationResult) -> Dict[str, Any]:
         """
@@ -292,73 +327,93 @@ class CalculationEngine:
     # PRIVATE HELPER METHODS
     # ============================================================================
     
-    def _add_formula_specific_validations(
+    def _trace_request(self, formula_id: str, formula: Optional[FormulaConfig], inputs: Dict[str, Any]) -> None:
+        """
+        Emit request-level debug trace (only called for sampled requests)
+        """
+        tracer.trace('CALCULATION ENGINE TRACE - Formula ID: %s', formula_id)
+        tracer.trace('CALCULATION ENGINE TRACE - Formula: %s', formula.name if formula else 'Not found')
+        tracer.trace('CALCULATION ENGINE TRACE - Inputs received: %r', inputs)
+    
+    def _cache_lookup(
         self,
-        formula: FormulaConfig,
+        formula_id: str,
         inputs: Dict[str, Any],
-        errors: List[str],
-        warnings: List[str]
-    ) -> None:
+        company_type: CompanyType,
+        steps: CalculationStepDetail
+    ) -> Tuple[Optional[CacheKey], Optional[CalculationResult]]:
         """
-        Add formula-specific validations
-        Migrated from: addFormulaSpecificValidations
+        Look a calculation up in the result cache
+        Returns (cache key, cached result); the key is None when caching is off
+        or the inputs can't be keyed.
         """
-        # Option 1a/1b specific validations
-        if formula.option_code in ['1a', '1b']:
-            outstanding_amount = inputs.get('outstanding_amount', 0)
-            evic = inputs.get('evic', 0)
-            if outstanding_amount and evic and outstanding_amount > evic:
-                warnings.append('Outstanding amount exceeds EVIC - please verify data')
-        
-        # Option 2a specific validations
-        if formula.option_code == '2a':
-            energy_consumption = inputs.get('energy_consumption', 0)
-            emission_factor = inputs.get('emission_factor', 0)
-            if energy_consumption and emission_factor:
-                calculated_emissions = energy_consumption * emission_factor
-                if calculated_emissions > 1000000:  # 1 million tCO2e
-                    warnings.append('Very high calculated emissions - please verify emission factors')
+        cache = self.cache
+        if cache is None:
+            return None, None
+        cache.bind_registry_version(self.registry.version)
+        cache_key = make_cache_key(formula_id, company_type.value, steps.value, inputs)
+        if cache_key is None:
+            return None, None
+        return cache_key, cache.get(cache_key)
+    
+    def _cache_store(self, cache_key: Optional[CacheKey], result: CalculationResult) -> None:
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
+    
+    def _add_validation_warnings(self, result: CalculationResult, validation: FormulaValidationResult) -> None:
+        """Add validation warnings to result metadata"""
+        if validation.warnings:
+            if result.metadata is None:
+                result.metadata = {}
+            result.metadata['validationWarnings'] = validation.warnings
+    
+    def _validate(self, formula: FormulaConfig, inputs: Dict[str, Any], traced: bool = False) -> FormulaValidationResult:
+        """
+        Run the formula's precompiled validation plan
+        """
+        plan = self.registry.validation_plan(formula.id)
+        validation = plan(inputs)
+        
+        if traced:
+            tracer.trace('CALCULATION ENGINE TRACE - Required inputs: %s', plan.required_inputs)
+            tracer.trace(
+                'CALCULATION ENGINE TRACE - Is Valid: %s, Errors: %s, Missing Inputs: %s',
+                validation.is_valid, validation.errors, validation.missing_inputs
+            )
         
-        # General validations
-        outstanding_amount = inputs.get('outstanding_amount', 0)
-        if outstanding_amount and outstanding_amount < 0:
-            errors.append('Outstanding amount must be non-negative')
+        return validation
     
     def _execute_calculation(
         self,
         formula: FormulaConfig,
         inputs: Dict[str, Any],
-        company_type: CompanyType
+        company_type: CompanyType,
+        steps: CalculationStepDetail = CalculationStepDetail.FULL,
+        context: Optional[CalculationContext] = None
     ) -> CalculationResult:
         """
-        Execute the actual calculation based on formula type
+        Execute the actual calculation with the formula's bound calculator kernel
+        Pass a shared `context` to reuse the denominator and attribution factors
+        across formulas evaluated on the same inputs.
         """
-        # This is where the specific formula calculations would be implemented
-        # For now, we'll implement a basic structure that can be extended
-        
-        # Get the denominator based on company type
-        denominator = get_denominator_for_company_type(inputs, company_type.value)
-        outstanding_amount = inputs.get('outstanding_amount', 0)
+        if context is None:
+            context = CalculationContext(inputs, company_type)
         
-        # Calculate attribution factor based on formula type
-        if formula.category.value == 'facilitated_emission':
-            # For facilitated emissions, use facilitated_amount
-            facilitated_amount = inputs.get('facilitated_amount', 0)
-            if company_type == CompanyType.LISTED:
-                attribution_factor = calculate_attribution_factor_listed(facilitated_amount, denominator)
-            else:
-                attribution_factor = calculate_attribution_factor_unlisted(facilitated_amount, denominator)
-        else:
-            # For finance emissions, use outstanding_amount
-            if company_type == CompanyType.LISTED:
-                attribution_factor = calculate_attribution_factor_listed(outstanding_amount, denominator)
-            else:
-                attribution_factor = calculate_attribution_factor_unlisted(outstanding_amount, denominator)
+        # Resolve the denominator up front: every formula type fails without one,
+        # including callables that derive their own
+        context.denominator
         
-        # Calculate financed emissions based on formula type
-        financed_emissions, emission_factor, calculation_steps = self._calculate_emissions(
-            formula, inputs, outstanding_amount, denominator, company_type
+        # Run the calculator kernel bound to this formula at registry build time
+        kernel = self.registry.kernel(formula.id)
+        attribution_factor, emission_factor, financed_emissions, calculation_steps = kernel.scalar(
+            context, steps is CalculationStepDetail.FULL
         )
+        if steps is CalculationStepDetail.SUMMARY:
+            emissions_label = (
+                'Facilitated Emissions' if formula.category == FormulaCategory.FACILITATED_EMISSION
+                else 'Financed Emissions'
+            )
+            calculation_steps = create_summary_calculation_steps(attribution_factor, financed_emissions, emissions_label)
         
         return CalculationResult(
             attribution_factor=attribution_factor,
@@ -374,86 +429,3 @@ class CalculationEngine:
                 'option_code': formula.option_code
             }
         )
-    
-    def _calculate_emissions(
-        self,
-        formula: FormulaConfig,
-        inputs: Dict[str, Any],
-        outstanding_amount: float,
-        denominator: float,
-        company_type: CompanyType
-    ) -> Tuple[float, float, List[CalculationStep]]:
-        """
-        Calculate emissions based on formula type
-        """
-        # Check if this is a facilitated emission
-        if formula.category.value == 'facilitated_emission':
-            # Facilitated emission calculation
-            facilitated_amount = inputs.get('facilitated_amount', 0)
-            weighting_factor = inputs.get('weighting_factor', 0)
-            emission_data = inputs.get('verified_emissions', 0) or inputs.get('unverified_emissions', 0)
-            
-            # For facilitated emissions: (Facilitated Amount / Company Value) × Weighting Factor × Emission Data
-            attribution_factor = facilitated_amount / denominator if denominator > 0 else 0
-            financed_emissions = attribution_factor * weighting_factor * emission_data
-            emission_factor = 0  # Not applicable for direct emissions
-            
-            calculation_steps = [
-                CalculationStep(
-                    step='Attribution Factor',
-                    value=attribution_factor,
-                    formula=f"{facilitated_amount} / {denominator} = {attribution_factor:.6f}"
-                ),
-                CalculationStep(
-                    step='Weighting Factor',
-                    value=weighting_factor,
-                    formula=f"Fixed weighting factor: {weighting_factor}"
-                ),
-                CalculationStep(
-                    step='Facilitated Emissions',
-                    value=financed_emissions,
-                    formula=f"({facilitated_amount} / {denominator:.2f}) × {weighting_factor} × {emission_data} = {financed_emissions:.2f}"
-                )
-            ]
-            
-        elif formula.option_code in ['1a', '1b']:
-            # Direct emission data (finance emissions)
-            emission_data = inputs.get('verified_emissions', 0) or inputs.get('unverified_emissions', 0)
-            emission_factor = 0  # Not applicable for direct emissions
-            financed_emissions = (outstanding_amount / denominator) * emission_data
-            
-            calculation_steps = create_emission_calculation_steps(
-                outstanding_amount, denominator, emission_data,
-                'Emission Data', company_type.value
-            )
-            
-        elif formula.option_code in ['2a', '2b']:
-            # Activity-based calculation
-            activity_data = inputs.get('energy_consumption', 0) or inputs.get('production', 0)
-            emission_factor = inputs.get('emission_factor', 0) or inputs.get('production_emission_factor', 0)
-            calculated_emissions = activity_data * emission_factor
-            financed_emissions = (outstanding_amount / denominator) * calculated_emissions
-            
-            activity_label = 'Energy Consumption' if formula.option_code == '2a' else 'Production'
-            emission_factor_label = 'Emission Factor' if formula.option_code == '2a' else 'Production Emission Factor'
-            
-            calculation_steps = create_activity_calculation_steps(
-                outstanding_amount, denominator, activity_data, activity_label,
-                emission_factor, emission_factor_label, company_type.value
-            )
-            
-        else:
-            # Default case
-            emission_data = 0
-            emission_factor = 0
-            financed_emissions = 0
-            calculation_steps = []
-        
-        return financed_emissions, emission_factor, calculation_steps
-    
-    def _has_required_inputs(self, formula: FormulaConfig, available_inputs: List[str]) -> bool:
-        """
-        Check if formula has all required inputs available
-        """
-        required_inputs = [input_field.name for input_field in formula.inputs if input_field.required]
-        return all(input_name in available_inputs for input_name in required_inputs)
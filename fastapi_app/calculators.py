@@ -0,0 +1,308 @@
+"""
+Calculators
+Per-formula calculation kernels bound once at registry build time
+
+Each formula id is bound to a CalculatorKernel holding a scalar variant (one
+CalculationContext -> attribution factor, emission factor, financed emissions
+and calculation steps) and, where possible, a vectorized variant over NumPy
+columns used by calculate_batch. The arithmetic matches the original
+CalculationEngine._calculate_emissions branches exactly.
+
+Formulas that carry their own `calculate=` callable (the facilitated emission
+configs) run it when the company components it derives its denominator from
+(e.g. share price and outstanding shares for EVIC) are present; otherwise the
+formula's category kernel is used.
+
+NumPy is imported by the vectorized variants when they first run, so the
+scalar path (and application startup) does not load it.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+from .finance_models import CalculationStep, CompanyType, FormulaCategory, FormulaConfig
+from .shared_formula_utils import (
+    calculate_attribution_factor_listed, calculate_attribution_factor_unlisted,
+    create_emission_calculation_steps, create_activity_calculation_steps,
+    get_denominator_for_company_type
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class KernelResult(NamedTuple):
+    """Output of a scalar kernel"""
+    attribution_factor: float
+    emission_factor: float
+    financed_emissions: float
+    calculation_steps: List[CalculationStep]
+
+
+class CalculationContext:
+    """
+    Intermediates shared by every formula evaluated on one input set
+    The denominator and attribution factors are resolved lazily, once; a
+    denominator lookup failure is remembered and re-raised on each access.
+    """
+
+    __slots__ = ('inputs', 'company_type', '_denominator', '_denominator_error', '_attributions')
+
+    def __init__(self, inputs: Dict[str, Any], company_type: CompanyType):
+        self.inputs = inputs
+        self.company_type = company_type
+        self._denominator: Optional[float] = None
+        self._denominator_error: Optional[Exception] = None
+        self._attributions: Dict[str, float] = {}
+
+    @property
+    def denominator(self) -> float:
+        if self._denominator is None:
+            if self._denominator_error is not None:
+                raise self._denominator_error
+            try:
+                self._denominator = get_denominator_for_company_type(self.inputs, self.company_type.value)
+            except Exception as error:
+                self._denominator_error = error
+                raise
+        return self._denominator
+
+    def attribution(self, amount_key: str) -> float:
+        """Attribution factor of inputs[amount_key] over the denominator"""
+        attribution_factor = self._attributions.get(amount_key)
+        if attribution_factor is None:
+            attribution_factor = _attribution(self.inputs.get(amount_key, 0), self.denominator, self.company_type)
+            self._attributions[amount_key] = attribution_factor
+        return attribution_factor
+
+
+# scalar(context, build_steps) -> KernelResult
+ScalarKernel = Callable[[CalculationContext, bool], KernelResult]
+# vector(column, denominator) -> (attribution_factor, emission_factor, financed_emissions)
+ColumnGetter = Callable[[str], 'np.ndarray']
+VectorKernel = Callable[[ColumnGetter, 'np.ndarray'], Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']]
+
+
+class CalculatorKernel:
+    """
+    Compiled calculator for a single formula
+    `vector` is None when the kernel can only run row by row.
+    """
+
+    __slots__ = ('name', 'formula_id', 'scalar', 'vector')
+
+    def __init__(self, name: str, formula_id: str, scalar: ScalarKernel, vector: Optional[VectorKernel] = None):
+        self.name = name
+        self.formula_id = formula_id
+        self.scalar = scalar
+        self.vector = vector
+
+    def __repr__(self) -> str:
+        return f"CalculatorKernel({self.formula_id!r}, {self.name!r})"
+
+
+def _attribution(amount: float, denominator: float, company_type: CompanyType) -> float:
+    if company_type == CompanyType.LISTED:
+        return calculate_attribution_factor_listed(amount, denominator)
+    return calculate_attribution_factor_unlisted(amount, denominator)
+
+
+def _first_nonzero(primary: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """Vectorized `primary or fallback`"""
+    import numpy as np
+    return np.where(primary != 0, primary, fallback)
+
+
+# ============================================================================
+# KERNEL FACTORIES
+# ============================================================================
+
+def _facilitated_kernel(formula: FormulaConfig) -> CalculatorKernel:
+    """(Facilitated Amount / Company Value) × Weighting Factor × Emission Data"""
+
+    def scalar(context: CalculationContext, build_steps: bool) -> KernelResult:
+        inputs, denominator = context.inputs, context.denominator
+        facilitated_amount = inputs.get('facilitated_amount', 0)
+        attribution_factor = context.attribution('facilitated_amount')
+        weighting_factor = inputs.get('weighting_factor', 0)
+        emission_data = inputs.get('verified_emissions', 0) or inputs.get('unverified_emissions', 0)
+
+        facilitated_attribution = facilitated_amount / denominator if denominator > 0 else 0
+        financed_emissions = facilitated_attribution * weighting_factor * emission_data
+
+        calculation_steps: List[CalculationStep] = []
+        if build_steps:
+            calculation_steps = [
+                CalculationStep(
+                    step='Attribution Factor',
+                    value=facilitated_attribution,
+                    formula=f"{facilitated_amount} / {denominator} = {facilitated_attribution:.6f}"
+                ),
+                CalculationStep(
+                    step='Weighting Factor',
+                    value=weighting_factor,
+                    formula=f"Fixed weighting factor: {weighting_factor}"
+                ),
+                CalculationStep(
+                    step='Facilitated Emissions',
+                    value=financed_emissions,
+                    formula=f"({facilitated_amount} / {denominator:.2f}) × {weighting_factor} × {emission_data} = {financed_emissions:.2f}"
+                )
+            ]
+        return KernelResult(attribution_factor, 0, financed_emissions, calculation_steps)
+
+    def vector(column: ColumnGetter, denominator: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        import numpy as np
+        attribution_factor = column('facilitated_amount') / denominator
+        emission_data = _first_nonzero(column('verified_emissions'), column('unverified_emissions'))
+        financed_emissions = attribution_factor * column('weighting_factor') * emission_data
+        return attribution_factor, np.zeros(len(denominator)), financed_emissions
+
+    return CalculatorKernel('facilitated', formula.id, scalar, vector)
+
+
+def _direct_emissions_kernel(formula: FormulaConfig) -> CalculatorKernel:
+    """Options 1a/1b: (Outstanding Amount / Denominator) × Emission Data"""
+
+    def scalar(context: CalculationContext, build_steps: bool) -> KernelResult:
+        inputs, denominator = context.inputs, context.denominator
+        outstanding_amount = inputs.get('outstanding_amount', 0)
+        attribution_factor = context.attribution('outstanding_amount')
+        emission_data = inputs.get('verified_emissions', 0) or inputs.get('unverified_emissions', 0)
+        financed_emissions = (outstanding_amount / denominator) * emission_data
+
+        calculation_steps: List[CalculationStep] = []
+        if build_steps:
+            calculation_steps = create_emission_calculation_steps(
+                outstanding_amount, denominator, emission_data,
+                'Emission Data', context.company_type.value
+            )
+        return KernelResult(attribution_factor, 0, financed_emissions, calculation_steps)
+
+    def vector(column: ColumnGetter, denominator: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        import numpy as np
+        attribution_factor = column('outstanding_amount') / denominator
+        emission_data = _first_nonzero(column('verified_emissions'), column('unverified_emissions'))
+        return attribution_factor, np.zeros(len(denominator)), attribution_factor * emission_data
+
+    return CalculatorKernel('direct_emissions', formula.id, scalar, vector)
+
+
+def _activity_kernel(formula: FormulaConfig) -> CalculatorKernel:
+    """Options 2a/2b: (Outstanding Amount / Denominator) × Activity Data × Emission Factor"""
+    activity_label = 'Energy Consumption' if formula.option_code == '2a' else 'Production'
+    emission_factor_label = 'Emission Factor' if formula.option_code == '2a' else 'Production Emission Factor'
+
+    def scalar(context: CalculationContext, build_steps: bool) -> KernelResult:
+        inputs, denominator = context.inputs, context.denominator
+        outstanding_amount = inputs.get('outstanding_amount', 0)
+        attribution_factor = context.attribution('outstanding_amount')
+        activity_data = inputs.get('energy_consumption', 0) or inputs.get('production', 0)
+        emission_factor = inputs.get('emission_factor', 0) or inputs.get('production_emission_factor', 0)
+        calculated_emissions = activity_data * emission_factor
+        financed_emissions = (outstanding_amount / denominator) * calculated_emissions
+
+        calculation_steps: List[CalculationStep] = []
+        if build_steps:
+            calculation_steps = create_activity_calculation_steps(
+                outstanding_amount, denominator, activity_data, activity_label,
+                emission_factor, emission_factor_label, context.company_type.value
+            )
+        return KernelResult(attribution_factor, emission_factor, financed_emissions, calculation_steps)
+
+    def vector(column: ColumnGetter, denominator: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        attribution_factor = column('outstanding_amount') / denominator
+        activity_data = _first_nonzero(column('energy_consumption'), column('production'))
+        emission_factor = _first_nonzero(column('emission_factor'), column('production_emission_factor'))
+        return attribution_factor, emission_factor, attribution_factor * (activity_data * emission_factor)
+
+    return CalculatorKernel('activity', formula.id, scalar, vector)
+
+
+def _unsupported_kernel(formula: FormulaConfig) -> CalculatorKernel:
+    """No calculation logic for this option code: attribution only, zero emissions"""
+
+    def scalar(context: CalculationContext, build_steps: bool) -> KernelResult:
+        return KernelResult(context.attribution('outstanding_amount'), 0, 0, [])
+
+    def vector(column: ColumnGetter, denominator: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        import numpy as np
+        size = len(denominator)
+        return column('outstanding_amount') / denominator, np.zeros(size), np.zeros(size)
+
+    return CalculatorKernel('unsupported', formula.id, scalar, vector)
+
+
+def _formula_callable_kernel(formula: FormulaConfig, fallback: CalculatorKernel) -> CalculatorKernel:
+    """
+    Run the formula's own `calculate` callable (frontend-matching logic)
+    The callables derive their denominator from company components listed in
+    metadata['denominator_components']; when any of those is missing (or the
+    callable divides by zero) the category kernel is used instead.
+    Callable results are row-by-row only, so there is no vectorized variant.
+    """
+    calculate = formula.calculate
+    fallback_scalar = fallback.scalar
+    components = tuple((formula.metadata or {}).get('denominator_components', ()))
+
+    def scalar(context: CalculationContext, build_steps: bool) -> KernelResult:
+        inputs = context.inputs
+        for name in components:
+            if not inputs.get(name):
+                return fallback_scalar(context, build_steps)
+        try:
+            output = calculate(inputs, context.company_type.value)
+        except ZeroDivisionError:
+            return fallback_scalar(context, build_steps)
+
+        calculation_steps: List[CalculationStep] = []
+        if build_steps:
+            calculation_steps = [CalculationStep(**step) for step in output.get('calculationSteps', [])]
+        return KernelResult(
+            output['attributionFactor'],
+            output['emissionFactor'],
+            output['financedEmissions'],
+            calculation_steps
+        )
+
+    return CalculatorKernel(f"callable:{getattr(calculate, '__name__', 'calculate')}", formula.id, scalar)
+
+
+# ============================================================================
+# DISPATCH TABLES
+# ============================================================================
+
+KernelFactory = Callable[[FormulaConfig], CalculatorKernel]
+
+# Category kernels take precedence over option-code kernels
+CATEGORY_KERNELS: Dict[FormulaCategory, KernelFactory] = {
+    FormulaCategory.FACILITATED_EMISSION: _facilitated_kernel,
+}
+
+OPTION_CODE_KERNELS: Dict[str, KernelFactory] = {
+    '1a': _direct_emissions_kernel,
+    '1b': _direct_emissions_kernel,
+    '2a': _activity_kernel,
+    '2b': _activity_kernel,
+}
+
+
+def compile_kernel(formula: FormulaConfig) -> CalculatorKernel:
+    """
+    Bind a formula to its calculator kernel
+    """
+    factory = CATEGORY_KERNELS.get(formula.category) or OPTION_CODE_KERNELS.get(formula.option_code)
+    if factory is None:
+        logger.warning(
+            "No calculator for formula %s (category %s, option %s) - emissions will be zero",
+            formula.id, formula.category.value, formula.option_code
+        )
+        factory = _unsupported_kernel
+    kernel = factory(formula)
+
+    if callable(formula.calculate):
+        kernel = _formula_callable_kernel(formula, kernel)
+    return kernel
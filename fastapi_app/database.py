@@ -1,68 +1,345 @@
 """
 Database configuration for FastAPI backend
 Connects to the same Supabase instance used by the frontend
+
+Clients are created on first use, not at import: importing this module does
+no network setup and does not import the Supabase SDK. Both the sync client
+(get_supabase_client) and the async client for async endpoints
+(get_async_supabase_client) send PostgREST queries through a pooled
+keep-alive HTTP client with configurable timeouts and retries. Connection
+failures are retried for every request; read timeouts and 502/503/504
+responses only for idempotent (GET/HEAD) requests. configure_database closes
+the HTTP clients of the clients it replaces.
+
+Environment configuration (read when a client is first created):
+    SUPABASE_URL                          project URL (point it at a local
+                                          PostgREST stand-in serving /rest/v1 for tests)
+    SUPABASE_SERVICE_ROLE_KEY             service role key
+    SUPABASE_TIMEOUT_SECONDS=10           read / write / pool timeout
+    SUPABASE_CONNECT_TIMEOUT_SECONDS=5    connect timeout
+    SUPABASE_MAX_RETRIES=2                retries per request
+    SUPABASE_RETRY_BACKOFF_SECONDS=0.2    first retry delay (doubles each retry)
+    SUPABASE_MAX_CONNECTIONS=20           pooled connections per client
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS=10 idle connections kept open
+    SUPABASE_KEEPALIVE_EXPIRY_SECONDS=30  idle connection lifetime
 """
+import asyncio
+import logging
 import os
-from supabase import create_client, Client
-from typing import Optional
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    import httpx
+    from supabase import AsyncClient, Client
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Supabase configuration - using the same instance as frontend
-SUPABASE_URL = "https://yhticndmpvzczquivpfb.supabase.co"
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+DEFAULT_SUPABASE_URL = "https://yhticndmpvzczquivpfb.supabase.co"
+
+# Placeholder from the example .env; treated as unset
+PLACEHOLDER_SERVICE_ROLE_KEY = "YOUR_SERVICE_ROLE_KEY_HERE"
+
+RETRY_STATUS_CODES = (502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Connection, pooling and retry settings for the Supabase clients"""
+    url: str = DEFAULT_SUPABASE_URL
+    service_role_key: Optional[str] = None
+    timeout_seconds: float = 10.0
+    connect_timeout_seconds: float = 5.0
+    max_retries: int = 2
+    retry_backoff_seconds: float = 0.2
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> 'DatabaseSettings':
+        return cls(
+            url=os.getenv("SUPABASE_URL") or DEFAULT_SUPABASE_URL,
+            service_role_key=os.getenv("SUPABASE_SERVICE_ROLE_KEY"),
+            timeout_seconds=_env_float("SUPABASE_TIMEOUT_SECONDS", 10.0),
+            connect_timeout_seconds=_env_float("SUPABASE_CONNECT_TIMEOUT_SECONDS", 5.0),
+            max_retries=max(0, _env_int("SUPABASE_MAX_RETRIES", 2)),
+            retry_backoff_seconds=_env_float("SUPABASE_RETRY_BACKOFF_SECONDS", 0.2),
+            max_connections=_env_int("SUPABASE_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_env_int("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", 10),
+            keepalive_expiry_seconds=_env_float("SUPABASE_KEEPALIVE_EXPIRY_SECONDS", 30.0),
+        )
+
+    def require_key(self) -> str:
+        if not self.service_role_key or self.service_role_key == PLACEHOLDER_SERVICE_ROLE_KEY:
+            raise ValueError(
+                "SUPABASE_SERVICE_ROLE_KEY not set. Please set it in your environment variables or .env file"
+            )
+        return self.service_role_key
+
+
+# ============================================================================
+# RETRYING TRANSPORTS
+# ============================================================================
+
+class _RetryingTransport:
+    """Wraps an httpx transport; retries connection failures, and timeouts / 502-504 for GET and HEAD"""
+
+    def __init__(self, transport: 'httpx.BaseTransport', settings: DatabaseSettings):
+        self._transport = transport
+        self._retries = settings.max_retries
+        self._backoff = settings.retry_backoff_seconds
+
+    def handle_request(self, request: 'httpx.Request') -> 'httpx.Response':
+        import httpx
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self._retries:
+                    raise
+            except (httpx.TimeoutException, httpx.RemoteProtocolError):
+                if not idempotent or attempt >= self._retries:
+                    raise
+            else:
+                if not idempotent or response.status_code not in RETRY_STATUS_CODES or attempt >= self._retries:
+                    return response
+                response.close()
+            time.sleep(self._backoff * (2 ** attempt))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+    def __enter__(self) -> '_RetryingTransport':
+        self._transport.__enter__()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._transport.__exit__(*args)
+
+
+class _AsyncRetryingTransport:
+    """Async counterpart of _RetryingTransport"""
+
+    def __init__(self, transport: 'httpx.AsyncBaseTransport', settings: DatabaseSettings):
+        self._transport = transport
+        self._retries = settings.max_retries
+        self._backoff = settings.retry_backoff_seconds
+
+    async def handle_async_request(self, request: 'httpx.Request') -> 'httpx.Response':
+        import httpx
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self._retries:
+                    raise
+            except (httpx.TimeoutException, httpx.RemoteProtocolError):
+                if not idempotent or attempt >= self._retries:
+                    raise
+            else:
+                if not idempotent or response.status_code not in RETRY_STATUS_CODES or attempt >= self._retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self._backoff * (2 ** attempt))
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> '_AsyncRetryingTransport':
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self._transport.__aexit__(*args)
+
+
+def _http_client_kwargs(settings: DatabaseSettings) -> Dict[str, Any]:
+    import httpx
+    return {
+        "timeout": httpx.Timeout(settings.timeout_seconds, connect=settings.connect_timeout_seconds),
+        "follow_redirects": True,
+    }
 
-# Fallback to the same service role key from frontend (for development)
-# In production, this should be set via environment variables
-if not SUPABASE_SERVICE_ROLE_KEY:
-    SUPABASE_SERVICE_ROLE_KEY = "YOUR_SERVICE_ROLE_KEY_HERE"
 
-# Create Supabase client for backend operations
+def _pool_limits(settings: DatabaseSettings) -> 'httpx.Limits':
+    import httpx
+    return httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry_seconds,
+    )
+
+
+def create_http_client(settings: DatabaseSettings) -> 'httpx.Client':
+    """Pooled keep-alive HTTP client with retries"""
+    import httpx
+    transport = _RetryingTransport(httpx.HTTPTransport(limits=_pool_limits(settings)), settings)
+    return httpx.Client(transport=transport, **_http_client_kwargs(settings))
+
+
+def create_async_http_client(settings: DatabaseSettings) -> 'httpx.AsyncClient':
+    """Pooled keep-alive async HTTP client with retries"""
+    import httpx
+    transport = _AsyncRetryingTransport(httpx.AsyncHTTPTransport(limits=_pool_limits(settings)), settings)
+    return httpx.AsyncClient(transport=transport, **_http_client_kwargs(settings))
+
+
+# ============================================================================
+# CLIENTS
+# ============================================================================
+
 # Using service role key to bypass RLS for backend operations
-supabase: Optional[Client] = None
+_settings: Optional[DatabaseSettings] = None
+supabase: Optional['Client'] = None
+_async_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]' = weakref.WeakKeyDictionary()
+_async_client_locks: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]' = weakref.WeakKeyDictionary()
+_client_lock = threading.Lock()
+
+
+def get_database_settings() -> DatabaseSettings:
+    global _settings
+    if _settings is None:
+        _settings = DatabaseSettings.from_env()
+    return _settings
+
 
-def get_supabase_client() -> Client:
+def configure_database(settings: Optional[DatabaseSettings] = None) -> None:
+    """
+    Replace the settings (None re-reads the environment) and drop existing clients
+    Later calls to get_*_client create clients with the new settings.
+    """
+    global _settings, supabase
+    with _client_lock:
+        _settings = settings
+        client, supabase = supabase, None
+        async_clients = list(_async_clients.items())
+        _async_clients.clear()
+    if client is not None:
+        client.options.httpx_client.close()
+    for loop, async_client in async_clients:
+        _close_async_client(loop, async_client)
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, client: 'AsyncClient') -> None:
+    """Schedule closing a dropped async client's HTTP client on the loop it belongs to"""
+    if loop.is_closed():
+        return  # its connections went with the loop
+    try:
+        asyncio.run_coroutine_threadsafe(client.options.httpx_client.aclose(), loop)
+    except RuntimeError as e:  # loop closed in the meantime
+        logger.debug("Could not close dropped async Supabase client: %s", e)
+
+
+def get_supabase_client() -> 'Client':
     """
     Get Supabase client instance
-    Creates a new client if one doesn't exist
+    Creates the client (and its pooled HTTP client) on first use
     """
     global supabase
     if supabase is None:
-        if not SUPABASE_SERVICE_ROLE_KEY or SUPABASE_SERVICE_ROLE_KEY == "YOUR_SERVICE_ROLE_KEY_HERE":
-            raise ValueError(
-                "SUPABASE_SERVICE_ROLE_KEY not set. Please set it in your environment variables or .env file"
-            )
-        
-        supabase = create_client(
-            SUPABASE_URL, 
-            SUPABASE_SERVICE_ROLE_KEY
-        )
-    
+        with _client_lock:
+            if supabase is None:
+                from supabase import ClientOptions, create_client
+                settings = get_database_settings()
+                options = ClientOptions(
+                    auto_refresh_token=False,
+                    persist_session=False,
+                    httpx_client=create_http_client(settings)
+                )
+                supabase = create_client(settings.url, settings.require_key(), options)
     return supabase
 
+
+async def get_async_supabase_client() -> 'AsyncClient':
+    """
+    Async Supabase client for async endpoints
+    One client per event loop (its connections belong to the loop that opened them).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is not None:
+        return client
+    with _client_lock:
+        lock = _async_client_locks.setdefault(loop, asyncio.Lock())
+    # Concurrent first requests on this loop wait for one client instead of each building one
+    async with lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            from supabase import AsyncClientOptions, acreate_client
+            settings = get_database_settings()
+            options = AsyncClientOptions(
+                auto_refresh_token=False,
+                persist_session=False,
+                httpx_client=create_async_http_client(settings)
+            )
+            try:
+                client = await acreate_client(settings.url, settings.require_key(), options)
+            except BaseException:
+                await options.httpx_client.aclose()
+                raise
+            with _client_lock:
+                _async_clients[loop] = client
+    return client
+
+
+def _check_result(result: Any) -> None:
+    if not (hasattr(result, 'data') or isinstance(result, dict)):
+        raise RuntimeError("Unexpected response from database")
+
+
+def check_connection() -> None:
+    """
+    Run a minimal query against the database
+    Raises on any failure (missing key, network error, query error)
+    """
+    client = get_supabase_client()
+    _check_result(client.table("profiles").select("id").limit(1).execute())
+
+
+async def check_connection_async() -> None:
+    """check_connection with the async client"""
+    client = await get_async_supabase_client()
+    _check_result(await client.table("profiles").select("id").limit(1).execute())
+
+
 def test_connection() -> bool:
     """
     Test database connection
     Returns True if connection is successful, False otherwise
     """
     try:
-        client = get_supabase_client()
-        # Simple query to test connection
-        result = client.table("profiles").select("id").limit(1).execute()
-        # Check if result is valid
-        if hasattr(result, 'data') or isinstance(result, dict):
-            return True
-        return False
+        check_connection()
+        return True
     except Exception as e:
-        print(f"Database connection test failed: {e}")
+        logger.warning("Database connection test failed: %s", e)
         return False
-
-# Initialize connection on module import
-try:
-    get_supabase_client()
-    print("Database connection initialized successfully")
-except Exception as e:
-    print(f"Database connection initialization failed: {e}")
-    print("   Make sure to set SUPABASE_SERVICE_ROLE_KEY environment variable")
@@ -15,6 +15,10 @@ from .shared_formula_utils import (
     calculate_attribution_factor_unlisted
 )
 
+# Company inputs the calculation functions derive their denominator from
+EVIC_COMPONENTS = ('share_price', 'outstanding_shares')
+EQUITY_PLUS_DEBT_COMPONENTS = ('total_equity', 'total_debt')
+
 # ============================================================================
 # CALCULATION FUNCTIONS (Matching Frontend Logic Exactly)
 # ============================================================================
@@ -384,7 +388,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_1a_facilitated_verified_listed
+            calculate=_calculate_1a_facilitated_verified_listed,
+            metadata={'denominator_components': list(EVIC_COMPONENTS)}
         ),
         
         # OPTION 1A - VERIFIED GHG EMISSIONS (FACILITATED - UNLISTED)
@@ -424,7 +429,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_1a_facilitated_verified_unlisted
+            calculate=_calculate_1a_facilitated_verified_unlisted,
+            metadata={'denominator_components': list(EQUITY_PLUS_DEBT_COMPONENTS)}
         ),
         
         # OPTION 1B - UNVERIFIED GHG EMISSIONS (FACILITATED - LISTED)
@@ -464,7 +470,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_1b_facilitated_unverified_listed
+            calculate=_calculate_1b_facilitated_unverified_listed,
+            metadata={'denominator_components': list(EVIC_COMPONENTS)}
         ),
         
         # OPTION 1B - UNVERIFIED GHG EMISSIONS (FACILITATED - UNLISTED)
@@ -504,7 +511,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_1b_facilitated_unverified_unlisted
+            calculate=_calculate_1b_facilitated_unverified_unlisted,
+            metadata={'denominator_components': list(EQUITY_PLUS_DEBT_COMPONENTS)}
         ),
         
         # OPTION 2A - ENERGY CONSUMPTION DATA (FACILITATED - LISTED)
@@ -552,7 +560,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2],
-            calculate=_calculate_2a_facilitated_energy_listed
+            calculate=_calculate_2a_facilitated_energy_listed,
+            metadata={'denominator_components': list(EVIC_COMPONENTS)}
         ),
         
         # OPTION 2A - ENERGY CONSUMPTION DATA (FACILITATED - UNLISTED)
@@ -600,7 +609,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2],
-            calculate=_calculate_2a_facilitated_energy_unlisted
+            calculate=_calculate_2a_facilitated_energy_unlisted,
+            metadata={'denominator_components': list(EQUITY_PLUS_DEBT_COMPONENTS)}
         ),
         
         # OPTION 2B - PRODUCTION DATA (FACILITATED - LISTED)
@@ -648,7 +658,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_2b_facilitated_production_listed
+            calculate=_calculate_2b_facilitated_production_listed,
+            metadata={'denominator_components': list(EVIC_COMPONENTS)}
         ),
         
         # OPTION 2B - PRODUCTION DATA (FACILITATED - UNLISTED)
@@ -696,7 +707,8 @@ def create_facilitated_emission_formulas():
                 )
             ],
             applicable_scopes=[ScopeType.SCOPE1, ScopeType.SCOPE2, ScopeType.SCOPE3],
-            calculate=_calculate_2b_facilitated_production_unlisted
+            calculate=_calculate_2b_facilitated_production_unlisted,
+            metadata={'denominator_components': list(EQUITY_PLUS_DEBT_COMPONENTS)}
         )
     ]
 
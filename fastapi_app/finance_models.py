@@ -42,6 +42,13 @@ class ScopeType(str, Enum):
     SCOPE3 = "scope3"
 
 
+class CalculationStepDetail(str, Enum):
+    """How much calculation_steps detail to build for a result"""
+    NONE = "none"        # no steps (machine callers that only need the numbers)
+    SUMMARY = "summary"  # attribution factor and financed emissions only
+    FULL = "full"        # every intermediate step with formatted formulas
+
+
 class FormulaInput(BaseModel):
     """FormulaInput - migrated from TypeScript interface"""
     name: str
@@ -0,0 +1,181 @@
+"""
+Formula Registry
+Indexed lookup structure for PCAF formula configurations
+
+The registry is built once from the formula configuration lists and keeps
+O(1) maps by formula ID plus precomputed secondary indexes, so lookups on the
+calculation path never scan or allocate per request.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .finance_models import FormulaConfig, FormulaCategory, ScopeType
+from .validation_plans import ValidationPlan, compile_validation_plan
+from .calculators import CalculatorKernel, compile_kernel
+from .formula_configs import BASIC_FORMULAS
+from .corporate_bond_business_loan_configs import CORPORATE_BOND_BUSINESS_LOAN_FORMULAS
+from .commercial_real_estate_configs import COMMERCIAL_REAL_ESTATE_FORMULAS
+from .mortgage_configs import MORTGAGE_FORMULAS
+from .motor_vehicle_loan_configs import MOTOR_VEHICLE_LOAN_FORMULAS
+from .project_finance_configs import PROJECT_FINANCE_FORMULAS
+from .sovereign_debt_configs import SOVEREIGN_DEBT_FORMULAS
+from .facilitated_emission_configs import FACILITATED_EMISSION_FORMULAS
+
+
+EMPTY_FORMULAS: Tuple[FormulaConfig, ...] = ()
+
+# (required-input bitmask, formula) pairs, best data quality first
+RankedFormulas = Tuple[Tuple[int, FormulaConfig], ...]
+EMPTY_RANKED: RankedFormulas = ()
+
+
+class FormulaRegistry:
+    """
+    Immutable-by-convention index over a list of formula configurations
+
+    Secondary indexes are stored as tuples and returned as-is, so callers
+    must treat them as read-only. A ValidationPlan and a CalculatorKernel are
+    compiled for every formula ID when the indexes are built. Use register()
+    to change the formula set; it rebuilds every index and bumps the registry
+    version.
+
+    Required inputs are also encoded as bitmasks over the registry's input
+    name vocabulary, and each category keeps its formulas ranked by
+    data_quality_score, so best-formula selection is a few integer ops.
+    """
+
+    def __init__(self, formulas: Iterable[FormulaConfig]):
+        self.version = 0
+        self._build(list(formulas))
+
+    def _build(self, formulas: List[FormulaConfig]) -> None:
+        """Build all lookup indexes for the given formula list"""
+        by_id: Dict[str, FormulaConfig] = {}
+        by_category: Dict[FormulaCategory, List[FormulaConfig]] = {}
+        by_score: Dict[int, List[FormulaConfig]] = {}
+        by_option_code: Dict[str, List[FormulaConfig]] = {}
+        by_scope: Dict[ScopeType, List[FormulaConfig]] = {}
+
+        for formula in formulas:
+            # First definition wins for duplicate IDs (matches the previous linear scan)
+            by_id.setdefault(formula.id, formula)
+            by_category.setdefault(formula.category, []).append(formula)
+            by_score.setdefault(formula.data_quality_score, []).append(formula)
+            by_option_code.setdefault(formula.option_code, []).append(formula)
+            for scope in formula.applicable_scopes or []:
+                by_scope.setdefault(scope, []).append(formula)
+
+        self.formulas: List[FormulaConfig] = formulas
+        self._by_id = by_id
+        self._by_category = {key: tuple(value) for key, value in by_category.items()}
+        self._by_score = {key: tuple(value) for key, value in by_score.items()}
+        self._by_option_code = {key: tuple(value) for key, value in by_option_code.items()}
+        self._by_scope = {key: tuple(value) for key, value in by_scope.items()}
+        self._validation_plans = {
+            formula_id: compile_validation_plan(formula) for formula_id, formula in by_id.items()
+        }
+        self._kernels = {
+            formula_id: compile_kernel(formula) for formula_id, formula in by_id.items()
+        }
+
+        # Bit i of a mask stands for input name vocabulary[i]
+        vocabulary: Dict[str, int] = {}
+        ranked: Dict[FormulaCategory, List[Tuple[int, FormulaConfig]]] = {}
+        for formula in formulas:
+            mask = 0
+            for input_field in formula.inputs:
+                if input_field.required:
+                    mask |= 1 << vocabulary.setdefault(input_field.name, len(vocabulary))
+            ranked.setdefault(formula.category, []).append((mask, formula))
+        self._input_bits = vocabulary
+        # sort() is stable, so ties keep registry order (as the previous list sort did)
+        for entries in ranked.values():
+            entries.sort(key=lambda entry: entry[1].data_quality_score)
+        self._ranked_by_category = {key: tuple(value) for key, value in ranked.items()}
+        self.version += 1
+
+    def register(self, formulas: Iterable[FormulaConfig], replace: bool = False) -> None:
+        """
+        Add formulas to the registry (or replace the whole set) and rebuild indexes
+        Formulas whose ID is already registered are replaced in place.
+        """
+        incoming = list(formulas)
+        if replace:
+            self._build(incoming)
+            return
+
+        incoming_ids = {formula.id for formula in incoming}
+        kept = [formula for formula in self.formulas if formula.id not in incoming_ids]
+        self._build(kept + incoming)
+
+    def __len__(self) -> int:
+        return len(self.formulas)
+
+    def __contains__(self, formula_id: str) -> bool:
+        return formula_id in self._by_id
+
+    def get(self, formula_id: str) -> Optional[FormulaConfig]:
+        """Get formula by ID"""
+        return self._by_id.get(formula_id)
+
+    def validation_plan(self, formula_id: str) -> Optional[ValidationPlan]:
+        """Get the compiled validation plan for a formula ID"""
+        return self._validation_plans.get(formula_id)
+
+    def kernel(self, formula_id: str) -> Optional[CalculatorKernel]:
+        """Get the calculator kernel bound to a formula ID"""
+        return self._kernels.get(formula_id)
+
+    def input_mask(self, input_names: Iterable[str]) -> int:
+        """Encode available input names as a bitmask (names no formula requires are ignored)"""
+        bits = self._input_bits
+        mask = 0
+        for name in input_names:
+            bit = bits.get(name)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def ranked_by_category(self, category: FormulaCategory) -> RankedFormulas:
+        """(required-input mask, formula) pairs for a category, best data quality first"""
+        return self._ranked_by_category.get(category, EMPTY_RANKED)
+
+    def best_formula(self, available_mask: int, category: FormulaCategory) -> Optional[FormulaConfig]:
+        """Best-quality formula in a category whose required inputs are all in available_mask"""
+        for required_mask, formula in self._ranked_by_category.get(category, EMPTY_RANKED):
+            if not required_mask & ~available_mask:
+                return formula
+        return None
+
+    def by_category(self, category: FormulaCategory) -> Sequence[FormulaConfig]:
+        """Get formulas by category"""
+        return self._by_category.get(category, EMPTY_FORMULAS)
+
+    def by_score(self, score: int) -> Sequence[FormulaConfig]:
+        """Get formulas by data quality score"""
+        return self._by_score.get(score, EMPTY_FORMULAS)
+
+    def by_option_code(self, option_code: str) -> Sequence[FormulaConfig]:
+        """Get formulas by PCAF option code ('1a', '1b', '2a', ...)"""
+        return self._by_option_code.get(option_code, EMPTY_FORMULAS)
+
+    def by_scope(self, scope: ScopeType) -> Sequence[FormulaConfig]:
+        """Get formulas that list the given scope in applicable_scopes"""
+        return self._by_scope.get(scope, EMPTY_FORMULAS)
+
+
+def load_default_formulas() -> List[FormulaConfig]:
+    """Concatenate all formula configuration lists in lookup priority order"""
+    return (
+        BASIC_FORMULAS +
+        CORPORATE_BOND_BUSINESS_LOAN_FORMULAS +
+        COMMERCIAL_REAL_ESTATE_FORMULAS +
+        MORTGAGE_FORMULAS +
+        MOTOR_VEHICLE_LOAN_FORMULAS +
+        PROJECT_FINANCE_FORMULAS +
+        SOVEREIGN_DEBT_FORMULAS +
+        FACILITATED_EMISSION_FORMULAS
+    )
+
+
+# Shared registry built once at import time
+DEFAULT_FORMULA_REGISTRY = FormulaRegistry(load_default_formulas())
@@ -0,0 +1,133 @@
+"""
+Database Health
+Cached background probe of the database connection
+
+A daemon thread runs the probe every interval and keeps the outcome (status,
+last check and last success times, latency, consecutive failures) in memory,
+so /health never waits on the database and adds no load to it however often
+it is polled. The thread is started by the first status read rather than at
+application startup, since the Mangum handler runs with lifespan="off".
+probe_now() runs an on-demand check for /health/deep; concurrent callers
+share one probe.
+
+On serverless platforms the thread only runs while the instance is serving
+requests, so the cached result can be older than the interval; its age is
+reported alongside the status.
+
+Environment configuration (read when the default monitor is created):
+    DB_HEALTH_INTERVAL_SECONDS=30  time between background probes
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from .models import DatabaseHealth
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _timestamp(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat()
+
+
+class DatabaseHealthMonitor:
+    """Runs `probe` (raises on failure) in the background and caches the outcome"""
+
+    def __init__(self, probe: Callable[[], None], interval_seconds: float = 30.0):
+        self.probe = probe
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._connected: Optional[bool] = None
+        self._probe_started_at: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._last_success_at: Optional[float] = None
+        self._latency_ms: Optional[float] = None
+        self._consecutive_failures = 0
+        self._error: Optional[str] = None
+
+    def ensure_started(self) -> None:
+        """Start the background thread if it is not running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='db-health-probe', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe_now()
+            self._stop.wait(self.interval_seconds)
+
+    def _probe(self) -> None:
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            self.probe()
+            error = None
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            self._probe_started_at = started_at
+            self._checked_at = time.time()
+            self._latency_ms = latency_ms
+            self._connected = error is None
+            self._error = error
+            if error is None:
+                self._last_success_at = self._checked_at
+                self._consecutive_failures = 0
+            else:
+                self._consecutive_failures += 1
+        if error is not None:
+            logger.warning("Database health probe failed: %s", error)
+
+    def probe_now(self) -> DatabaseHealth:
+        """Probe the database now (or share a probe that started while waiting) and return the result"""
+        requested_at = time.time()
+        with self._probe_lock:
+            with self._lock:
+                fresh = self._probe_started_at is not None and self._probe_started_at >= requested_at
+            if not fresh:
+                self._probe()
+        return self.status()
+
+    def status(self) -> DatabaseHealth:
+        """Last cached probe result (status 'unknown' before the first probe completes)"""
+        with self._lock:
+            if self._connected is None:
+                status = "unknown"
+            else:
+                status = "connected" if self._connected else "disconnected"
+            return DatabaseHealth(
+                status=status,
+                checked_at=_timestamp(self._checked_at),
+                age_seconds=time.time() - self._checked_at if self._checked_at is not None else None,
+                last_success_at=_timestamp(self._last_success_at),
+                latency_ms=self._latency_ms,
+                consecutive_failures=self._consecutive_failures,
+                error=self._error
+            )
+
+
+def create_default_health_monitor(probe: Callable[[], None]) -> DatabaseHealthMonitor:
+    """Build the health monitor from environment configuration"""
+    return DatabaseHealthMonitor(probe, interval_seconds=float(_env_int("DB_HEALTH_INTERVAL_SECONDS", 30)))
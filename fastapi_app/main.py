@@ -1,5 +1,12 @@
-from fastapi import FastAPI, HTTPException
+import json
+from concurrent.futures import BrokenExecutor
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Type, Union, TYPE_CHECKING
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 from .models import (
     HealthResponse,
     FinanceEmissionRequest,
@@ -8,13 +15,48 @@ from .models import (
     FacilitatedEmissionResponse,
     ScenarioRequest,
     ScenarioResponse,
+    ScenarioType,
+    GroupByField,
+    MultiScenarioRequest,
+    MultiScenarioResponse,
+    MonteCarloRequest,
+    MonteCarloResponse,
+    HorizonRequest,
+    HorizonResponse,
+    SensitivityRequest,
+    SensitivityResponse,
+    ScenarioSessionRequest,
+    ScenarioSessionResponse,
+    PortfolioDelta,
+    StepDetail,
+    ResponseFormat,
+    ScenarioColumnarResponse,
+    BatchColumnsChunk,
+    TraceConfigRequest,
+    TraceStatus,
 )
 from .calculation_engine import CalculationEngine
-from .scenario_engine import ScenarioEngine
-from .database import test_connection, get_supabase_client
-from .finance_models import CompanyType
+from .database import check_connection, get_async_supabase_client
+from .health import create_default_health_monitor
+from .finance_models import CompanyType, CalculationStepDetail
+from .serialization import JSON_MEDIA_TYPE, ModelResponse, dumps_json
+from .offload import OffloadRejected, OffloadTimeout, create_default_offloader
+from .tracing import configure_tracing, parse_level, tracer
+from .streaming import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    RequestStreamingResponse,
+    encode_ndjson,
+    iter_chunks,
+    iter_json_records,
+    iter_upload_records,
+)
 import logging
 
+if TYPE_CHECKING:
+    from .scenario_engine import ScenarioEngine
+    from .scenario_session import ScenarioSession, ScenarioSessionStore
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -44,17 +86,156 @@ app.add_middleware(
 
 # Initialize the calculation engines
 calculation_engine = CalculationEngine()
-scenario_engine = ScenarioEngine()
+# The scenario stack (and NumPy under it) is loaded by the first scenario
+# request rather than at import, keeping serverless cold starts short
+_scenario_engine: Optional['ScenarioEngine'] = None
+_scenario_sessions: Optional['ScenarioSessionStore'] = None
+_scenario_lock = threading.Lock()
+# Process pool for large scenario requests and batch bodies
+offloader = create_default_offloader()
+# Background database probe behind /health (started by the first health check)
+database_health = create_default_health_monitor(check_connection)
+
+
+def get_scenario_engine() -> 'ScenarioEngine':
+    global _scenario_engine
+    if _scenario_engine is None:
+        with _scenario_lock:
+            if _scenario_engine is None:
+                from .scenario_engine import ScenarioEngine
+                _scenario_engine = ScenarioEngine()
+    return _scenario_engine
+
+
+def get_scenario_sessions() -> 'ScenarioSessionStore':
+    global _scenario_sessions
+    if _scenario_sessions is None:
+        with _scenario_lock:
+            if _scenario_sessions is None:
+                from .scenario_session import create_default_session_store
+                _scenario_sessions = create_default_session_store()
+    return _scenario_sessions
+
+# Rows per worker-thread hop when streaming batch calculations
+BATCH_CHUNK_SIZE = 256
+# Portfolio entries per vectorized chunk when streaming scenario uploads
+SCENARIO_CHUNK_SIZE = 4096
+
+EmissionRequestModel = Type[Union[FinanceEmissionRequest, FacilitatedEmissionRequest]]
+
+
+def _request_body_doc(request_model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints that read and validate their JSON body themselves"""
+    schema = request_model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+
+    return {"requestBody": {"content": {"application/json": {"schema": inline(schema)}}, "required": True}}
+
+
+def _body_validation_detail(body: bytes, error: ValidationError) -> List[Dict[str, Any]]:
+    """Validation errors in the shape FastAPI returns for a declared body parameter"""
+    if not body:
+        return [{"type": "missing", "loc": ["body"], "msg": "Field required", "input": None}]
+    errors = error.errors(include_url=False)
+    if errors and errors[0]["type"] == "json_invalid":
+        try:
+            json.loads(body)
+        except json.JSONDecodeError as e:
+            return [{"type": "json_invalid", "loc": ["body", e.pos], "msg": "JSON decode error",
+                     "input": {}, "ctx": {"error": e.msg}}]
+    return jsonable_encoder([{**item, "loc": ("body", *item["loc"])} for item in errors])
+
+
+def _handle_json_request(
+    handler: Callable[..., ModelResponse],
+    request_model: Type[BaseModel],
+    body: bytes,
+    *args: Any
+) -> Tuple[int, bytes]:
+    """
+    Validate a JSON body and run an endpoint handler, returning (status code, JSON bytes)
+    Runs inline or in a pool worker, so only bytes cross the process boundary.
+    """
+    try:
+        req = request_model.model_validate_json(body)
+    except ValidationError as e:
+        return 422, dumps_json({"detail": _body_validation_detail(body, e)})
+    try:
+        response = handler(req, *args)
+    except HTTPException as e:
+        return e.status_code, dumps_json({"detail": e.detail})
+    return response.status_code, response.body
+
+
+async def _run_json_request(
+    request: Request,
+    handler: Callable[..., ModelResponse],
+    request_model: Type[BaseModel],
+    *args: Any
+) -> Response:
+    """
+    Run a CPU-heavy endpoint on the process pool when its body reaches the
+    offload threshold, on the threadpool otherwise (never on the event loop)
+    """
+    body = await request.body()
+    if not offloader.offloads(len(body)):
+        status_code, content = await run_in_threadpool(
+            offloader.run_inline, _handle_json_request, handler, request_model, body, *args
+        )
+    else:
+        try:
+            status_code, content = await offloader.run(_handle_json_request, handler, request_model, body, *args)
+        except OffloadRejected as e:
+            logger.warning("Rejected %s: %s", request.url.path, e)
+            raise HTTPException(status_code=503, detail="Server busy, retry later")
+        except OffloadTimeout as e:
+            logger.warning("Timed out %s: %s", request.url.path, e)
+            raise HTTPException(status_code=504, detail="Calculation timed out")
+        except BrokenExecutor as e:
+            logger.error("Worker process failed for %s: %s", request.url.path, e)
+            raise HTTPException(status_code=500, detail="Internal calculation error")
+    return Response(content, status_code=status_code, media_type=JSON_MEDIA_TYPE)
 
 
 @app.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
-    # Test database connection
-    db_status = "connected" if test_connection() else "disconnected"
+    """
+    Liveness check answered from memory
+    Database status comes from the cached background probe, so this never
+    waits on the database.
+    """
+    database_health.ensure_started()
+    database = database_health.status()
     return HealthResponse(
         status="ok", 
         engine_version="1.0.0",
-        database_status=db_status
+        database_status=database.status,
+        database=database
+    )
+
+
+@app.get("/health/deep", response_model=HealthResponse)
+def health_deep() -> HealthResponse:
+    """
+    Health check with an on-demand database probe
+    Concurrent calls share one probe; the result also refreshes /health.
+    """
+    database_health.ensure_started()
+    database = database_health.probe_now()
+    return HealthResponse(
+        status="ok",
+        engine_version="1.0.0",
+        database_status=database.status,
+        database=database
     )
 
 
@@ -64,16 +245,48 @@ def root():
     return {"message": "FastAPI backend is running!", "status": "ok"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """Calculation result cache hit/miss counters and occupancy"""
+    return calculation_engine.cache_stats()
+
+
+@app.get("/offload/stats")
+def offload_stats():
+    """Process pool configuration, queue depth, timeouts and inline/offloaded counts"""
+    return offloader.stats()
+
+
+@app.get("/trace", response_model=TraceStatus)
+def trace_status():
+    """Calculation tracing configuration of this worker process"""
+    return tracer.status()
+
+
+@app.post("/trace", response_model=TraceStatus)
+def configure_trace(request: TraceConfigRequest):
+    """
+    Switch calculation tracing at runtime (this worker process only)
+    Fields left out keep their current value.
+    """
+    level = None
+    if request.level is not None:
+        level = parse_level(request.level)
+        if level is None:
+            raise HTTPException(status_code=422, detail=f"Invalid logging level: {request.level}")
+    return configure_tracing(enabled=request.enabled, sample_rate=request.sample_rate, level=level)
+
+
 @app.get("/test-db")
-def test_database():
+async def test_database():
     """
     Test database connection endpoint
     Returns detailed connection status
     """
     try:
-        client = get_supabase_client()
+        client = await get_async_supabase_client()
         # Test with a simple query
-        result = client.table("profiles").select("id").limit(1).execute()
+        result = await client.table("profiles").select("id").limit(1).execute()
         
         return {
             "status": "success",
@@ -90,12 +303,12 @@ def test_database():
 
 
 @app.post("/finance-emission", response_model=FinanceEmissionResponse)
-def finance_emission(req: FinanceEmissionRequest) -> FinanceEmissionResponse:
+def finance_emission(req: FinanceEmissionRequest) -> ModelResponse:
     """
     Calculate financed emissions using PCAF methodology
     """
     try:
-        logger.info(f"Calculating finance emission for formula: {req.formula_id}")
+        logger.debug("Calculating finance emission for formula: %s", req.formula_id)
         
         # Convert company_type string to enum
         company_type = CompanyType.LISTED if req.company_type == "listed" else CompanyType.PRIVATE
@@ -104,34 +317,35 @@ def finance_emission(req: FinanceEmissionRequest) -> FinanceEmissionResponse:
         result = calculation_engine.calculate(
             formula_id=req.formula_id,
             inputs=req.inputs,
-            company_type=company_type
+            company_type=company_type,
+            steps=CalculationStepDetail(req.steps)
         )
         
         # Convert result to response format
         response = FinanceEmissionResponse(
             success=True,
-            result=result,
+            result=result.model_dump(),
             calculation_id=None  # TODO: Save to database and return ID
         )
         
-        logger.info(f"Finance emission calculation completed successfully")
-        return response
+        logger.debug("Finance emission calculation completed successfully")
+        return ModelResponse(response)
         
     except ValueError as e:
-        logger.error(f"Validation error in finance emission calculation: {str(e)}")
+        logger.warning("Validation error in finance emission calculation: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Internal error in finance emission calculation: {str(e)}")
+        logger.error("Internal error in finance emission calculation: %s", e)
         raise HTTPException(status_code=500, detail="Internal calculation error")
 
 
 @app.post("/facilitated-emission", response_model=FacilitatedEmissionResponse)
-def facilitated_emission(req: FacilitatedEmissionRequest) -> FacilitatedEmissionResponse:
+def facilitated_emission(req: FacilitatedEmissionRequest) -> ModelResponse:
     """
     Calculate facilitated emissions using PCAF methodology
     """
     try:
-        logger.info(f"Calculating facilitated emission for formula: {req.formula_id}")
+        logger.debug("Calculating facilitated emission for formula: %s", req.formula_id)
         
         # Convert company_type string to enum
         company_type = CompanyType.LISTED if req.company_type == "listed" else CompanyType.PRIVATE
@@ -140,58 +354,536 @@ def facilitated_emission(req: FacilitatedEmissionRequest) -> FacilitatedEmission
         result = calculation_engine.calculate(
             formula_id=req.formula_id,
             inputs=req.inputs,
-            company_type=company_type
+            company_type=company_type,
+            steps=CalculationStepDetail(req.steps)
         )
         
         # Convert result to response format
         response = FacilitatedEmissionResponse(
             success=True,
-            result=result,
+            result=result.model_dump(),
             calculation_id=None  # TODO: Save to database and return ID
         )
         
-        logger.info(f"Facilitated emission calculation completed successfully")
-        return response
+        logger.debug("Facilitated emission calculation completed successfully")
+        return ModelResponse(response)
         
     except ValueError as e:
-        logger.error(f"Validation error in facilitated emission calculation: {str(e)}")
+        logger.warning("Validation error in facilitated emission calculation: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Internal error in facilitated emission calculation: {str(e)}")
+        logger.error("Internal error in facilitated emission calculation: %s", e)
         raise HTTPException(status_code=500, detail="Internal calculation error")
 
 
-@app.post("/scenario/calculate", response_model=ScenarioResponse)
-def calculate_scenario(req: ScenarioRequest) -> ScenarioResponse:
+def _calculate_batch_row(
+    request_model: EmissionRequestModel,
+    index: int,
+    record: Any,
+    parse_error: Optional[str],
+    default_steps: Optional[StepDetail] = None
+) -> dict:
     """
-    Calculate climate stress testing scenarios using sector-specific multipliers
+    Calculate one batch row; failures are returned inline instead of raised
+    """
+    if parse_error:
+        return {"index": index, "success": False, "status_code": 400, "error": parse_error}
+    try:
+        req = request_model.model_validate(record)
+        company_type = CompanyType.LISTED if req.company_type == "listed" else CompanyType.PRIVATE
+        # A row-level "steps" wins over the batch-level default
+        steps = req.steps if default_steps is None or "steps" in req.model_fields_set else default_steps
+        result = calculation_engine.calculate(
+            formula_id=req.formula_id,
+            inputs=req.inputs,
+            company_type=company_type,
+            steps=CalculationStepDetail(steps)
+        )
+        return {"index": index, "success": True, "result": result.model_dump(), "calculation_id": None}
+    except ValueError as e:
+        return {"index": index, "success": False, "status_code": 400, "error": str(e)}
+    except Exception as e:
+        logger.error("Internal error in batch row %d: %s", index, e)
+        return {"index": index, "success": False, "status_code": 500, "error": "Internal calculation error"}
+
+
+def _calculate_batch_chunk(
+    request_model: EmissionRequestModel,
+    records: List[Tuple[Any, Optional[str]]],
+    start_index: int,
+    default_steps: Optional[StepDetail] = None
+) -> bytes:
+    """Calculate a chunk of batch rows and encode them as NDJSON lines"""
+    return b"".join(
+        encode_ndjson(_calculate_batch_row(request_model, start_index + offset, record, parse_error, default_steps))
+        for offset, (record, parse_error) in enumerate(records)
+    )
+
+
+def _calculate_batch_columns_chunk(
+    request_model: EmissionRequestModel,
+    records: List[Tuple[Any, Optional[str]]],
+    start_index: int
+) -> bytes:
+    """
+    Calculate a chunk of batch rows with the vectorized batch path and encode
+    it as one NDJSON line of columns (BatchColumnsChunk: formula_id and
+    company_type dictionary-encoded; rows that fail have success=false and an
+    error)
+    """
+    size = len(records)
+    # Rows that never reach the calculation: body parse or request validation errors
+    request_errors: List[Optional[str]] = [None] * size
+    valid: List[int] = []
+    requests = []
+    for offset, (record, parse_error) in enumerate(records):
+        if parse_error:
+            request_errors[offset] = parse_error
+            continue
+        try:
+            requests.append(request_model.model_validate(record))
+            valid.append(offset)
+        except ValueError as e:
+            request_errors[offset] = str(e)
+
+    columns: Dict[str, List[Any]] = {
+        "formula_id": [""] * size,
+        "company_type": [""] * size,
+        "success": [False] * size,
+        "attribution_factor": [None] * size,
+        "emission_factor": [None] * size,
+        "financed_emissions": [None] * size,
+        "denominator": [None] * size,
+        "data_quality_score": [0] * size,
+        "errors": request_errors,
+        "warnings": [[] for _ in range(size)],
+    }
+    for offset, (record, _) in enumerate(records):
+        if isinstance(record, dict) and isinstance(record.get("formula_id"), str):
+            columns["formula_id"][offset] = record["formula_id"]
+    if requests:
+        # Calculation errors fill the errors of the rows that were calculated
+        batch = calculation_engine.calculate_batch(requests).to_columns()
+        for name, values in batch.items():
+            column = columns[name]
+            for offset, value in zip(valid, values):
+                column[offset] = value
+
+    from .scenario_arrays import encode_categories
+    formula_id_codes, formula_ids = encode_categories(columns.pop("formula_id"))
+    company_type_codes, company_types = encode_categories(columns.pop("company_type"))
+    # Built by this function with the declared column types; skip re-validation
+    return encode_ndjson(BatchColumnsChunk.model_construct(
+        start=start_index,
+        rows=size,
+        formula_ids=formula_ids,
+        formula_id_codes=formula_id_codes.tolist(),
+        company_types=company_types,
+        company_type_codes=company_type_codes.tolist(),
+        **columns,
+    ))
+
+
+async def _stream_batch(
+    request: Request,
+    request_model: EmissionRequestModel,
+    default_steps: Optional[StepDetail] = None,
+    response_format: ResponseFormat = "rows"
+) -> AsyncIterator[bytes]:
     """
+    Parse the request body incrementally and stream NDJSON results per chunk
+    Only one chunk of rows is held in memory at a time. With
+    response_format="columns" each line holds one chunk as columns. Chunks of
+    bodies over the offload threshold (or of unknown length) are calculated
+    on the process pool.
+    """
+    content_length = request.headers.get("content-length")
+    offload = offloader.offloads(int(content_length) if content_length and content_length.isdigit() else None)
+    index = 0
+    async for chunk in iter_chunks(iter_json_records(request.stream()), BATCH_CHUNK_SIZE):
+        if response_format == "columns":
+            task = (_calculate_batch_columns_chunk, request_model, chunk, index)
+        else:
+            task = (_calculate_batch_chunk, request_model, chunk, index, default_steps)
+        if offload:
+            try:
+                yield await offloader.run(*task)
+                index += len(chunk)
+                continue
+            except (OffloadRejected, OffloadTimeout) as e:
+                # The response is already streaming; finish the chunk on the threadpool
+                logger.warning("Batch chunk at row %d not offloaded: %s", index, e)
+        yield await run_in_threadpool(*task)
+        index += len(chunk)
+
+
+BATCH_ENDPOINT_DOC = {
+    "requestBody": {
+        "description": "JSON array or NDJSON stream of calculation requests",
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+        },
+        "required": True,
+    }
+}
+BATCH_RESPONSE_DOC = {200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "One JSON result per line"}}
+
+
+@app.post("/finance-emission/batch", openapi_extra=BATCH_ENDPOINT_DOC, responses=BATCH_RESPONSE_DOC)
+async def finance_emission_batch(
+    request: Request,
+    steps: Optional[StepDetail] = None,
+    format: ResponseFormat = "rows"
+) -> RequestStreamingResponse:
+    """
+    Calculate many finance emission requests, streaming NDJSON results
+    Each output line has the row index and either the result or an inline error.
+    `steps` sets the calculation_steps detail for rows that don't set their own.
+    `format=columns` streams one line of columns per chunk of rows instead
+    (vectorized path, no calculation_steps).
+    """
+    return RequestStreamingResponse(_stream_batch(request, FinanceEmissionRequest, steps, format))
+
+
+@app.post("/facilitated-emission/batch", openapi_extra=BATCH_ENDPOINT_DOC, responses=BATCH_RESPONSE_DOC)
+async def facilitated_emission_batch(
+    request: Request,
+    steps: Optional[StepDetail] = None,
+    format: ResponseFormat = "rows"
+) -> RequestStreamingResponse:
+    """
+    Calculate many facilitated emission requests, streaming NDJSON results
+    Each output line has the row index and either the result or an inline error.
+    `steps` sets the calculation_steps detail for rows that don't set their own.
+    `format=columns` streams one line of columns per chunk of rows instead
+    (vectorized path, no calculation_steps).
+    """
+    return RequestStreamingResponse(_stream_batch(request, FacilitatedEmissionRequest, steps, format))
+
+
+def _calculate_scenario(req: ScenarioRequest, format: ResponseFormat = "rows") -> ModelResponse:
+    """/scenario/calculate calculation (inline or in a pool worker)"""
     try:
-        logger.info(f"Calculating {req.scenario_type} scenario for {len(req.portfolio_entries)} portfolio entries")
+        logger.debug("Calculating %s scenario for %d portfolio entries", req.scenario_type, len(req.portfolio_entries))
         
         # Validate portfolio entries
         if not req.portfolio_entries:
             raise ValueError("Portfolio entries cannot be empty")
         
         # Perform scenario calculation
-        result = scenario_engine.calculate_scenario(
+        result = get_scenario_engine().calculate_scenario(
             portfolio_entries=req.portfolio_entries,
-            scenario_type=req.scenario_type
+            scenario_type=req.scenario_type,
+            group_by=req.group_by,
+            include_results=req.include_results,
+            response_format=format
         )
         
         if not result.success:
             raise ValueError(result.error or "Scenario calculation failed")
         
-        logger.info(f"Scenario calculation completed successfully. Total loss increase: {result.total_loss_increase_percentage:.2f}%")
-        return result
+        logger.debug("Scenario calculation completed successfully. Total loss increase: %.2f%%", result.total_loss_increase_percentage)
+        return ModelResponse(result)
         
     except ValueError as e:
-        logger.error(f"Validation error in scenario calculation: {str(e)}")
+        logger.warning("Validation error in scenario calculation: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Internal error in scenario calculation: {str(e)}")
+        logger.error("Internal error in scenario calculation: %s", e)
         raise HTTPException(status_code=500, detail="Internal scenario calculation error")
 
 
+@app.post("/scenario/calculate", response_model=Union[ScenarioResponse, ScenarioColumnarResponse], openapi_extra=_request_body_doc(ScenarioRequest))
+async def calculate_scenario(request: Request, format: ResponseFormat = "rows") -> Response:
+    """
+    Calculate climate stress testing scenarios using sector-specific multipliers
+    `format=columns` returns results as one array per field with sectors
+    dictionary-encoded (ScenarioColumnarResponse).
+    """
+    return await _run_json_request(request, _calculate_scenario, ScenarioRequest, format)
+
+
+
+def _calculate_scenarios(req: MultiScenarioRequest) -> ModelResponse:
+    """/scenario/calculate-multiple calculation (inline or in a pool worker)"""
+    try:
+        logger.debug("Calculating scenarios %s for %d portfolio entries", req.scenario_types, len(req.portfolio_entries))
+
+        if not req.portfolio_entries:
+            raise ValueError("Portfolio entries cannot be empty")
+
+        result = get_scenario_engine().calculate_scenarios(
+            portfolio_entries=req.portfolio_entries,
+            scenario_types=req.scenario_types
+        )
+
+        if not result.success:
+            raise ValueError(result.error or "Scenario calculation failed")
+
+        return ModelResponse(result)
+
+    except ValueError as e:
+        logger.warning("Validation error in multi-scenario calculation: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error in multi-scenario calculation: %s", e)
+        raise HTTPException(status_code=500, detail="Internal scenario calculation error")
+
+
+@app.post("/scenario/calculate-multiple", response_model=MultiScenarioResponse, openapi_extra=_request_body_doc(MultiScenarioRequest))
+async def calculate_scenarios(request: Request) -> Response:
+    """
+    Calculate several climate stress scenarios over one portfolio in a single pass
+    Baseline values are shared; totals and per-entry columns are keyed by scenario type.
+    """
+    return await _run_json_request(request, _calculate_scenarios, MultiScenarioRequest)
+
+
+
+async def _stream_scenario(
+    request: Request,
+    scenario_type: str,
+    group_by: List[str],
+    include_results: Optional[bool]
+) -> AsyncIterator[bytes]:
+    """
+    Parse an uploaded portfolio incrementally and stream per-entry results
+    Only one chunk of entries is held in memory; the last line has the totals.
+    """
+    from .scenario_stream import ScenarioStream
+    stream = ScenarioStream(get_scenario_engine(), scenario_type, group_by, include_results)
+    index = 0
+    try:
+        records = iter_upload_records(request.stream(), request.headers.get("content-type"))
+        async for chunk in iter_chunks(records, SCENARIO_CHUNK_SIZE):
+            yield await run_in_threadpool(stream.process_chunk, chunk, index)
+            index += len(chunk)
+    except Exception as e:
+        logger.error("Internal error in streamed scenario calculation after %d entries: %s", index, e)
+        yield encode_ndjson(stream.summary(error="Internal scenario calculation error"))
+        return
+    yield encode_ndjson(stream.summary())
+
+
+SCENARIO_UPLOAD_DOC = {
+    "requestBody": {
+        "description": "Portfolio entries as CSV (header row with PortfolioEntry field names), NDJSON or a JSON array",
+        "content": {
+            CSV_MEDIA_TYPE: {"schema": {"type": "string"}},
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+        },
+        "required": True,
+    }
+}
+SCENARIO_STREAM_RESPONSE_DOC = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": "One JSON result per entry, then a final line with the summary totals",
+    }
+}
+
+
+@app.post("/scenario/calculate/stream", openapi_extra=SCENARIO_UPLOAD_DOC, responses=SCENARIO_STREAM_RESPONSE_DOC)
+async def calculate_scenario_stream(
+    request: Request,
+    scenario_type: ScenarioType,
+    group_by: List[GroupByField] = Query([]),
+    include_results: Optional[bool] = None
+) -> RequestStreamingResponse:
+    """
+    Calculate a climate stress scenario over an uploaded portfolio, streaming NDJSON results
+    Each entry line has the row index and either the result or an inline error;
+    the last line is {"summary": {...}} with the running totals and any
+    `group_by` aggregates. With group_by, result lines are omitted unless
+    include_results=true (error lines are always sent).
+    """
+    return RequestStreamingResponse(_stream_scenario(request, scenario_type, group_by, include_results))
+
+
+
+def _simulate_scenario(req: MonteCarloRequest) -> ModelResponse:
+    """/scenario/simulate calculation (inline or in a pool worker)"""
+    try:
+        logger.debug("Simulating %s scenario: %d draws over %d portfolio entries", req.scenario_type, req.simulations, len(req.portfolio_entries))
+
+        if not req.portfolio_entries:
+            raise ValueError("Portfolio entries cannot be empty")
+
+        result = get_scenario_engine().simulate_scenario(
+            portfolio_entries=req.portfolio_entries,
+            scenario_type=req.scenario_type,
+            simulations=req.simulations,
+            seed=req.seed,
+            pd_multiplier_volatility=req.pd_multiplier_volatility,
+            lgd_change_std=req.lgd_change_std,
+            sector_volatility=req.sector_volatility,
+            offloader=offloader
+        )
+
+        if not result.success:
+            raise ValueError(result.error or "Scenario simulation failed")
+
+        return ModelResponse(result)
+
+    except OffloadRejected as e:
+        logger.warning("Rejected scenario simulation: %s", e)
+        raise HTTPException(status_code=503, detail="Server busy, retry later")
+    except OffloadTimeout as e:
+        logger.warning("Timed out scenario simulation: %s", e)
+        raise HTTPException(status_code=504, detail="Calculation timed out")
+    except ValueError as e:
+        logger.warning("Validation error in scenario simulation: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error in scenario simulation: %s", e)
+        raise HTTPException(status_code=500, detail="Internal scenario simulation error")
+
+
+@app.post("/scenario/simulate", response_model=MonteCarloResponse, openapi_extra=_request_body_doc(MonteCarloRequest))
+async def simulate_scenario(request: Request) -> Response:
+    """
+    Monte Carlo climate stress test with stochastic sector multipliers
+    Returns the loss distribution (mean, P95, P99, expected shortfall) and the
+    seed, so the run can be reproduced. Large runs fan their draw blocks out
+    over the offload process pool.
+    """
+    return await _run_json_request(request, _simulate_scenario, MonteCarloRequest)
+
+
+
+def _project_scenarios(req: HorizonRequest) -> ModelResponse:
+    """/scenario/project calculation (inline or in a pool worker)"""
+    try:
+        logger.debug("Projecting scenarios %s for %d portfolio entries", req.scenario_types, len(req.portfolio_entries))
+
+        if not req.portfolio_entries:
+            raise ValueError("Portfolio entries cannot be empty")
+
+        result = get_scenario_engine().project_scenarios(
+            portfolio_entries=req.portfolio_entries,
+            scenario_types=req.scenario_types,
+            max_years=req.max_years,
+            include_entries=req.include_entries
+        )
+
+        if not result.success:
+            raise ValueError(result.error or "Scenario projection failed")
+
+        return ModelResponse(result)
+
+    except ValueError as e:
+        logger.warning("Validation error in scenario projection: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error in scenario projection: %s", e)
+        raise HTTPException(status_code=500, detail="Internal scenario projection error")
+
+
+@app.post("/scenario/project", response_model=HorizonResponse, openapi_extra=_request_body_doc(HorizonRequest))
+async def project_scenarios(request: Request) -> Response:
+    """
+    Project cumulative PD and expected loss per year over each exposure's remaining tenor
+    Returns baseline and per-scenario loss term structures.
+    """
+    return await _run_json_request(request, _project_scenarios, HorizonRequest)
+
+
+
+def _sweep_sensitivity(req: SensitivityRequest) -> ModelResponse:
+    """/scenario/sensitivity calculation (inline or in a pool worker)"""
+    try:
+        logger.debug("Sweeping %s scenario over %d axes for %d portfolio entries", req.scenario_type, len(req.axes), len(req.portfolio_entries))
+
+        if not req.portfolio_entries:
+            raise ValueError("Portfolio entries cannot be empty")
+
+        result = get_scenario_engine().sweep_sensitivity(
+            portfolio_entries=req.portfolio_entries,
+            scenario_type=req.scenario_type,
+            axes=req.axes
+        )
+
+        if not result.success:
+            raise ValueError(result.error or "Sensitivity sweep failed")
+
+        return ModelResponse(result)
+
+    except ValueError as e:
+        logger.warning("Validation error in sensitivity sweep: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error in sensitivity sweep: %s", e)
+        raise HTTPException(status_code=500, detail="Internal sensitivity sweep error")
+
+
+@app.post("/scenario/sensitivity", response_model=SensitivityResponse, openapi_extra=_request_body_doc(SensitivityRequest))
+async def sweep_sensitivity(request: Request) -> Response:
+    """
+    Loss surface over ranges of one or two sector multipliers or LGD changes
+    """
+    return await _run_json_request(request, _sweep_sensitivity, SensitivityRequest)
+
+
+
+def _get_scenario_session(session_id: str) -> 'ScenarioSession':
+    session = get_scenario_sessions().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Scenario session '{session_id}' not found or expired")
+    return session
+
+
+@app.post("/scenario/sessions", response_model=ScenarioSessionResponse)
+def create_scenario_session(req: ScenarioSessionRequest) -> ModelResponse:
+    """
+    Start an incremental scenario session over an initial portfolio
+    Later add/update/remove deltas update the totals in O(delta).
+    """
+    from .scenario_session import ScenarioSession
+    try:
+        session = ScenarioSession(get_scenario_engine(), req.scenario_types, req.group_by)
+        session.apply_delta(PortfolioDelta(add=req.portfolio_entries))
+        get_scenario_sessions().add(session)
+        return ModelResponse(session.snapshot())
+    except ValueError as e:
+        logger.warning("Validation error creating scenario session: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error creating scenario session: %s", e)
+        raise HTTPException(status_code=500, detail="Internal scenario calculation error")
+
+
+@app.get("/scenario/sessions/{session_id}", response_model=ScenarioSessionResponse)
+def get_scenario_session(session_id: str) -> ModelResponse:
+    """Current totals and every group of a scenario session"""
+    return ModelResponse(_get_scenario_session(session_id).snapshot())
+
+
+@app.post("/scenario/sessions/{session_id}/deltas", response_model=ScenarioSessionResponse)
+def apply_scenario_delta(session_id: str, delta: PortfolioDelta) -> ModelResponse:
+    """
+    Apply portfolio changes to a scenario session
+    Returns the new totals and only the groups the delta touched.
+    """
+    session = _get_scenario_session(session_id)
+    try:
+        return ModelResponse(session.apply_delta(delta))
+    except ValueError as e:
+        logger.warning("Validation error in scenario session delta: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Internal error in scenario session delta: %s", e)
+        raise HTTPException(status_code=500, detail="Internal scenario calculation error")
+
+
+@app.delete("/scenario/sessions/{session_id}")
+def delete_scenario_session(session_id: str):
+    """Drop a scenario session"""
+    if not get_scenario_sessions().remove(session_id):
+        raise HTTPException(status_code=404, detail=f"Scenario session '{session_id}' not found or expired")
+    return {"success": True, "session_id": session_id}
+
+
 # Local dev entrypoint: uvicorn backend.fastapi_app.main:app --reload
 
@@ -1,23 +1,56 @@
 from pydantic import BaseModel, Field, conlist, confloat
-from typing import List, Optional, Literal, Dict, Any
+from typing import List, Optional, Literal, Dict, Any, Union
+
+
+StepDetail = Literal["none", "summary", "full"]
+
+# "rows": one object per result (default); "columns": one array per field
+ResponseFormat = Literal["rows", "columns"]
+
+
+class DatabaseHealth(BaseModel):
+    """Outcome of the latest database probe"""
+    status: Literal["connected", "disconnected", "unknown"]
+    checked_at: Optional[str] = None  # ISO 8601, UTC
+    age_seconds: Optional[float] = None
+    last_success_at: Optional[str] = None
+    latency_ms: Optional[float] = None
+    consecutive_failures: int = 0
+    error: Optional[str] = None
 
 
 class HealthResponse(BaseModel):
     status: Literal["ok"]
     engine_version: str
     database_status: Optional[str] = None
+    database: Optional[DatabaseHealth] = None
+
+
+class TraceConfigRequest(BaseModel):
+    """Calculation tracing settings to change; omitted fields are kept"""
+    enabled: Optional[bool] = None
+    sample_rate: Optional[int] = Field(default=None, ge=1)
+    level: Optional[str] = None  # logging level name or number, e.g. "INFO"
+
+
+class TraceStatus(BaseModel):
+    enabled: bool
+    sample_rate: int
+    level: str
 
 
 class FinanceEmissionRequest(BaseModel):
     formula_id: str
     company_type: Literal["listed", "unlisted"]
     inputs: Dict[str, Any]
+    steps: StepDetail = "full"  # calculation_steps detail: none | summary | full
 
 
 class FacilitatedEmissionRequest(BaseModel):
     formula_id: str
     company_type: Literal["listed", "unlisted"]
     inputs: Dict[str, Any]
+    steps: StepDetail = "full"  # calculation_steps detail: none | summary | full
 
 
 class CalculationResult(BaseModel):
@@ -57,9 +90,18 @@ class PortfolioEntry(BaseModel):
     tenor: int  # months
 
 
+ScenarioType = Literal["transition", "physical", "combined"]
+
+# Dimensions scenario totals can be grouped by
+GroupByField = Literal["sector", "geography", "counterparty", "tenor_bucket"]
+
+
 class ScenarioRequest(BaseModel):
-    scenario_type: Literal["transition", "physical", "combined"]
+    scenario_type: ScenarioType
     portfolio_entries: List[PortfolioEntry]
+    group_by: List[GroupByField] = []
+    # Per-entry results; defaults to True without group_by and False with it
+    include_results: Optional[bool] = None
 
 
 class ScenarioResult(BaseModel):
@@ -78,6 +120,24 @@ class ScenarioResult(BaseModel):
     loss_increase_percentage: float
 
 
+class UnmatchedSector(BaseModel):
+    """A portfolio sector with no multipliers (stressed with defaults)"""
+    sector: str
+    entries: int
+    exposure: float
+
+
+class ScenarioGroupTotals(BaseModel):
+    """Scenario totals for one group of portfolio entries"""
+    group: str
+    entries: int
+    total_exposure: float
+    total_baseline_expected_loss: float
+    total_climate_adjusted_expected_loss: float
+    total_loss_increase: float
+    total_loss_increase_percentage: float
+
+
 class ScenarioResponse(BaseModel):
     success: bool
     scenario_type: str
@@ -87,4 +147,238 @@ class ScenarioResponse(BaseModel):
     total_loss_increase: float
     total_loss_increase_percentage: float
     results: List[ScenarioResult]
-    error: Optional[str] = None
\ No newline at end of file
+    # Keyed by group_by dimension, present only when group_by was requested
+    groups: Optional[Dict[str, List[ScenarioGroupTotals]]] = None
+    unmatched_sectors: List[UnmatchedSector] = []
+    error: Optional[str] = None
+
+
+class ScenarioResultColumns(BaseModel):
+    """ScenarioResult fields as parallel arrays; sector is dictionary-encoded (sectors[sector_codes[i]])"""
+    company: List[str]
+    sectors: List[str]
+    sector_codes: List[int]
+    exposure: List[float]
+    baseline_pd: List[float]
+    baseline_lgd: List[float]
+    pd_multiplier: List[float]
+    adjusted_pd: List[float]
+    lgd_change: List[float]
+    adjusted_lgd: List[float]
+    climate_adjusted_expected_loss: List[float]
+    baseline_expected_loss: List[float]
+    loss_increase: List[float]
+    loss_increase_percentage: List[float]
+
+
+class ScenarioColumnarResponse(BaseModel):
+    """ScenarioResponse with results as columns (?format=columns)"""
+    success: bool
+    format: Literal["columns"] = "columns"
+    scenario_type: str
+    total_exposure: float
+    total_baseline_expected_loss: float
+    total_climate_adjusted_expected_loss: float
+    total_loss_increase: float
+    total_loss_increase_percentage: float
+    results: Optional[ScenarioResultColumns] = None
+    groups: Optional[Dict[str, List[ScenarioGroupTotals]]] = None
+    unmatched_sectors: List[UnmatchedSector] = []
+    error: Optional[str] = None
+
+
+class BatchColumnsChunk(BaseModel):
+    """
+    One chunk of batch results as columns (?format=columns on the batch endpoints)
+    formula_id and company_type are dictionary-encoded (formula_ids[formula_id_codes[i]]).
+    """
+    start: int  # index of the chunk's first row in the request
+    rows: int
+    formula_ids: List[str]
+    formula_id_codes: List[int]
+    company_types: List[str]
+    company_type_codes: List[int]
+    success: List[bool]
+    attribution_factor: List[Optional[float]]  # None where success is false
+    emission_factor: List[Optional[float]]
+    financed_emissions: List[Optional[float]]
+    denominator: List[Optional[float]]
+    data_quality_score: List[int]
+    # None where success is true; else the parse, request validation or calculation error
+    errors: List[Optional[str]]
+    warnings: List[List[str]]  # validation warnings, [] when there are none
+
+
+class MultiScenarioRequest(BaseModel):
+    scenario_types: conlist(ScenarioType, min_length=1) = ["transition", "physical", "combined"]
+    portfolio_entries: List[PortfolioEntry]
+
+
+class ScenarioTotals(BaseModel):
+    total_climate_adjusted_expected_loss: float
+    total_loss_increase: float
+    total_loss_increase_percentage: float
+
+
+class ScenarioEntryColumns(BaseModel):
+    """Per-entry scenario values, one list per field (index i = portfolio entry i)"""
+    pd_multiplier: List[float]
+    adjusted_pd: List[float]
+    lgd_change: List[float]
+    adjusted_lgd: List[float]
+    climate_adjusted_expected_loss: List[float]
+    loss_increase: List[float]
+    loss_increase_percentage: List[float]
+
+
+class BaselineEntryColumns(BaseModel):
+    """Scenario-independent per-entry values"""
+    company: List[str]
+    sector: List[str]
+    exposure: List[float]
+    baseline_pd: List[float]
+    baseline_lgd: List[float]
+    baseline_expected_loss: List[float]
+
+
+class MultiScenarioResponse(BaseModel):
+    success: bool
+    scenario_types: List[str]
+    total_exposure: float
+    total_baseline_expected_loss: float
+    totals: Dict[str, ScenarioTotals]
+    baseline: Optional[BaselineEntryColumns] = None
+    scenarios: Dict[str, ScenarioEntryColumns]
+    unmatched_sectors: List[UnmatchedSector] = []
+    error: Optional[str] = None
+
+
+class SectorVolatility(BaseModel):
+    """Spread of one sector's multipliers around their point values"""
+    pd_multiplier_volatility: Optional[confloat(ge=0)] = None  # lognormal sigma
+    lgd_change_std: Optional[confloat(ge=0)] = None  # percentage points
+
+
+class MonteCarloRequest(BaseModel):
+    scenario_type: ScenarioType
+    portfolio_entries: List[PortfolioEntry]
+    simulations: int = Field(10000, ge=1, le=1_000_000)
+    # Same seed (and inputs) -> same draws, whatever the worker count
+    seed: Optional[int] = Field(None, ge=0)
+    pd_multiplier_volatility: confloat(ge=0) = 0.1
+    lgd_change_std: confloat(ge=0) = 2.0
+    # Per-sector overrides, keyed by sector name
+    sector_volatility: Dict[str, SectorVolatility] = {}
+
+
+class LossDistribution(BaseModel):
+    mean: float
+    std: float
+    min: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    expected_shortfall_95: float
+    expected_shortfall_99: float
+
+
+class MonteCarloResponse(BaseModel):
+    success: bool
+    scenario_type: str
+    simulations: int
+    seed: Optional[int] = None
+    total_exposure: float
+    total_baseline_expected_loss: float
+    # Loss with the point multipliers (as /scenario/calculate)
+    total_climate_adjusted_expected_loss: float
+    climate_adjusted_expected_loss: Optional[LossDistribution] = None
+    loss_increase: Optional[LossDistribution] = None
+    unmatched_sectors: List[UnmatchedSector] = []
+    error: Optional[str] = None
+
+
+class HorizonRequest(BaseModel):
+    scenario_types: conlist(ScenarioType, min_length=1) = ["transition", "physical", "combined"]
+    portfolio_entries: List[PortfolioEntry]
+    # Projection length; defaults to the longest remaining tenor
+    max_years: Optional[int] = Field(None, ge=1, le=100)
+    # Per-entry (entries × years) arrays in the response
+    include_entries: bool = False
+
+
+class LossTermStructure(BaseModel):
+    """Portfolio loss per projection year (index y = year y + 1)"""
+    cumulative_pd: List[float]  # exposure-weighted, %
+    cumulative_expected_loss: List[float]
+    marginal_expected_loss: List[float]
+    entry_cumulative_pd: Optional[List[List[float]]] = None  # entries × years, %
+    entry_cumulative_expected_loss: Optional[List[List[float]]] = None  # entries × years
+
+
+class HorizonResponse(BaseModel):
+    success: bool
+    scenario_types: List[str]
+    years: List[int]
+    # Exposure with tenor remaining at the start of each year
+    exposure_at_risk: List[float]
+    baseline: Optional[LossTermStructure] = None
+    scenarios: Dict[str, LossTermStructure]
+    unmatched_sectors: List[UnmatchedSector] = []
+    error: Optional[str] = None
+
+
+class SweepAxis(BaseModel):
+    """Values to try for one multiplier of one sector"""
+    sector: str
+    parameter: Literal["transition_pd_multiplier", "physical_pd_multiplier", "lgd_change"]
+    values: conlist(float, min_length=1, max_length=201)
+
+
+class SensitivityRequest(BaseModel):
+    scenario_type: ScenarioType
+    portfolio_entries: List[PortfolioEntry]
+    axes: conlist(SweepAxis, min_length=1, max_length=2)
+
+
+class SensitivityResponse(BaseModel):
+    success: bool
+    scenario_type: str
+    axes: List[SweepAxis]
+    total_exposure: float
+    total_baseline_expected_loss: float
+    # Loss with the table multipliers (as /scenario/calculate)
+    total_climate_adjusted_expected_loss: float
+    # [i] for one axis, [i][j] for two (axes[0].values[i], axes[1].values[j])
+    climate_adjusted_expected_loss: Union[List[float], List[List[float]]]
+    loss_increase: Union[List[float], List[List[float]]]
+    error: Optional[str] = None
+
+
+class ScenarioSessionRequest(BaseModel):
+    scenario_types: conlist(ScenarioType, min_length=1) = ["transition", "physical", "combined"]
+    group_by: List[GroupByField] = []
+    portfolio_entries: List[PortfolioEntry] = []
+
+
+class PortfolioDelta(BaseModel):
+    """Changes to a session portfolio, matched by PortfolioEntry.id"""
+    add: List[PortfolioEntry] = []
+    update: List[PortfolioEntry] = []
+    remove: List[str] = []
+
+
+class ScenarioSessionResponse(BaseModel):
+    success: bool
+    session_id: str
+    version: int
+    entries: int
+    total_exposure: float
+    total_baseline_expected_loss: float
+    totals: Dict[str, ScenarioTotals]
+    # scenario type -> group_by field -> group totals (every group for a
+    # snapshot, only groups touched by the delta otherwise)
+    groups: Dict[str, Dict[str, List[ScenarioGroupTotals]]] = {}
+    # group_by field -> groups the delta emptied
+    removed_groups: Dict[str, List[str]] = {}
+    error: Optional[str] = None
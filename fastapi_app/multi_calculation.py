@@ -0,0 +1,241 @@
+"""
+Multiple Formula Calculation
+Evaluate several formulas over one input set with shared intermediates
+
+The denominator and attribution factors are resolved once in a shared
+CalculationContext and reused by every formula's calculator kernel. Failures
+are returned per formula instead of being logged and dropped. Large formula
+sets can be fanned out across a thread or process pool.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+from .finance_models import CalculationResult, CalculationStepDetail, CompanyType
+from .calculators import CalculationContext
+from .formula_registry import DEFAULT_FORMULA_REGISTRY
+
+if TYPE_CHECKING:
+    from .calculation_engine import CalculationEngine
+
+
+# None (inline), 'thread', 'process', or a caller-owned Executor
+ExecutorOption = Union[None, str, Executor]
+
+# Below this many formulas a pool costs more than it saves
+PARALLEL_MIN_FORMULAS = 16
+
+
+@dataclass
+class FormulaError:
+    """Why a single formula could not be calculated"""
+    formula_id: str
+    error_type: str  # 'not_found' | 'validation' | 'calculation'
+    message: str
+    errors: List[str] = field(default_factory=list)
+    missing_inputs: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'formula_id': self.formula_id,
+            'error_type': self.error_type,
+            'message': self.message,
+            'errors': self.errors,
+            'missing_inputs': self.missing_inputs,
+        }
+
+
+@dataclass
+class MultipleCalculationResult:
+    """Per-formula results and errors, in request order"""
+    results: Dict[str, CalculationResult]
+    errors: Dict[str, FormulaError]
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'results': {formula_id: result.model_dump() for formula_id, result in self.results.items()},
+            'errors': {formula_id: error.to_dict() for formula_id, error in self.errors.items()},
+        }
+
+
+FormulaOutcomes = Tuple[Dict[str, CalculationResult], Dict[str, FormulaError]]
+
+
+# ============================================================================
+# CORE LOOP
+# ============================================================================
+
+def _calculate_formulas(
+    engine: 'CalculationEngine',
+    formula_ids: Sequence[str],
+    inputs: Dict[str, Any],
+    company_type: CompanyType,
+    steps: CalculationStepDetail,
+    context: CalculationContext
+) -> FormulaOutcomes:
+    """Run formulas against a shared context (no cache access)"""
+    results: Dict[str, CalculationResult] = {}
+    errors: Dict[str, FormulaError] = {}
+
+    for formula_id in formula_ids:
+        formula = engine.get_formula_by_id(formula_id)
+        if formula is None:
+            errors[formula_id] = FormulaError(formula_id, 'not_found', f"Formula '{formula_id}' not found")
+            continue
+
+        validation = engine._validate(formula, inputs)
+        if not validation.is_valid:
+            errors[formula_id] = FormulaError(
+                formula_id,
+                'validation',
+                f"Validation failed: {', '.join(validation.errors)}",
+                errors=validation.errors,
+                missing_inputs=validation.missing_inputs
+            )
+            continue
+
+        try:
+            result = engine._execute_calculation(formula, inputs, company_type, steps, context)
+        except Exception as error:
+            errors[formula_id] = FormulaError(formula_id, 'calculation', str(error))
+            continue
+        engine._add_validation_warnings(result, validation)
+        results[formula_id] = result
+
+    return results, errors
+
+
+# ============================================================================
+# POOLS
+# ============================================================================
+
+_shared_pools: Dict[Tuple[str, int], Executor] = {}
+_shared_pools_lock = threading.Lock()
+_worker_engine: Optional['CalculationEngine'] = None
+
+
+def _default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _shared_pool(kind: str, max_workers: int) -> Executor:
+    """Lazily created module-level pools, reused across calls"""
+    key = (kind, max_workers)
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            if kind == 'thread':
+                pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='calculate-multiple')
+            elif kind == 'process':
+                # Imported here so startup doesn't load multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+            else:
+                raise ValueError(f"Unsupported executor: {kind!r} (expected 'thread' or 'process')")
+            _shared_pools[key] = pool
+        return pool
+
+
+def _process_worker(
+    formula_ids: Sequence[str],
+    inputs: Dict[str, Any],
+    company_type: CompanyType,
+    steps: CalculationStepDetail
+) -> FormulaOutcomes:
+    """Process pool entry point - each worker process keeps one default engine"""
+    global _worker_engine
+    if _worker_engine is None:
+        from .calculation_engine import CalculationEngine
+        _worker_engine = CalculationEngine()
+    context = CalculationContext(inputs, company_type)
+    return _calculate_formulas(_worker_engine, formula_ids, inputs, company_type, steps, context)
+
+
+def _fan_out(
+    engine: 'CalculationEngine',
+    formula_ids: List[str],
+    inputs: Dict[str, Any],
+    company_type: CompanyType,
+    steps: CalculationStepDetail,
+    executor: Union[str, Executor],
+    max_workers: Optional[int]
+) -> FormulaOutcomes:
+    workers = max_workers or _default_workers()
+    pool = _shared_pool(executor, workers) if isinstance(executor, str) else executor
+    from concurrent.futures import ProcessPoolExecutor
+    use_processes = isinstance(pool, ProcessPoolExecutor)
+    if use_processes and engine.registry is not DEFAULT_FORMULA_REGISTRY:
+        raise ValueError("Process pools can only calculate formulas from the default formula registry")
+
+    chunk_size = math.ceil(len(formula_ids) / workers)
+    chunks = [formula_ids[start:start + chunk_size] for start in range(0, len(formula_ids), chunk_size)]
+    if use_processes:
+        futures = [pool.submit(_process_worker, chunk, inputs, company_type, steps) for chunk in chunks]
+    else:
+        # Threads share one context, so intermediates are still resolved once
+        context = CalculationContext(inputs, company_type)
+        futures = [
+            pool.submit(_calculate_formulas, engine, chunk, inputs, company_type, steps, context)
+            for chunk in chunks
+        ]
+
+    results: Dict[str, CalculationResult] = {}
+    errors: Dict[str, FormulaError] = {}
+    for future in futures:
+        chunk_results, chunk_errors = future.result()
+        results.update(chunk_results)
+        errors.update(chunk_errors)
+    return results, errors
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def calculate_multiple(
+    engine: 'CalculationEngine',
+    formula_ids: Sequence[str],
+    inputs: Dict[str, Any],
+    company_type: CompanyType,
+    steps: CalculationStepDetail = CalculationStepDetail.FULL,
+    executor: ExecutorOption = None,
+    max_workers: Optional[int] = None
+) -> MultipleCalculationResult:
+    """
+    Calculate several formulas over one input set
+    Cached results are served first; the rest run inline, or on `executor` when
+    there are at least PARALLEL_MIN_FORMULAS of them.
+    """
+    ordered_ids = list(dict.fromkeys(formula_ids))
+    cached: Dict[str, CalculationResult] = {}
+    cache_keys: Dict[str, Any] = {}
+    pending: List[str] = []
+    for formula_id in ordered_ids:
+        cache_key, result = engine._cache_lookup(formula_id, inputs, company_type, steps)
+        if result is not None:
+            cached[formula_id] = result
+        else:
+            cache_keys[formula_id] = cache_key
+            pending.append(formula_id)
+
+    if executor is not None and len(pending) >= PARALLEL_MIN_FORMULAS:
+        results, errors = _fan_out(engine, pending, inputs, company_type, steps, executor, max_workers)
+    else:
+        context = CalculationContext(inputs, company_type)
+        results, errors = _calculate_formulas(engine, pending, inputs, company_type, steps, context)
+
+    for formula_id, result in results.items():
+        engine._cache_store(cache_keys[formula_id], result)
+    results.update(cached)
+
+    return MultipleCalculationResult(
+        results={formula_id: results[formula_id] for formula_id in ordered_ids if formula_id in results},
+        errors={formula_id: errors[formula_id] for formula_id in ordered_ids if formula_id in errors}
+    )
@@ -0,0 +1,282 @@
+"""
+CPU Offload
+Process-pool dispatch for CPU-heavy request handling
+
+Parsing, validating and calculating a large scenario portfolio holds the GIL
+for its whole duration, which stalls /health and small calculations served by
+the same worker. Requests whose body reaches a size threshold are handed to a
+shared process pool as raw bytes and come back as encoded JSON, so the event
+loop process only moves bytes; smaller requests run on the threadpool.
+
+The pool is created on first use, with forkserver (spawn where that is
+unavailable) worker processes. Work waiting in or running on the pool is
+capped (further requests are rejected with OffloadRejected) and each request
+waits at most the configured timeout (OffloadTimeout). map() fans a
+calculation out over the same pool, with the same cap and timeout, from a
+worker thread (e.g. Monte Carlo simulation blocks); inside a pool worker it
+runs inline rather than starting a nested pool. If a process pool
+cannot be started (e.g. no /dev/shm on AWS Lambda) offloading switches off
+and everything runs on the threadpool.
+
+Environment configuration (read when the default offloader is created):
+    OFFLOAD_ENABLED=1               set to 0 to run everything inline
+    OFFLOAD_WORKERS=<cpu count>     worker processes
+    OFFLOAD_MAX_QUEUE=32            requests queued or running on the pool
+    OFFLOAD_TIMEOUT_SECONDS=60      per-request wait for a pool result
+    OFFLOAD_MIN_BODY_BYTES=262144   request body size that is offloaded
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Set in pool worker processes (by the pool initializer)
+_in_pool_worker = False
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _mark_pool_worker() -> None:
+    global _in_pool_worker
+    _in_pool_worker = True
+
+
+class OffloadRejected(RuntimeError):
+    """The pool queue is full"""
+
+
+class OffloadTimeout(RuntimeError):
+    """A pool result did not arrive in time"""
+
+
+class ProcessOffloader:
+    """Lazily started process pool with a bounded queue, timeouts and counters"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        timeout_seconds: float = 60.0,
+        min_body_bytes: int = 256 * 1024,
+        enabled: bool = True
+    ):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.max_queue = max(1, max_queue)
+        self.timeout_seconds = timeout_seconds
+        self.min_body_bytes = min_body_bytes
+        self.enabled = enabled
+        self._pool: Optional['ProcessPoolExecutor'] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._counters = {
+            'inline': 0, 'submitted': 0, 'completed': 0, 'failed': 0,
+            'rejected': 0, 'timed_out': 0, 'pool_restarts': 0,
+        }
+        self._pool_seconds = 0.0
+        self._pool_seconds_max = 0.0
+
+    def offloads(self, body_bytes: Optional[int]) -> bool:
+        """Whether a request body of this size goes to the pool (unknown sizes count as large)"""
+        return self.enabled and not _in_pool_worker and (body_bytes is None or body_bytes >= self.min_body_bytes)
+
+    def run_inline(self, func: Callable[..., T], *args: Any) -> T:
+        """Run `func` in the calling thread, counted as inline work"""
+        with self._lock:
+            self._counters['inline'] += 1
+        return func(*args)
+
+    def _get_pool(self) -> 'ProcessPoolExecutor':
+        with self._lock:
+            if self._pool is None:
+                # Imported here so startup doesn't load multiprocessing
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # Not fork: the server is multithreaded by now (threadpool, health
+                # monitor), and a forked child can inherit a lock another thread holds
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=_mark_pool_worker
+                )
+            return self._pool
+
+    def _restart_pool(self, broken: 'ProcessPoolExecutor') -> None:
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+                self._counters['pool_restarts'] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, func: Callable[..., T], *args: Any) -> Optional[Tuple['ProcessPoolExecutor', 'Future[T]']]:
+        """Submit to the pool; None when no pool can be started (offloading is then disabled)"""
+        try:
+            pool = self._get_pool()
+        except (OSError, NotImplementedError, ImportError) as e:
+            logger.warning("Process pool unavailable, running CPU-heavy requests inline: %s", e)
+            self.enabled = False
+            return None
+        try:
+            return pool, pool.submit(func, *args)
+        except BrokenExecutor:
+            self._restart_pool(pool)
+            pool = self._get_pool()
+            return pool, pool.submit(func, *args)
+
+    def _reserve(self, count: int) -> None:
+        """Take `count` queue slots or raise OffloadRejected"""
+        with self._lock:
+            if self._in_flight + count > self.max_queue:
+                self._counters['rejected'] += 1
+                raise OffloadRejected(f"Offload queue is full ({self.max_queue} requests)")
+            self._in_flight += count
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def _release(self, count: int) -> None:
+        with self._lock:
+            self._in_flight -= count
+
+    def _track(self, future: 'Future[Any]', started: float) -> None:
+        with self._lock:
+            self._counters['submitted'] += 1
+        future.add_done_callback(lambda done: self._finished(done, started))
+
+    def _finished(self, future: 'Future[Any]', started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            self._counters['failed' if future.exception() is not None else 'completed'] += 1
+            self._pool_seconds += elapsed
+            self._pool_seconds_max = max(self._pool_seconds_max, elapsed)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run `func(*args)` on the pool and await its result
+        `func` and its arguments must be picklable. Raises OffloadRejected when
+        max_queue requests are already queued or running and OffloadTimeout
+        after timeout_seconds; falls back to inline when no pool can start.
+        """
+        self._reserve(1)
+        started = time.perf_counter()
+        try:
+            submitted = self._submit(func, *args)
+        except BaseException:
+            self._release(1)
+            raise
+        if submitted is None:
+            self._release(1)
+            return self.run_inline(func, *args)
+        pool, future = submitted
+        self._track(future, started)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # Queued work is cancelled; a running task finishes in its worker
+            future.cancel()
+            with self._lock:
+                self._counters['timed_out'] += 1
+            raise OffloadTimeout(f"No result within {self.timeout_seconds:g}s")
+        except BrokenExecutor:
+            self._restart_pool(pool)
+            raise
+
+    def map(self, func: Callable[..., T], tasks: Sequence[Tuple[Any, ...]]) -> List[T]:
+        """
+        Run `func(*args)` for each args tuple on the pool and return the results in order
+        Blocks, so call it from a worker thread. Each task takes a queue slot;
+        raises OffloadRejected / OffloadTimeout (the timeout covers all tasks)
+        like run(). Runs inline when offloading is disabled, no pool can start
+        or the caller is itself a pool worker.
+        """
+        if not self.enabled or _in_pool_worker:
+            return [self.run_inline(func, *args) for args in tasks]
+        self._reserve(len(tasks))
+        started = time.perf_counter()
+        futures: List[Tuple['ProcessPoolExecutor', 'Future[T]']] = []
+        try:
+            for args in tasks:
+                submitted = self._submit(func, *args)
+                if submitted is None:
+                    break
+                futures.append(submitted)
+                self._track(submitted[1], started)
+        except BaseException:
+            for _, future in futures:
+                future.cancel()
+            self._release(len(tasks) - len(futures))
+            raise
+        self._release(len(tasks) - len(futures))
+        if len(futures) < len(tasks):
+            for _, future in futures:
+                future.cancel()
+            return [self.run_inline(func, *args) for args in tasks]
+
+        deadline = time.monotonic() + self.timeout_seconds
+        try:
+            return [future.result(timeout=max(0.0, deadline - time.monotonic())) for _, future in futures]
+        except FutureTimeoutError:
+            for _, future in futures:
+                future.cancel()
+            with self._lock:
+                self._counters['timed_out'] += 1
+            raise OffloadTimeout(f"No result within {self.timeout_seconds:g}s")
+        except BrokenExecutor:
+            self._restart_pool(futures[0][0])
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Configuration, pool occupancy and counters"""
+        with self._lock:
+            finished = self._counters['completed'] + self._counters['failed']
+            return {
+                'enabled': self.enabled,
+                'pool_started': self._pool is not None,
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'timeout_seconds': self.timeout_seconds,
+                'min_body_bytes': self.min_body_bytes,
+                'in_flight': self._in_flight,
+                'running': min(self._in_flight, self.max_workers),
+                'queued': max(0, self._in_flight - self.max_workers),
+                'max_in_flight': self._max_in_flight,
+                **self._counters,
+                'pool_seconds_avg': self._pool_seconds / finished if finished else 0.0,
+                'pool_seconds_max': self._pool_seconds_max,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_default_offloader() -> ProcessOffloader:
+    """Build the offloader from environment configuration"""
+    return ProcessOffloader(
+        max_workers=_env_int("OFFLOAD_WORKERS", 0) or None,
+        max_queue=_env_int("OFFLOAD_MAX_QUEUE", 32),
+        timeout_seconds=float(_env_int("OFFLOAD_TIMEOUT_SECONDS", 60)),
+        min_body_bytes=_env_int("OFFLOAD_MIN_BODY_BYTES", 256 * 1024),
+        enabled=os.getenv("OFFLOAD_ENABLED", "1") != "0"
+    )
@@ -0,0 +1,181 @@
+"""
+Result Cache
+In-process memoization of CalculationEngine.calculate results
+
+Entries are keyed by the canonical form of (formula_id, company_type, steps,
+normalized inputs) and evicted by LRU order, TTL and an approximate memory
+budget. The cache is bound to a formula registry version and clears itself
+when the registry is rebuilt.
+
+Environment configuration (read when the default cache is created):
+    CALC_CACHE_ENABLED=0          disable result caching
+    CALC_CACHE_MAX_ENTRIES=10000  maximum number of cached results
+    CALC_CACHE_TTL_SECONDS=300    time-to-live per entry
+    CALC_CACHE_MAX_BYTES=67108864 approximate memory budget (64 MiB)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .finance_models import CalculationResult
+
+CacheKey = Tuple[str, str, str, Hashable]
+
+# Per-entry bookkeeping (OrderedDict node, entry tuple, key tuple)
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _normalize(value: Any) -> Hashable:
+    """
+    Canonical, hashable form of an input value
+    Dicts are order-independent. Ints, floats and bools stay distinct because
+    they render differently in calculation step formulas (1 vs 1.0 vs True).
+    Raises TypeError for uncacheable values.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return ('bool', value)
+    if isinstance(value, int):
+        return ('int', value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise TypeError("Non-finite numbers are not cached")
+        return value
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(key), _normalize(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ('list', tuple(_normalize(item) for item in value))
+    raise TypeError(f"Uncacheable input value of type {type(value).__name__}")
+
+
+def make_cache_key(formula_id: str, company_type: str, steps: str, inputs: Dict[str, Any]) -> Optional[CacheKey]:
+    """
+    Canonical key of a calculation request
+    Returns None when the inputs can't be canonicalized (the call bypasses the cache).
+    """
+    try:
+        return formula_id, company_type, steps, _normalize(inputs)
+    except TypeError:
+        return None
+
+
+class ResultCache:
+    """
+    Thread-safe LRU + TTL cache for calculation results
+
+    Results are stored as serialized JSON, which doubles as the entry's size for
+    the memory budget; get() rebuilds a fresh model so callers may mutate what
+    they receive.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[float, int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._registry_version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _entry_size(key: CacheKey, payload: str) -> int:
+        """Approximate retained size of an entry (payload, key and bookkeeping overhead)"""
+        return len(payload) + 64 * len(key[3][1]) + ENTRY_OVERHEAD_BYTES
+
+    def bind_registry_version(self, version: int) -> None:
+        """Clear the cache if the formula registry changed since entries were stored"""
+        if version != self._registry_version:
+            with self._lock:
+                if version != self._registry_version:
+                    if self._entries:
+                        self.invalidations += 1
+                    self._entries.clear()
+                    self._bytes = 0
+                    self._registry_version = version
+
+    def get(self, key: CacheKey) -> Optional[CalculationResult]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, payload = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return CalculationResult.model_validate_json(payload)
+
+    def put(self, key: CacheKey, result: CalculationResult) -> None:
+        payload = result.model_dump_json()
+        size = self._entry_size(key, payload)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (expires_at, size, payload)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'registry_version': self._registry_version,
+        }
+
+
+def create_default_cache() -> Optional[ResultCache]:
+    """Build the engine's result cache from environment configuration"""
+    if os.getenv("CALC_CACHE_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    return ResultCache(
+        max_entries=_env_int("CALC_CACHE_MAX_ENTRIES", 10000),
+        ttl_seconds=float(_env_int("CALC_CACHE_TTL_SECONDS", 300)),
+        max_bytes=_env_int("CALC_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    )
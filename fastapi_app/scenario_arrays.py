@@ -0,0 +1,414 @@
+"""
+Scenario Arrays
+Vectorized climate stress calculation over portfolio columns
+
+A portfolio is held as NumPy columns with sectors encoded as categorical
+codes. Multipliers are gathered per entry from per-sector arrays and PD, LGD
+and expected loss are computed as array operations in the same order as the
+original per-entry loop, so per-entry values are bit-identical. Totals are
+reduced with compensated summation (math.fsum, exactly rounded).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .models import PortfolioEntry, ScenarioGroupTotals, ScenarioResult, ScenarioResultColumns, UnmatchedSector
+
+SCENARIO_TYPES = ("transition", "physical", "combined")
+GROUP_BY_FIELDS = ("sector", "geography", "counterparty", "tenor_bucket")
+
+# Tenor buckets (months): (0, 12], (12, 36], (36, 60], (60, 120], above 120
+TENOR_BUCKET_EDGES = np.array([12, 36, 60, 120])
+TENOR_BUCKET_LABELS = ("0-1y", "1-3y", "3-5y", "5-10y", "10y+")
+
+
+def compensated_sum(values: np.ndarray) -> float:
+    """Exactly rounded sum of an array (math.fsum)"""
+    return math.fsum(values.tolist())
+
+
+class CompensatedAccumulator:
+    """
+    Running exactly rounded sum (Shewchuk partials, as used by math.fsum)
+    Each add() reduces its values with math.fsum and merges the rounded chunk
+    total and what its rounding dropped into the partials, so adding values
+    chunk by chunk gives the same total as one fsum over all of them, while
+    keeping only a handful of partials in memory.
+    """
+
+    __slots__ = ('_partials',)
+
+    def __init__(self):
+        self._partials: List[float] = []
+
+    def add(self, values: Iterable[float]) -> None:
+        values = list(values)
+        total = math.fsum(values)
+        # The remainder fsum rounded away is fsum(values - total); it shrinks
+        # by ~2**-53 per pass, so this is one or two more passes in practice
+        while total:
+            self._merge(total)
+            if not math.isfinite(total):
+                break
+            values.append(-total)
+            total = math.fsum(values)
+
+    def _merge(self, x: float) -> None:
+        """Error-free addition of one value to the partials"""
+        partials = self._partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    @property
+    def total(self) -> float:
+        return math.fsum(self._partials)
+
+
+def encode_categories(values: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode strings as integer codes in first-seen order
+    Returns (codes, categories) with categories[codes[i]] == values[i].
+    """
+    index: Dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64)
+    return codes, list(index)
+
+
+@dataclass
+class PortfolioColumns:
+    """Portfolio entries as columns (percentages kept as given)"""
+    company: List[str]
+    sector: List[str]
+    sector_codes: np.ndarray
+    sectors: List[str]
+    amount: np.ndarray
+    probability_of_default: np.ndarray
+    loss_given_default: np.ndarray
+    counterparty: List[str]
+    geography: List[str]
+    tenor: np.ndarray  # months
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @classmethod
+    def from_entries(cls, entries: Sequence[PortfolioEntry]) -> 'PortfolioColumns':
+        sector = [entry.sector for entry in entries]
+        sector_codes, sectors = encode_categories(sector)
+        size = len(entries)
+        return cls(
+            company=[entry.company for entry in entries],
+            sector=sector,
+            sector_codes=sector_codes,
+            sectors=sectors,
+            amount=np.fromiter((entry.amount for entry in entries), dtype=np.float64, count=size),
+            probability_of_default=np.fromiter((entry.probability_of_default for entry in entries), dtype=np.float64, count=size),
+            loss_given_default=np.fromiter((entry.loss_given_default for entry in entries), dtype=np.float64, count=size),
+            counterparty=[entry.counterparty for entry in entries],
+            geography=[entry.geography for entry in entries],
+            tenor=np.fromiter((entry.tenor for entry in entries), dtype=np.int64, count=size),
+        )
+
+
+@dataclass
+class SectorMultiplierArrays:
+    """Per-category multipliers, aligned with PortfolioColumns.sectors"""
+    transition_pd_multiplier: np.ndarray
+    physical_pd_multiplier: np.ndarray
+    lgd_change: np.ndarray
+    # False where the sector was not found and default multipliers were used
+    matched: Optional[np.ndarray] = None
+
+
+@dataclass
+class BaselineColumns:
+    """Scenario-independent per-entry values (decimals) and totals"""
+    baseline_pd: np.ndarray
+    baseline_lgd: np.ndarray
+    baseline_expected_loss: np.ndarray
+    total_exposure: float
+    total_baseline_expected_loss: float
+
+
+@dataclass
+class ScenarioColumns:
+    """Per-entry scenario results as columns, plus totals"""
+    scenario_type: str
+    pd_multiplier: np.ndarray
+    adjusted_pd: np.ndarray  # %
+    lgd_change: np.ndarray
+    adjusted_lgd: np.ndarray  # %
+    baseline_expected_loss: np.ndarray
+    climate_adjusted_expected_loss: np.ndarray
+    loss_increase: np.ndarray
+    loss_increase_percentage: np.ndarray
+    total_exposure: float
+    total_baseline_expected_loss: float
+    total_climate_adjusted_expected_loss: float
+
+    @property
+    def total_loss_increase(self) -> float:
+        return self.total_climate_adjusted_expected_loss - self.total_baseline_expected_loss
+
+    @property
+    def total_loss_increase_percentage(self) -> float:
+        if self.total_baseline_expected_loss > 0:
+            return self.total_loss_increase / self.total_baseline_expected_loss * 100.0
+        return 0.0
+
+    def to_columns(self, portfolio: PortfolioColumns) -> ScenarioResultColumns:
+        """Per-entry results as parallel arrays, sector dictionary-encoded"""
+        return ScenarioResultColumns(
+            company=portfolio.company,
+            sectors=portfolio.sectors,
+            sector_codes=portfolio.sector_codes.tolist(),
+            exposure=portfolio.amount.tolist(),
+            baseline_pd=portfolio.probability_of_default.tolist(),
+            baseline_lgd=portfolio.loss_given_default.tolist(),
+            pd_multiplier=self.pd_multiplier.tolist(),
+            adjusted_pd=self.adjusted_pd.tolist(),
+            lgd_change=self.lgd_change.tolist(),
+            adjusted_lgd=self.adjusted_lgd.tolist(),
+            climate_adjusted_expected_loss=self.climate_adjusted_expected_loss.tolist(),
+            baseline_expected_loss=self.baseline_expected_loss.tolist(),
+            loss_increase=self.loss_increase.tolist(),
+            loss_increase_percentage=self.loss_increase_percentage.tolist()
+        )
+
+    def to_results(self, portfolio: PortfolioColumns) -> List[ScenarioResult]:
+        """Materialize per-entry ScenarioResult models"""
+        return [
+            ScenarioResult(
+                company=company,
+                sector=sector,
+                exposure=exposure,
+                baseline_pd=baseline_pd,
+                baseline_lgd=baseline_lgd,
+                pd_multiplier=pd_multiplier,
+                adjusted_pd=adjusted_pd,
+                lgd_change=lgd_change,
+                adjusted_lgd=adjusted_lgd,
+                climate_adjusted_expected_loss=climate_adjusted_expected_loss,
+                baseline_expected_loss=baseline_expected_loss,
+                loss_increase=loss_increase,
+                loss_increase_percentage=loss_increase_percentage
+            )
+            for (company, sector, exposure, baseline_pd, baseline_lgd, pd_multiplier, adjusted_pd, lgd_change,
+                 adjusted_lgd, climate_adjusted_expected_loss, baseline_expected_loss, loss_increase,
+                 loss_increase_percentage) in zip(
+                portfolio.company,
+                portfolio.sector,
+                portfolio.amount.tolist(),
+                portfolio.probability_of_default.tolist(),
+                portfolio.loss_given_default.tolist(),
+                self.pd_multiplier.tolist(),
+                self.adjusted_pd.tolist(),
+                self.lgd_change.tolist(),
+                self.adjusted_lgd.tolist(),
+                self.climate_adjusted_expected_loss.tolist(),
+                self.baseline_expected_loss.tolist(),
+                self.loss_increase.tolist(),
+                self.loss_increase_percentage.tolist()
+            )
+        ]
+
+
+def scenario_pd_lgd_shift(
+    scenario_type: str,
+    transition_pd_multiplier: np.ndarray,
+    physical_pd_multiplier: np.ndarray,
+    lgd_change: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    PD multiplier and transition/physical LGD shifts (decimal) for a scenario
+    Combined applies both PD multipliers and the LGD change twice (ΔLGD_T + ΔLGD_P).
+    """
+    lgd_shift = lgd_change / 100.0
+    no_shift = np.zeros_like(lgd_shift)
+    if scenario_type == "transition":
+        return transition_pd_multiplier, lgd_shift, no_shift
+    if scenario_type == "physical":
+        return physical_pd_multiplier, no_shift, lgd_shift
+    if scenario_type == "combined":
+        return transition_pd_multiplier * physical_pd_multiplier, lgd_shift, lgd_shift
+    raise ValueError(f"Invalid scenario type: {scenario_type}")
+
+
+def compute_baseline_columns(portfolio: PortfolioColumns) -> BaselineColumns:
+    """Baseline PD/LGD (decimals), EL₀ = EAD × PD₀ × LGD₀ and totals"""
+    baseline_pd = portfolio.probability_of_default / 100.0
+    baseline_lgd = portfolio.loss_given_default / 100.0
+    baseline_expected_loss = portfolio.amount * baseline_pd * baseline_lgd
+    return BaselineColumns(
+        baseline_pd=baseline_pd,
+        baseline_lgd=baseline_lgd,
+        baseline_expected_loss=baseline_expected_loss,
+        total_exposure=compensated_sum(portfolio.amount),
+        total_baseline_expected_loss=compensated_sum(baseline_expected_loss)
+    )
+
+
+def compute_scenario_columns(
+    portfolio: PortfolioColumns,
+    multipliers: SectorMultiplierArrays,
+    scenario_type: str,
+    baseline: Optional[BaselineColumns] = None
+) -> ScenarioColumns:
+    """
+    Climate-adjusted PD, LGD and expected loss for every entry
+    Mirrors the per-entry arithmetic of ScenarioEngine.calculate_scenario.
+    Pass a precomputed `baseline` to share it between scenarios.
+    """
+    if scenario_type not in SCENARIO_TYPES:
+        raise ValueError(f"Invalid scenario type: {scenario_type}")
+
+    if baseline is None:
+        baseline = compute_baseline_columns(portfolio)
+
+    codes = portfolio.sector_codes
+    pd_multiplier_by_sector, transition_shift, physical_shift = scenario_pd_lgd_shift(
+        scenario_type,
+        multipliers.transition_pd_multiplier,
+        multipliers.physical_pd_multiplier,
+        multipliers.lgd_change
+    )
+    pd_multiplier = pd_multiplier_by_sector[codes]
+
+    adjusted_pd = baseline.baseline_pd * pd_multiplier
+    # LGD = LGD₀ + ΔLGD_T + ΔLGD_P, capped at 100%
+    adjusted_lgd = np.minimum(baseline.baseline_lgd + transition_shift[codes] + physical_shift[codes], 1.0)
+
+    baseline_expected_loss = baseline.baseline_expected_loss
+    climate_adjusted_expected_loss = portfolio.amount * adjusted_pd * adjusted_lgd
+    loss_increase = climate_adjusted_expected_loss - baseline_expected_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loss_increase_percentage = np.where(
+            baseline_expected_loss > 0, loss_increase / baseline_expected_loss * 100.0, 0.0
+        )
+
+    return ScenarioColumns(
+        scenario_type=scenario_type,
+        pd_multiplier=pd_multiplier,
+        adjusted_pd=adjusted_pd * 100.0,
+        lgd_change=multipliers.lgd_change[codes],
+        adjusted_lgd=adjusted_lgd * 100.0,
+        baseline_expected_loss=baseline_expected_loss,
+        climate_adjusted_expected_loss=climate_adjusted_expected_loss,
+        loss_increase=loss_increase,
+        loss_increase_percentage=loss_increase_percentage,
+        total_exposure=baseline.total_exposure,
+        total_baseline_expected_loss=baseline.total_baseline_expected_loss,
+        total_climate_adjusted_expected_loss=compensated_sum(climate_adjusted_expected_loss)
+    )
+
+
+def unmatched_sector_report(portfolio: PortfolioColumns, multipliers: SectorMultiplierArrays) -> List[UnmatchedSector]:
+    """Sectors stressed with default multipliers, largest exposure first"""
+    if multipliers.matched is None or multipliers.matched.all():
+        return []
+    size = len(portfolio.sectors)
+    entries = np.bincount(portfolio.sector_codes, minlength=size)
+    exposure = np.bincount(portfolio.sector_codes, weights=portfolio.amount, minlength=size)
+    report = [
+        UnmatchedSector(sector=portfolio.sectors[code], entries=int(entries[code]), exposure=float(exposure[code]))
+        for code in np.flatnonzero(~multipliers.matched)
+    ]
+    report.sort(key=lambda item: item.exposure, reverse=True)
+    return report
+
+
+def group_codes(portfolio: PortfolioColumns, field: str) -> Tuple[np.ndarray, List[str]]:
+    """Per-entry group codes and group labels for a group_by dimension"""
+    if field == "sector":
+        return portfolio.sector_codes, portfolio.sectors
+    if field == "tenor_bucket":
+        return np.searchsorted(TENOR_BUCKET_EDGES, portfolio.tenor, side='left'), list(TENOR_BUCKET_LABELS)
+    if field in ("geography", "counterparty"):
+        return encode_categories(getattr(portfolio, field))
+    raise ValueError(f"Invalid group_by field: {field}")
+
+
+def group_labels(portfolio: PortfolioColumns, field: str) -> List[str]:
+    """Per-entry group label for a group_by dimension"""
+    codes, labels = group_codes(portfolio, field)
+    return [labels[code] for code in codes.tolist()]
+
+
+def group_totals(
+    group: str,
+    entries: int,
+    total_exposure: float,
+    total_baseline_expected_loss: float,
+    total_climate_adjusted_expected_loss: float
+) -> ScenarioGroupTotals:
+    """ScenarioGroupTotals with the derived loss increase fields"""
+    total_loss_increase = total_climate_adjusted_expected_loss - total_baseline_expected_loss
+    return ScenarioGroupTotals(
+        group=group,
+        entries=entries,
+        total_exposure=total_exposure,
+        total_baseline_expected_loss=total_baseline_expected_loss,
+        total_climate_adjusted_expected_loss=total_climate_adjusted_expected_loss,
+        total_loss_increase=total_loss_increase,
+        total_loss_increase_percentage=(
+            total_loss_increase / total_baseline_expected_loss * 100.0 if total_baseline_expected_loss > 0 else 0.0
+        )
+    )
+
+
+class GroupAccumulator:
+    """
+    Running scenario totals per group for one group_by dimension
+    Each chunk is sorted by group and every group's values are added to its
+    CompensatedAccumulators, so group totals are exactly rounded over all
+    chunks; memory depends on the number of groups only.
+    """
+
+    def __init__(self, field: str):
+        if field not in GROUP_BY_FIELDS:
+            raise ValueError(f"Invalid group_by field: {field}")
+        self.field = field
+        # label -> [entries, exposure, baseline EL, climate-adjusted EL]
+        self._groups: Dict[str, list] = {}
+
+    def add(self, portfolio: PortfolioColumns, columns: 'ScenarioColumns') -> None:
+        codes, labels = group_codes(portfolio, self.field)
+        size = len(labels)
+        entries = np.bincount(codes, minlength=size)
+        ends = np.cumsum(entries).tolist()
+        order = np.argsort(codes, kind='stable')
+        grouped = [
+            values[order].tolist()
+            for values in (portfolio.amount, columns.baseline_expected_loss, columns.climate_adjusted_expected_loss)
+        ]
+        for code in np.flatnonzero(entries).tolist():
+            group = self._groups.get(labels[code])
+            if group is None:
+                group = [0, CompensatedAccumulator(), CompensatedAccumulator(), CompensatedAccumulator()]
+                self._groups[labels[code]] = group
+            count = int(entries[code])
+            group[0] += count
+            start, end = ends[code] - count, ends[code]
+            for accumulator, values in zip(group[1:], grouped):
+                accumulator.add(values[start:end])
+
+    def results(self) -> List[ScenarioGroupTotals]:
+        """Group totals in first-seen order (tenor buckets in bucket order)"""
+        labels = list(self._groups)
+        if self.field == "tenor_bucket":
+            labels.sort(key=TENOR_BUCKET_LABELS.index)
+        results = []
+        for label in labels:
+            entries, exposure, baseline, climate = self._groups[label]
+            results.append(group_totals(label, entries, exposure.total, baseline.total, climate.total))
+        return results
@@ -3,8 +3,23 @@ Scenario Building Calculation Engine
 Handles climate stress testing calculations using sector-specific multipliers
 """
 
-from typing import Dict, List, Tuple
-from .models import PortfolioEntry, ScenarioResult, ScenarioResponse
+import secrets
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+from .models import (
+    PortfolioEntry, ScenarioResult, ScenarioResponse, ScenarioColumnarResponse,
+    MultiScenarioResponse, ScenarioTotals, ScenarioEntryColumns, BaselineEntryColumns, UnmatchedSector,
+    MonteCarloResponse, SectorVolatility, HorizonResponse, SensitivityResponse, SweepAxis
+)
+from .scenario_arrays import (
+    GroupAccumulator, PortfolioColumns, ScenarioColumns, SectorMultiplierArrays,
+    compute_baseline_columns, compute_scenario_columns, unmatched_sector_report
+)
+from .sector_multipliers import DEFAULT_SECTOR_TABLE, SectorMultiplierTable, normalize_sector
+from .scenario_sensitivity import SectorAggregates, sweep_grid
+from .scenario_horizon import compute_horizon_columns, exposure_at_risk, horizon_years
+from .scenario_simulation import SectorMultiplierDistributions, loss_distribution, simulate_losses
+from .offload import OffloadRejected, OffloadTimeout, ProcessOffloader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,335 +30,56 @@ class ScenarioEngine:
     Engine for calculating climate stress testing scenarios
     """
     
-    def __init__(self):
-        # Sector-specific multipliers for transition and physical risks
-        self.sector_multipliers = {
-            "Power Generation – Fossil Fuel": {
-                "transition_pd_multiplier": 1.6,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 10.0
-            },
-            "Power Generation – Renewable": {
-                "transition_pd_multiplier": 0.9,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Industrial Manufacturing": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Transportation (Aviation & Shipping)": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Construction & Materials": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Real Estate (Commercial)": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 15.0
-            },
-            "Agriculture & Forestry": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Financial Services": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Power (Independent Producers)": {
-                "transition_pd_multiplier": 1.5,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 10.0
-            },
-            "Manufacturing SMEs": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Transport & Logistics": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Real Estate (SME Developers)": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.3,
-                "lgd_change": 15.0
-            },
-            "Agriculture / Food SMEs": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Oil & Gas (Upstream, Midstream, Downstream)": {
-                "transition_pd_multiplier": 1.6,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 15.0
-            },
-            "Renewable Energy": {
-                "transition_pd_multiplier": 0.9,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Infrastructure (Ports, Roads)": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.3,
-                "lgd_change": 20.0
-            },
-            "Mining & Metals": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Residential Real Estate": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Commercial Real Estate": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 15.0
-            },
-            "Passenger Vehicles": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Heavy Transport": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Sovereign (Pakistan/UAE/etc.)": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.3,
-                "lgd_change": 5.0
-            },
-            "Buildings (Urban)": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 15.0
-            },
-            # Additional mappings for sectors that might match
-            "Steel & Iron": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Cement": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Chemicals & Petrochemicals": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Fertilizers": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Pulp & Paper": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Textile & Apparel": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Automotive & Transport Equipment": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Electronics & Machinery": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Aviation": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Shipping / Marine Transport": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Rail Transport": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Road Freight & Logistics": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Public Transport & Mobility": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Construction & Infrastructure": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Agriculture": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Livestock & Dairy": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Forestry & Logging": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Fisheries & Aquaculture": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Food Processing & Packaging": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Banking / Financial Services": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Insurance & Reinsurance": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Asset Management / Investment": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Retail & Consumer Goods": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Hospitality & Leisure": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Healthcare & Pharma": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Telecom & Data Centers": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Public Sector & Sovereign": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.3,
-                "lgd_change": 5.0
-            },
-            "Technology (IT & Cloud)": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            # Add mappings for simple sector names from frontend
-            "Energy": {
-                "transition_pd_multiplier": 1.6,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 15.0
-            },
-            "Manufacturing": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 8.0
-            },
-            "Retail": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Technology": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Agriculture": {
-                "transition_pd_multiplier": 1.2,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 20.0
-            },
-            "Real Estate": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.4,
-                "lgd_change": 15.0
-            },
-            "Healthcare": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            },
-            "Financial Services": {
-                "transition_pd_multiplier": 1.0,
-                "physical_pd_multiplier": 1.0,
-                "lgd_change": 0.0
-            },
-            "Transportation": {
-                "transition_pd_multiplier": 1.4,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 10.0
-            },
-            "Construction": {
-                "transition_pd_multiplier": 1.3,
-                "physical_pd_multiplier": 1.2,
-                "lgd_change": 12.0
-            },
-            "Other": {
-                "transition_pd_multiplier": 1.1,
-                "physical_pd_multiplier": 1.1,
-                "lgd_change": 5.0
-            }
-        }
+    def __init__(self, sector_table: Optional[SectorMultiplierTable] = None):
+        # Sector-specific multipliers, compiled once (see sector_multipliers)
+        self.sector_table = sector_table or DEFAULT_SECTOR_TABLE
     
     def get_sector_multipliers(self, sector: str) -> Dict[str, float]:
         """
         Get multipliers for a given sector
+        The name is normalized (case, whitespace, dashes, aliases) before lookup.
         Returns default values if sector not found
         """
-        return self.sector_multipliers.get(sector, {
-            "transition_pd_multiplier": 1.0,
-            "physical_pd_multiplier": 1.0,
-            "lgd_change": 0.0
-        })
+        return self.sector_table.multipliers(sector)._asdict()
     
-    def calculate_scenario(self, portfolio_entries: List[PortfolioEntry], scenario_type: str) -> ScenarioResponse:
+    def sector_multiplier_arrays(self, sectors: List[str]) -> SectorMultiplierArrays:
+        """
+        Gather multipliers for a list of distinct sectors into aligned arrays
+        """
+        table = self.sector_table
+        codes = table.codes(sectors)
+        return SectorMultiplierArrays(
+            transition_pd_multiplier=table.transition_pd_multiplier[codes],
+            physical_pd_multiplier=table.physical_pd_multiplier[codes],
+            lgd_change=table.lgd_change[codes],
+            matched=codes != table.default_code
+        )
+    
+    def _report_unmatched(self, portfolio: PortfolioColumns, multipliers: SectorMultiplierArrays) -> List[UnmatchedSector]:
+        """Per-run report of sectors that fell back to default multipliers"""
+        unmatched_sectors = unmatched_sector_report(portfolio, multipliers)
+        if unmatched_sectors:
+            logger.warning(
+                "%d sector(s) not in the multiplier table, default multipliers used: %s",
+                len(unmatched_sectors), ", ".join(repr(item.sector) for item in unmatched_sectors[:10])
+            )
+        return unmatched_sectors
+    
+    def calculate_scenario_columns(self, portfolio: PortfolioColumns, scenario_type: str) -> ScenarioColumns:
+        """
+        Vectorized scenario calculation over portfolio columns
+        Raises ValueError for an unknown scenario type.
+        """
+        return compute_scenario_columns(portfolio, self.sector_multiplier_arrays(portfolio.sectors), scenario_type)
+    
+    def calculate_scenario(
+        self,
+        portfolio_entries: List[PortfolioEntry],
+        scenario_type: str,
+        group_by: Sequence[str] = (),
+        include_results: Optional[bool] = None,
+        response_format: str = "rows"
+    ) -> Union[ScenarioResponse, ScenarioColumnarResponse]:
         """
         Calculate climate stress testing scenario
         
@@ -366,107 +102,56 @@ class ScenarioEngine:
         - PD_C = PD₀ × m_C
         - LGD_C = LGD₀ + ΔLGD_T + ΔLGD_P (sum of both changes)
         - EL_C = EAD × PD_C × LGD_C
+        
+        Entries are computed as NumPy columns (see scenario_arrays); totals use
+        compensated summation.
+        
+        `group_by` adds totals per sector, geography, counterparty and/or tenor
+        bucket. Per-entry results are built only when `include_results` is True
+        (default: True without group_by, False with it). With
+        response_format="columns" they are returned as parallel arrays
+        (ScenarioColumnarResponse) and no per-row models are built.
         """
+        response_model = ScenarioColumnarResponse if response_format == "columns" else ScenarioResponse
+        if include_results is None:
+            include_results = not group_by
         try:
-            logger.info(f"Starting scenario calculation for {len(portfolio_entries)} entries with scenario type: {scenario_type}")
+            logger.debug("Starting scenario calculation for %d entries with scenario type: %s", len(portfolio_entries), scenario_type)
             
-            results = []
-            total_exposure = 0.0
-            total_baseline_expected_loss = 0.0
-            total_climate_adjusted_expected_loss = 0.0
+            portfolio = PortfolioColumns.from_entries(portfolio_entries)
+            multipliers = self.sector_multiplier_arrays(portfolio.sectors)
+            columns = compute_scenario_columns(portfolio, multipliers, scenario_type)
+            unmatched_sectors = self._report_unmatched(portfolio, multipliers)
             
-            for i, entry in enumerate(portfolio_entries):
-                logger.debug(f"Processing entry {i+1}: {entry.company} (Sector: {entry.sector}, Amount: {entry.amount})")
-                # Get sector-specific multipliers
-                multipliers = self.get_sector_multipliers(entry.sector)
-                logger.debug(f"  Using multipliers for {entry.sector}: {multipliers}")
-                
-                # Calculate PD multiplier based on scenario type
-                if scenario_type == "transition":
-                    pd_multiplier = multipliers["transition_pd_multiplier"]
-                    # LGD_T = LGD₀ + ΔLGD_T (absolute addition)
-                    lgd_change_transition = multipliers["lgd_change"] / 100.0
-                    lgd_change_physical = 0.0
-                elif scenario_type == "physical":
-                    pd_multiplier = multipliers["physical_pd_multiplier"]
-                    # LGD_P = LGD₀ + ΔLGD_P (absolute addition)
-                    lgd_change_transition = 0.0
-                    lgd_change_physical = multipliers["lgd_change"] / 100.0
-                elif scenario_type == "combined":
-                    # PD_C = PD₀ × m_T × m_P
-                    pd_multiplier = multipliers["transition_pd_multiplier"] * multipliers["physical_pd_multiplier"]
-                    # LGD_C = LGD₀ + ΔLGD_T + ΔLGD_P (sum of both changes)
-                    lgd_change_transition = multipliers["lgd_change"] / 100.0
-                    lgd_change_physical = multipliers["lgd_change"] / 100.0
-                else:
-                    raise ValueError(f"Invalid scenario type: {scenario_type}")
-                
-                # Convert percentages to decimals
-                baseline_pd_decimal = entry.probability_of_default / 100.0
-                baseline_lgd_decimal = entry.loss_given_default / 100.0
-                
-                # Calculate adjusted values
-                # PD Multiplier is applied multiplicatively: PD = PD₀ × m
-                adjusted_pd = baseline_pd_decimal * pd_multiplier
-                
-                # LGD Change is applied as absolute addition (not percentage increase)
-                # Formula follows: LGD = LGD₀ + ΔLGD (for transition/physical)
-                # For combined: LGD_C = LGD₀ + ΔLGD_T + ΔLGD_P
-                adjusted_lgd = baseline_lgd_decimal + lgd_change_transition + lgd_change_physical
-                
-                # Ensure LGD doesn't exceed 100%
-                adjusted_lgd = min(adjusted_lgd, 1.0)
-                
-                # Calculate expected losses
-                baseline_expected_loss = entry.amount * baseline_pd_decimal * baseline_lgd_decimal
-                climate_adjusted_expected_loss = entry.amount * adjusted_pd * adjusted_lgd
-                
-                # Calculate increases
-                loss_increase = climate_adjusted_expected_loss - baseline_expected_loss
-                loss_increase_percentage = (loss_increase / baseline_expected_loss * 100.0) if baseline_expected_loss > 0 else 0.0
-                
-                # Create result
-                result = ScenarioResult(
-                    company=entry.company,
-                    sector=entry.sector,
-                    exposure=entry.amount,
-                    baseline_pd=entry.probability_of_default,
-                    baseline_lgd=entry.loss_given_default,
-                    pd_multiplier=pd_multiplier,
-                    adjusted_pd=adjusted_pd * 100.0,  # Convert back to percentage
-                    lgd_change=multipliers["lgd_change"],
-                    adjusted_lgd=adjusted_lgd * 100.0,  # Convert back to percentage
-                    climate_adjusted_expected_loss=climate_adjusted_expected_loss,
-                    baseline_expected_loss=baseline_expected_loss,
-                    loss_increase=loss_increase,
-                    loss_increase_percentage=loss_increase_percentage
-                )
-                
-                results.append(result)
-                
-                # Accumulate totals
-                total_exposure += entry.amount
-                total_baseline_expected_loss += baseline_expected_loss
-                total_climate_adjusted_expected_loss += climate_adjusted_expected_loss
+            groups = None
+            if group_by:
+                groups = {}
+                for field in dict.fromkeys(group_by):
+                    accumulator = GroupAccumulator(field)
+                    accumulator.add(portfolio, columns)
+                    groups[field] = accumulator.results()
             
-            # Calculate total increases
-            total_loss_increase = total_climate_adjusted_expected_loss - total_baseline_expected_loss
-            total_loss_increase_percentage = (total_loss_increase / total_baseline_expected_loss * 100.0) if total_baseline_expected_loss > 0 else 0.0
+            if response_format == "columns":
+                results = columns.to_columns(portfolio) if include_results else None
+            else:
+                results = columns.to_results(portfolio) if include_results else []
             
-            return ScenarioResponse(
+            return response_model(
                 success=True,
                 scenario_type=scenario_type,
-                total_exposure=total_exposure,
-                total_baseline_expected_loss=total_baseline_expected_loss,
-                total_climate_adjusted_expected_loss=total_climate_adjusted_expected_loss,
-                total_loss_increase=total_loss_increase,
-                total_loss_increase_percentage=total_loss_increase_percentage,
-                results=results
+                total_exposure=columns.total_exposure,
+                total_baseline_expected_loss=columns.total_baseline_expected_loss,
+                total_climate_adjusted_expected_loss=columns.total_climate_adjusted_expected_loss,
+                total_loss_increase=columns.total_loss_increase,
+                total_loss_increase_percentage=columns.total_loss_increase_percentage,
+                results=results,
+                groups=groups,
+                unmatched_sectors=unmatched_sectors
             )
             
         except Exception as e:
-            logger.error(f"Error calculating scenario: {str(e)}")
-            return ScenarioResponse(
+            logger.error("Error calculating scenario: %s", e)
+            return response_model(
                 success=False,
                 scenario_type=scenario_type,
                 total_exposure=0.0,
@@ -474,6 +159,298 @@ class ScenarioEngine:
                 total_climate_adjusted_expected_loss=0.0,
                 total_loss_increase=0.0,
                 total_loss_increase_percentage=0.0,
-                results=[],
+                results=None if response_format == "columns" else [],
+                error=str(e)
+            )
+
+    def calculate_scenarios(
+        self,
+        portfolio_entries: List[PortfolioEntry],
+        scenario_types: Sequence[str]
+    ) -> MultiScenarioResponse:
+        """
+        Calculate several scenarios over one portfolio in a single pass
+
+        The portfolio is encoded, sector multipliers are gathered and the
+        baseline (PD₀, LGD₀, EL₀ and its total) is computed once; each
+        scenario then only applies its multipliers. Totals and per-entry
+        columns are keyed by scenario type so results can be compared side
+        by side; shared per-entry baseline values are returned once.
+        """
+        scenario_types = list(dict.fromkeys(scenario_types))
+        try:
+            logger.debug("Starting multi-scenario calculation for %d entries: %s", len(portfolio_entries), scenario_types)
+
+            portfolio = PortfolioColumns.from_entries(portfolio_entries)
+            multipliers = self.sector_multiplier_arrays(portfolio.sectors)
+            baseline = compute_baseline_columns(portfolio)
+
+            totals: Dict[str, ScenarioTotals] = {}
+            scenarios: Dict[str, ScenarioEntryColumns] = {}
+            for scenario_type in scenario_types:
+                columns = compute_scenario_columns(portfolio, multipliers, scenario_type, baseline)
+                totals[scenario_type] = ScenarioTotals(
+                    total_climate_adjusted_expected_loss=columns.total_climate_adjusted_expected_loss,
+                    total_loss_increase=columns.total_loss_increase,
+                    total_loss_increase_percentage=columns.total_loss_increase_percentage
+                )
+                scenarios[scenario_type] = ScenarioEntryColumns(
+                    pd_multiplier=columns.pd_multiplier.tolist(),
+                    adjusted_pd=columns.adjusted_pd.tolist(),
+                    lgd_change=columns.lgd_change.tolist(),
+                    adjusted_lgd=columns.adjusted_lgd.tolist(),
+                    climate_adjusted_expected_loss=columns.climate_adjusted_expected_loss.tolist(),
+                    loss_increase=columns.loss_increase.tolist(),
+                    loss_increase_percentage=columns.loss_increase_percentage.tolist()
+                )
+
+            return MultiScenarioResponse(
+                success=True,
+                scenario_types=scenario_types,
+                total_exposure=baseline.total_exposure,
+                total_baseline_expected_loss=baseline.total_baseline_expected_loss,
+                totals=totals,
+                baseline=BaselineEntryColumns(
+                    company=portfolio.company,
+                    sector=portfolio.sector,
+                    exposure=portfolio.amount.tolist(),
+                    baseline_pd=portfolio.probability_of_default.tolist(),
+                    baseline_lgd=portfolio.loss_given_default.tolist(),
+                    baseline_expected_loss=baseline.baseline_expected_loss.tolist()
+                ),
+                scenarios=scenarios,
+                unmatched_sectors=self._report_unmatched(portfolio, multipliers)
+            )
+
+        except Exception as e:
+            logger.error("Error calculating scenarios: %s", e)
+            return MultiScenarioResponse(
+                success=False,
+                scenario_types=scenario_types,
+                total_exposure=0.0,
+                total_baseline_expected_loss=0.0,
+                totals={},
+                baseline=None,
+                scenarios={},
+                error=str(e)
+            )
+
+    def matching_sectors(self, sectors: List[str], name: str) -> List[int]:
+        """
+        Positions in `sectors` that `name` refers to
+        Matches by normalized name, or by the table sector both names resolve to.
+        """
+        table = self.sector_table
+        key, code = normalize_sector(name), table.resolve(name)
+        return [
+            position for position, sector in enumerate(sectors)
+            if normalize_sector(sector) == key or code != table.default_code and table.resolve(sector) == code
+        ]
+
+    def sector_multiplier_distributions(
+        self,
+        sectors: List[str],
+        pd_multiplier_volatility: float,
+        lgd_change_std: float,
+        sector_volatility: Optional[Mapping[str, SectorVolatility]] = None
+    ) -> SectorMultiplierDistributions:
+        """
+        Multiplier distributions for a list of distinct sectors
+        Overrides in `sector_volatility` are matched with matching_sectors().
+        """
+        multipliers = self.sector_multiplier_arrays(sectors)
+        volatility = np.full(len(sectors), float(pd_multiplier_volatility))
+        std = np.full(len(sectors), float(lgd_change_std))
+        for name, override in (sector_volatility or {}).items():
+            positions = self.matching_sectors(sectors, name)
+            if override.pd_multiplier_volatility is not None:
+                volatility[positions] = override.pd_multiplier_volatility
+            if override.lgd_change_std is not None:
+                std[positions] = override.lgd_change_std
+        return SectorMultiplierDistributions(multipliers, volatility, std)
+
+    def simulate_scenario(
+        self,
+        portfolio_entries: List[PortfolioEntry],
+        scenario_type: str,
+        simulations: int = 10000,
+        seed: Optional[int] = None,
+        pd_multiplier_volatility: float = 0.1,
+        lgd_change_std: float = 2.0,
+        sector_volatility: Optional[Mapping[str, SectorVolatility]] = None,
+        offloader: Optional[ProcessOffloader] = None
+    ) -> MonteCarloResponse:
+        """
+        Monte Carlo climate stress test
+        
+        Per draw, every sector gets
+        - m_T, m_P ~ lognormal with mean equal to the point multiplier
+        - ΔLGD ~ normal(point ΔLGD, lgd_change_std)
+        and the portfolio loss Σ EAD × PD₀ × m × clip(LGD₀ + ΔLGD, 0, 100%) is
+        evaluated as in calculate_scenario. The loss and loss-increase
+        distributions are summarized by mean, P95, P99 and expected shortfall.
+        Without a seed one is generated and returned, so any run can be replayed.
+        """
+        if seed is None:
+            seed = secrets.randbits(63)
+        try:
+            logger.debug("Simulating %s scenario: %d draws over %d entries", scenario_type, simulations, len(portfolio_entries))
+
+            portfolio = PortfolioColumns.from_entries(portfolio_entries)
+            distributions = self.sector_multiplier_distributions(
+                portfolio.sectors, pd_multiplier_volatility, lgd_change_std, sector_volatility
+            )
+            baseline = compute_baseline_columns(portfolio)
+            columns = compute_scenario_columns(portfolio, distributions.multipliers, scenario_type, baseline)
+            losses = simulate_losses(
+                portfolio, baseline, distributions, scenario_type, simulations, seed, offloader
+            )
+
+            return MonteCarloResponse(
+                success=True,
+                scenario_type=scenario_type,
+                simulations=simulations,
+                seed=seed,
+                total_exposure=baseline.total_exposure,
+                total_baseline_expected_loss=baseline.total_baseline_expected_loss,
+                total_climate_adjusted_expected_loss=columns.total_climate_adjusted_expected_loss,
+                climate_adjusted_expected_loss=loss_distribution(losses),
+                loss_increase=loss_distribution(losses - baseline.total_baseline_expected_loss),
+                unmatched_sectors=self._report_unmatched(portfolio, distributions.multipliers)
+            )
+
+        except (OffloadRejected, OffloadTimeout):
+            # Capacity errors, not calculation errors - the endpoint maps them to 503 / 504
+            raise
+        except Exception as e:
+            logger.error("Error simulating scenario: %s", e)
+            return MonteCarloResponse(
+                success=False,
+                scenario_type=scenario_type,
+                simulations=simulations,
+                seed=seed,
+                total_exposure=0.0,
+                total_baseline_expected_loss=0.0,
+                total_climate_adjusted_expected_loss=0.0,
+                error=str(e)
+            )
+
+    def project_scenarios(
+        self,
+        portfolio_entries: List[PortfolioEntry],
+        scenario_types: Sequence[str],
+        max_years: Optional[int] = None,
+        include_entries: bool = False
+    ) -> HorizonResponse:
+        """
+        Multi-year projection over each exposure's remaining tenor
+        
+        With annual PD p (baseline or scenario-adjusted) and remaining tenor T:
+        - CPD(t) = 1 - (1 - p)^min(t, T)
+        - EL(t) = EAD × CPD(t) × LGD
+        Returns the baseline and per-scenario term structures of cumulative and
+        marginal portfolio loss; per-entry (entries × years) arrays only with
+        `include_entries`.
+        """
+        scenario_types = list(dict.fromkeys(scenario_types))
+        try:
+            logger.debug("Projecting scenarios %s for %d entries", scenario_types, len(portfolio_entries))
+
+            portfolio = PortfolioColumns.from_entries(portfolio_entries)
+            multipliers = self.sector_multiplier_arrays(portfolio.sectors)
+            baseline = compute_baseline_columns(portfolio)
+            years = horizon_years(portfolio.tenor, max_years)
+
+            baseline_horizon = compute_horizon_columns(
+                portfolio.amount, baseline.baseline_pd, baseline.baseline_lgd, portfolio.tenor, years
+            )
+            scenarios = {}
+            for scenario_type in scenario_types:
+                columns = compute_scenario_columns(portfolio, multipliers, scenario_type, baseline)
+                horizon = compute_horizon_columns(
+                    portfolio.amount, columns.adjusted_pd / 100.0, columns.adjusted_lgd / 100.0, portfolio.tenor, years
+                )
+                scenarios[scenario_type] = horizon.term_structure(portfolio.amount, include_entries)
+
+            return HorizonResponse(
+                success=True,
+                scenario_types=scenario_types,
+                years=list(range(1, years + 1)),
+                exposure_at_risk=exposure_at_risk(portfolio.amount, portfolio.tenor, years).tolist(),
+                baseline=baseline_horizon.term_structure(portfolio.amount, include_entries),
+                scenarios=scenarios,
+                unmatched_sectors=self._report_unmatched(portfolio, multipliers)
+            )
+
+        except Exception as e:
+            logger.error("Error projecting scenarios: %s", e)
+            return HorizonResponse(
+                success=False,
+                scenario_types=scenario_types,
+                years=[],
+                exposure_at_risk=[],
+                scenarios={},
+                error=str(e)
+            )
+
+    def sweep_sensitivity(
+        self,
+        portfolio_entries: List[PortfolioEntry],
+        scenario_type: str,
+        axes: Sequence[SweepAxis]
+    ) -> SensitivityResponse:
+        """
+        Loss surface over one or two swept sector multipliers / LGD changes
+        
+        Per-sector aggregates are built once (see scenario_sensitivity), so each
+        grid point costs O(sectors) instead of O(entries). An axis sector is
+        matched with matching_sectors(); a swept value replaces the table value
+        for every matching portfolio sector.
+        """
+        axes = list(axes)
+        try:
+            logger.debug("Sweeping %s scenario over %d axes for %d entries", scenario_type, len(axes), len(portfolio_entries))
+
+            portfolio = PortfolioColumns.from_entries(portfolio_entries)
+            multipliers = self.sector_multiplier_arrays(portfolio.sectors)
+            baseline = compute_baseline_columns(portfolio)
+            columns = compute_scenario_columns(portfolio, multipliers, scenario_type, baseline)
+
+            specs = []
+            for axis in axes:
+                positions = self.matching_sectors(portfolio.sectors, axis.sector)
+                if not positions:
+                    raise ValueError(f"Sector '{axis.sector}' is not in the portfolio")
+                specs.append((positions, axis.parameter, axis.values))
+            if len(specs) == 2 and specs[0][1] == specs[1][1] and set(specs[0][0]) & set(specs[1][0]):
+                raise ValueError("Both axes sweep the same multiplier of the same sector")
+
+            aggregates = SectorAggregates.from_portfolio(portfolio, baseline)
+            losses = aggregates.climate_adjusted_expected_loss(scenario_type, *sweep_grid(multipliers, specs))
+            shape = tuple(len(axis.values) for axis in axes)
+            surface = losses.reshape(shape)
+
+            return SensitivityResponse(
+                success=True,
+                scenario_type=scenario_type,
+                axes=axes,
+                total_exposure=baseline.total_exposure,
+                total_baseline_expected_loss=baseline.total_baseline_expected_loss,
+                total_climate_adjusted_expected_loss=columns.total_climate_adjusted_expected_loss,
+                climate_adjusted_expected_loss=surface.tolist(),
+                loss_increase=(surface - baseline.total_baseline_expected_loss).tolist()
+            )
+
+        except Exception as e:
+            logger.error("Error sweeping scenario sensitivity: %s", e)
+            return SensitivityResponse(
+                success=False,
+                scenario_type=scenario_type,
+                axes=axes,
+                total_exposure=0.0,
+                total_baseline_expected_loss=0.0,
+                total_climate_adjusted_expected_loss=0.0,
+                climate_adjusted_expected_loss=[],
+                loss_increase=[],
                 error=str(e)
             )
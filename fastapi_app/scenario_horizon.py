@@ -0,0 +1,81 @@
+"""
+Scenario Horizon
+Tenor-aware multi-year projection of cumulative PD and expected loss
+
+PD inputs are read as annual default probabilities. An exposure with a
+remaining tenor of T years (tenor months / 12) and annual PD p has
+cumulative PD 1 - (1 - p)^min(t, T) by year t, so it stops accruing default
+risk when it matures (a final partial year accrues pro rata in the
+exponent). Cumulative expected loss is EAD × CPD(t) × LGD with the
+scenario's adjusted LGD. Everything is computed as (entries × years) arrays;
+portfolio totals per year use compensated summation.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from .models import LossTermStructure
+from .scenario_arrays import compensated_sum
+
+MONTHS_PER_YEAR = 12
+
+# Hard cap on projection length
+MAX_HORIZON_YEARS = 100
+
+
+def horizon_years(tenor_months: np.ndarray, max_years: Optional[int] = None) -> int:
+    """Years needed to cover the longest remaining tenor (at least 1)"""
+    longest = int(tenor_months.max()) if len(tenor_months) else 0
+    years = max(1, math.ceil(longest / MONTHS_PER_YEAR))
+    return min(years, max_years or MAX_HORIZON_YEARS, MAX_HORIZON_YEARS)
+
+
+def exposure_at_risk(amount: np.ndarray, tenor_months: np.ndarray, years: int) -> np.ndarray:
+    """Exposure still outstanding at the start of each year"""
+    starts = np.arange(years) * MONTHS_PER_YEAR
+    outstanding = tenor_months[:, None] > starts[None, :]
+    return np.array([compensated_sum(column) for column in (amount[:, None] * outstanding).T])
+
+
+@dataclass
+class HorizonColumns:
+    """Per-entry cumulative PD (decimal) and expected loss, entries × years"""
+    cumulative_pd: np.ndarray
+    cumulative_expected_loss: np.ndarray
+
+    def term_structure(self, amount: np.ndarray, include_entries: bool = False) -> LossTermStructure:
+        """Portfolio totals per year (optionally with the per-entry arrays)"""
+        total_exposure = compensated_sum(amount)
+        cumulative = np.array([compensated_sum(column) for column in self.cumulative_expected_loss.T])
+        weighted_pd = [compensated_sum(column) for column in (amount[:, None] * self.cumulative_pd).T]
+        return LossTermStructure(
+            cumulative_pd=[
+                value / total_exposure * 100.0 if total_exposure > 0 else 0.0 for value in weighted_pd
+            ],
+            cumulative_expected_loss=cumulative.tolist(),
+            marginal_expected_loss=np.diff(cumulative, prepend=0.0).tolist(),
+            entry_cumulative_pd=(self.cumulative_pd * 100.0).tolist() if include_entries else None,
+            entry_cumulative_expected_loss=self.cumulative_expected_loss.tolist() if include_entries else None
+        )
+
+
+def compute_horizon_columns(
+    amount: np.ndarray,
+    annual_pd: np.ndarray,
+    lgd: np.ndarray,
+    tenor_months: np.ndarray,
+    years: int
+) -> HorizonColumns:
+    """
+    Cumulative PD and EL by year for every entry
+    `annual_pd` and `lgd` are decimals; annual PD is capped at 100%.
+    """
+    survival = 1.0 - np.clip(annual_pd, 0.0, 1.0)
+    tenor_years = np.maximum(tenor_months, 0) / MONTHS_PER_YEAR
+    exponent = np.minimum(np.arange(1, years + 1)[None, :], tenor_years[:, None])
+    cumulative_pd = 1.0 - np.power(survival[:, None], exponent)
+    return HorizonColumns(
+        cumulative_pd=cumulative_pd,
+        cumulative_expected_loss=(amount * lgd)[:, None] * cumulative_pd
+    )
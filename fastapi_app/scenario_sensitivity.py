@@ -0,0 +1,113 @@
+"""
+Scenario Sensitivity
+Loss surfaces over swept sector multipliers from per-sector aggregates
+
+Per sector s with PD multiplier m and LGD shift δ, climate-adjusted loss is
+
+    EL_s = m × Σ EAD × PD₀ × min(LGD₀ + δ, 1)
+
+With the sector's entries sorted by LGD₀ and prefix sums of w = EAD × PD₀
+and w × LGD₀, the entries that hit the 100% cap for a given δ are a suffix
+found by binary search, so
+
+    EL_s = m × (Σ_uncapped w × LGD₀ + δ × Σ_uncapped w + Σ_capped w)
+
+The aggregates are built once per portfolio; every grid point then costs
+O(sectors × log entries), evaluated for the whole grid at once per sector.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+import numpy as np
+from .scenario_arrays import BaselineColumns, PortfolioColumns, SectorMultiplierArrays, scenario_pd_lgd_shift
+
+# Sector multipliers a sweep axis can vary
+SWEEP_PARAMETERS = ("transition_pd_multiplier", "physical_pd_multiplier", "lgd_change")
+
+# (category codes, parameter, values) for one sweep axis
+SweepAxisSpec = Tuple[Sequence[int], str, Sequence[float]]
+
+
+@dataclass
+class SectorAggregates:
+    """
+    Per-category sorted LGD₀ with prefix sums (leading zero) of w and w × LGD₀
+    Category c occupies [offsets[c], offsets[c + 1]) of the entry arrays and
+    [offsets[c] + c, offsets[c + 1] + c + 1) of the prefix arrays.
+    """
+    offsets: np.ndarray
+    sorted_lgd: np.ndarray
+    weight_prefix: np.ndarray
+    weighted_lgd_prefix: np.ndarray
+
+    @property
+    def categories(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_portfolio(cls, portfolio: PortfolioColumns, baseline: BaselineColumns) -> 'SectorAggregates':
+        codes = portfolio.sector_codes
+        order = np.lexsort((baseline.baseline_lgd, codes))
+        counts = np.bincount(codes, minlength=len(portfolio.sectors))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        sorted_lgd = baseline.baseline_lgd[order]
+        weight = (portfolio.amount * baseline.baseline_pd)[order]
+
+        weight_prefix: List[np.ndarray] = []
+        weighted_lgd_prefix: List[np.ndarray] = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            segment = weight[start:end]
+            weight_prefix.append(np.concatenate(([0.0], np.cumsum(segment))))
+            weighted_lgd_prefix.append(np.concatenate(([0.0], np.cumsum(segment * sorted_lgd[start:end]))))
+        return cls(
+            offsets=offsets,
+            sorted_lgd=sorted_lgd,
+            weight_prefix=np.concatenate(weight_prefix),
+            weighted_lgd_prefix=np.concatenate(weighted_lgd_prefix)
+        )
+
+    def climate_adjusted_expected_loss(
+        self,
+        scenario_type: str,
+        transition_pd_multiplier: np.ndarray,
+        physical_pd_multiplier: np.ndarray,
+        lgd_change: np.ndarray
+    ) -> np.ndarray:
+        """
+        Portfolio climate-adjusted EL for each grid point
+        Multiplier arrays are (points × categories); returns (points,).
+        """
+        pd_multiplier, transition_shift, physical_shift = scenario_pd_lgd_shift(
+            scenario_type, transition_pd_multiplier, physical_pd_multiplier, lgd_change
+        )
+        lgd_shift = transition_shift + physical_shift
+        losses = np.zeros(pd_multiplier.shape)
+        for code in range(self.categories):
+            start, end = self.offsets[code], self.offsets[code + 1]
+            if start == end:
+                continue
+            shift = lgd_shift[:, code]
+            # Entries [0, uncapped) satisfy LGD₀ + δ <= 1
+            uncapped = np.searchsorted(self.sorted_lgd[start:end], 1.0 - shift, side='right')
+            weight = self.weight_prefix[start + code:end + code + 1]
+            weighted_lgd = self.weighted_lgd_prefix[start + code:end + code + 1]
+            losses[:, code] = pd_multiplier[:, code] * (
+                weighted_lgd[uncapped] + shift * weight[uncapped] + (weight[-1] - weight[uncapped])
+            )
+        return losses.sum(axis=1)
+
+
+def sweep_grid(multipliers: SectorMultiplierArrays, axes: Sequence[SweepAxisSpec]) -> List[np.ndarray]:
+    """
+    (points × categories) transition, physical and LGD-change arrays for a grid
+    Each axis is (category codes, parameter, values); points run row-major
+    over the axes (the last axis varies fastest).
+    """
+    grids = np.meshgrid(*[np.asarray(values, dtype=np.float64) for _, _, values in axes], indexing='ij')
+    points = grids[0].size
+    arrays = {
+        parameter: np.tile(getattr(multipliers, parameter), (points, 1)) for parameter in SWEEP_PARAMETERS
+    }
+    for (codes, parameter, _), grid in zip(axes, grids):
+        arrays[parameter][:, list(codes)] = grid.reshape(-1, 1)
+    return [arrays[parameter] for parameter in SWEEP_PARAMETERS]
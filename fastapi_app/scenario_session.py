@@ -0,0 +1,273 @@
+"""
+Scenario Sessions
+Stateful scenario calculation updated by portfolio deltas
+
+A session holds each entry's contribution (baseline EL and climate-adjusted
+EL per scenario) and running totals overall and per group_by group. A delta
+(add / update / remove, matched by entry id) computes contributions for the
+changed entries only, subtracts the old ones and adds the new ones, so an
+update costs O(delta) however large the portfolio is. Running sums are kept
+in CompensatedAccumulators, which stay exact under subtraction: totals always
+equal a fresh calculation over the current entries. Only groups a delta
+touches are recomputed and returned.
+
+Sessions live in an in-process LRU + TTL store (per worker / per serverless
+instance), configured from the environment:
+    SCENARIO_SESSION_MAX=100           maximum number of live sessions
+    SCENARIO_SESSION_TTL_SECONDS=3600  idle time before a session expires
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+from .models import PortfolioDelta, PortfolioEntry, ScenarioGroupTotals, ScenarioSessionResponse, ScenarioTotals
+from .scenario_arrays import (
+    GROUP_BY_FIELDS, SCENARIO_TYPES, TENOR_BUCKET_LABELS, CompensatedAccumulator, PortfolioColumns,
+    compute_baseline_columns, compute_scenario_columns, group_labels, group_totals
+)
+from .scenario_engine import ScenarioEngine
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class _Contribution(NamedTuple):
+    """What one entry adds to the session totals"""
+    amount: float
+    baseline_expected_loss: float
+    climate_adjusted_expected_loss: Tuple[float, ...]  # per scenario type
+    groups: Tuple[str, ...]  # label per group_by field
+
+
+class _Totals:
+    """Running exposure, baseline EL and per-scenario climate EL over a set of entries"""
+
+    __slots__ = ('entries', 'exposure', 'baseline_expected_loss', 'climate_adjusted_expected_loss')
+
+    def __init__(self, scenarios: int):
+        self.entries = 0
+        self.exposure = CompensatedAccumulator()
+        self.baseline_expected_loss = CompensatedAccumulator()
+        self.climate_adjusted_expected_loss = [CompensatedAccumulator() for _ in range(scenarios)]
+
+    def apply(self, contribution: _Contribution, sign: float) -> None:
+        self.entries += 1 if sign > 0 else -1
+        self.exposure.add((sign * contribution.amount,))
+        self.baseline_expected_loss.add((sign * contribution.baseline_expected_loss,))
+        for accumulator, value in zip(self.climate_adjusted_expected_loss, contribution.climate_adjusted_expected_loss):
+            accumulator.add((sign * value,))
+
+
+class ScenarioSession:
+    """Portfolio contributions and running totals for a set of scenarios"""
+
+    def __init__(
+        self,
+        engine: ScenarioEngine,
+        scenario_types: Sequence[str] = SCENARIO_TYPES,
+        group_by: Sequence[str] = (),
+        session_id: Optional[str] = None
+    ):
+        self.scenario_types = list(dict.fromkeys(scenario_types))
+        self.group_by = list(dict.fromkeys(group_by))
+        for scenario_type in self.scenario_types:
+            if scenario_type not in SCENARIO_TYPES:
+                raise ValueError(f"Invalid scenario type: {scenario_type}")
+        for field in self.group_by:
+            if field not in GROUP_BY_FIELDS:
+                raise ValueError(f"Invalid group_by field: {field}")
+
+        self.engine = engine
+        self.session_id = session_id or uuid.uuid4().hex
+        self.version = 0
+        self._entries: Dict[str, _Contribution] = {}
+        self._totals = _Totals(len(self.scenario_types))
+        # group_by field -> label -> totals
+        self._groups: List[Dict[str, _Totals]] = [{} for _ in self.group_by]
+        # (field index, label) -> materialized totals per scenario, dropped when the group changes
+        self._group_results: Dict[Tuple[int, str], List[ScenarioGroupTotals]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _contributions(self, entries: Sequence[PortfolioEntry]) -> List[_Contribution]:
+        """Vectorized contributions for the entries of a delta"""
+        if not entries:
+            return []
+        portfolio = PortfolioColumns.from_entries(entries)
+        multipliers = self.engine.sector_multiplier_arrays(portfolio.sectors)
+        baseline = compute_baseline_columns(portfolio)
+        climate = [
+            compute_scenario_columns(portfolio, multipliers, scenario_type, baseline).climate_adjusted_expected_loss.tolist()
+            for scenario_type in self.scenario_types
+        ]
+        labels = [group_labels(portfolio, field) for field in self.group_by]
+        return [
+            _Contribution(amount, baseline_expected_loss, tuple(values[index] for values in climate),
+                          tuple(group[index] for group in labels))
+            for index, (amount, baseline_expected_loss) in enumerate(
+                zip(portfolio.amount.tolist(), baseline.baseline_expected_loss.tolist())
+            )
+        ]
+
+    def _apply(self, contribution: _Contribution, sign: float, touched: Set[Tuple[int, str]]) -> None:
+        self._totals.apply(contribution, sign)
+        for position, label in enumerate(contribution.groups):
+            groups = self._groups[position]
+            totals = groups.get(label)
+            if totals is None:
+                totals = groups[label] = _Totals(len(self.scenario_types))
+            totals.apply(contribution, sign)
+            touched.add((position, label))
+
+    def apply_delta(self, delta: PortfolioDelta) -> ScenarioSessionResponse:
+        """
+        Apply a delta atomically and return the new totals and the touched groups
+        Raises ValueError (and leaves the session unchanged) when an added id
+        already exists, an updated or removed id does not, or an id appears twice.
+        """
+        with self._lock:
+            ids = [entry.id for entry in delta.add] + [entry.id for entry in delta.update] + list(delta.remove)
+            if len(ids) != len(set(ids)):
+                raise ValueError("Each entry id may appear only once per delta")
+            existing = [entry.id for entry in delta.add if entry.id in self._entries]
+            if existing:
+                raise ValueError(f"Entries already in the session: {', '.join(existing[:10])}")
+            missing = [entry_id for entry_id in ids[len(delta.add):] if entry_id not in self._entries]
+            if missing:
+                raise ValueError(f"Entries not in the session: {', '.join(missing[:10])}")
+
+            new_entries = list(delta.add) + list(delta.update)
+            contributions = self._contributions(new_entries)
+
+            touched: Set[Tuple[int, str]] = set()
+            for entry_id in [entry.id for entry in delta.update] + list(delta.remove):
+                self._apply(self._entries.pop(entry_id), -1.0, touched)
+            for entry, contribution in zip(new_entries, contributions):
+                self._entries[entry.id] = contribution
+                self._apply(contribution, 1.0, touched)
+
+            removed: Dict[str, List[str]] = {}
+            for position, label in sorted(touched):
+                self._group_results.pop((position, label), None)
+                if self._groups[position][label].entries == 0:
+                    del self._groups[position][label]
+                    removed.setdefault(self.group_by[position], []).append(label)
+            self.version += 1
+            changed = sorted(key for key in touched if key[1] in self._groups[key[0]])
+            return self._response(changed, removed)
+
+    def snapshot(self) -> ScenarioSessionResponse:
+        """Current totals and every group"""
+        with self._lock:
+            keys = [(position, label) for position, groups in enumerate(self._groups) for label in groups]
+            return self._response(keys, {})
+
+    def _group_result(self, position: int, label: str) -> List[ScenarioGroupTotals]:
+        key = (position, label)
+        results = self._group_results.get(key)
+        if results is None:
+            totals = self._groups[position][label]
+            exposure, baseline = totals.exposure.total, totals.baseline_expected_loss.total
+            results = [
+                group_totals(label, totals.entries, exposure, baseline, climate.total)
+                for climate in totals.climate_adjusted_expected_loss
+            ]
+            self._group_results[key] = results
+        return results
+
+    def _response(self, group_keys: Sequence[Tuple[int, str]], removed: Dict[str, List[str]]) -> ScenarioSessionResponse:
+        total_baseline_expected_loss = self._totals.baseline_expected_loss.total
+        totals: Dict[str, ScenarioTotals] = {}
+        for scenario_type, accumulator in zip(self.scenario_types, self._totals.climate_adjusted_expected_loss):
+            total_climate_adjusted_expected_loss = accumulator.total
+            total_loss_increase = total_climate_adjusted_expected_loss - total_baseline_expected_loss
+            totals[scenario_type] = ScenarioTotals(
+                total_climate_adjusted_expected_loss=total_climate_adjusted_expected_loss,
+                total_loss_increase=total_loss_increase,
+                total_loss_increase_percentage=(
+                    total_loss_increase / total_baseline_expected_loss * 100.0 if total_baseline_expected_loss > 0 else 0.0
+                )
+            )
+
+        groups: Dict[str, Dict[str, List[ScenarioGroupTotals]]] = {}
+        if self.group_by:
+            ordered = sorted(group_keys, key=lambda key: (
+                key[0], TENOR_BUCKET_LABELS.index(key[1]) if self.group_by[key[0]] == "tenor_bucket" else 0
+            ))
+            groups = {scenario_type: {field: [] for field in self.group_by} for scenario_type in self.scenario_types}
+            for position, label in ordered:
+                for scenario_type, result in zip(self.scenario_types, self._group_result(position, label)):
+                    groups[scenario_type][self.group_by[position]].append(result)
+
+        return ScenarioSessionResponse(
+            success=True,
+            session_id=self.session_id,
+            version=self.version,
+            entries=len(self._entries),
+            total_exposure=self._totals.exposure.total,
+            total_baseline_expected_loss=total_baseline_expected_loss,
+            totals=totals,
+            groups=groups,
+            removed_groups=removed
+        )
+
+
+class ScenarioSessionStore:
+    """Thread-safe LRU + TTL store of live sessions"""
+
+    def __init__(self, max_sessions: int = 100, ttl_seconds: float = 3600.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, Tuple[float, ScenarioSession]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        expired = [session_id for session_id, (expires_at, _) in self._sessions.items() if expires_at <= now]
+        for session_id in expired:
+            del self._sessions[session_id]
+
+    def add(self, session: ScenarioSession) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._sessions[session.session_id] = (now + self.ttl_seconds, session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[ScenarioSession]:
+        """Live session by id (refreshes its TTL)"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._sessions.get(session_id)
+            if item is None:
+                return None
+            if item[0] <= now:
+                del self._sessions[session_id]
+                return None
+            self._sessions[session_id] = (now + self.ttl_seconds, item[1])
+            self._sessions.move_to_end(session_id)
+            return item[1]
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def create_default_session_store() -> ScenarioSessionStore:
+    """Build the session store from environment configuration"""
+    return ScenarioSessionStore(
+        max_sessions=_env_int("SCENARIO_SESSION_MAX", 100),
+        ttl_seconds=float(_env_int("SCENARIO_SESSION_TTL_SECONDS", 3600))
+    )
@@ -0,0 +1,153 @@
+"""
+Scenario Simulation
+Monte Carlo climate stress testing with stochastic sector multipliers
+
+Each sector's multipliers are distributions centred on the point values of
+the sector table: PD multipliers are lognormal with mean equal to the point
+multiplier, the LGD change is normal around its point value (percentage
+points). A draw shocks every sector once and applies the same per-entry
+arithmetic as compute_scenario_columns to the whole portfolio, evaluated as
+(draws × entries) array blocks. The normal LGD shock is unbounded, so the
+adjusted LGD is clipped to [0, 100%] (compute_scenario_columns only caps it
+above; its point shifts do not take low-LGD entries below zero).
+
+Draws are generated in fixed blocks of SIMULATION_BLOCK, each with its own
+seed spawned from the run seed, so results are reproducible and do not
+depend on whether (or how many) worker processes are used. Large runs are
+fanned out through the request offloader (offload.ProcessOffloader.map), so
+they share its process pool, queue bound, timeout and /offload/stats.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, TYPE_CHECKING
+import numpy as np
+from .models import LossDistribution
+from .scenario_arrays import (
+    BaselineColumns, PortfolioColumns, SectorMultiplierArrays, scenario_pd_lgd_shift
+)
+
+if TYPE_CHECKING:
+    from .offload import ProcessOffloader
+
+# Draws per independently seeded block
+SIMULATION_BLOCK = 1024
+
+# Upper bound on (draws × entries) array elements evaluated at once
+MAX_BLOCK_ELEMENTS = 1 << 22
+
+# Below this many draw × entry evaluations a process pool costs more than it saves
+PARALLEL_MIN_WORK = 20_000_000
+
+
+@dataclass
+class SectorMultiplierDistributions:
+    """Per-category multiplier distributions, aligned with PortfolioColumns.sectors"""
+    multipliers: SectorMultiplierArrays  # point values (means)
+    pd_multiplier_volatility: np.ndarray  # lognormal sigma
+    lgd_change_std: np.ndarray  # percentage points
+
+
+@dataclass
+class SimulationInputs:
+    """Picklable per-entry arrays a simulation block needs"""
+    scenario_type: str
+    sector_codes: np.ndarray
+    amount: np.ndarray
+    baseline_pd: np.ndarray
+    baseline_lgd: np.ndarray
+    distributions: SectorMultiplierDistributions
+
+
+def _lognormal(generator: np.random.Generator, mean: np.ndarray, sigma: np.ndarray, draws: int) -> np.ndarray:
+    """Lognormal draws with the given mean (sigma 0 gives the mean exactly)"""
+    shocks = generator.standard_normal((draws, len(mean)))
+    return mean * np.exp(sigma * shocks - 0.5 * sigma * sigma)
+
+
+def simulate_block(inputs: SimulationInputs, seed: np.random.SeedSequence, draws: int) -> np.ndarray:
+    """Portfolio climate-adjusted expected loss for each of `draws` draws"""
+    generator = np.random.default_rng(seed)
+    distributions = inputs.distributions
+    point = distributions.multipliers
+    sigma = distributions.pd_multiplier_volatility
+    transition = _lognormal(generator, point.transition_pd_multiplier, sigma, draws)
+    physical = _lognormal(generator, point.physical_pd_multiplier, sigma, draws)
+    lgd_change = point.lgd_change + distributions.lgd_change_std * generator.standard_normal((draws, len(sigma)))
+
+    pd_multiplier, transition_shift, physical_shift = scenario_pd_lgd_shift(
+        inputs.scenario_type, transition, physical, lgd_change
+    )
+
+    codes = inputs.sector_codes
+    losses = np.empty(draws)
+    step = max(1, MAX_BLOCK_ELEMENTS // max(len(codes), 1))
+    for start in range(0, draws, step):
+        rows = slice(start, start + step)
+        adjusted_pd = inputs.baseline_pd * pd_multiplier[rows][:, codes]
+        # Clipped below too: a negative LGD shock must not produce negative losses
+        adjusted_lgd = np.clip(
+            inputs.baseline_lgd + transition_shift[rows][:, codes] + physical_shift[rows][:, codes], 0.0, 1.0
+        )
+        losses[rows] = (inputs.amount * adjusted_pd * adjusted_lgd).sum(axis=1)
+    return losses
+
+
+def _simulate_blocks(inputs: SimulationInputs, blocks: Sequence[Tuple[np.random.SeedSequence, int]]) -> np.ndarray:
+    """Process pool entry point - several seeded blocks per task"""
+    return np.concatenate([simulate_block(inputs, seed, draws) for seed, draws in blocks])
+
+
+def simulate_losses(
+    portfolio: PortfolioColumns,
+    baseline: BaselineColumns,
+    distributions: SectorMultiplierDistributions,
+    scenario_type: str,
+    simulations: int,
+    seed: int,
+    offloader: Optional['ProcessOffloader'] = None
+) -> np.ndarray:
+    """
+    Simulated portfolio climate-adjusted expected loss, one value per draw
+    Runs inline, or on the `offloader` process pool when simulations ×
+    entries reaches PARALLEL_MIN_WORK (may raise OffloadRejected /
+    OffloadTimeout).
+    """
+    inputs = SimulationInputs(
+        scenario_type=scenario_type,
+        sector_codes=portfolio.sector_codes,
+        amount=portfolio.amount,
+        baseline_pd=baseline.baseline_pd,
+        baseline_lgd=baseline.baseline_lgd,
+        distributions=distributions
+    )
+    block_count = math.ceil(simulations / SIMULATION_BLOCK)
+    seeds = np.random.SeedSequence(seed).spawn(block_count)
+    blocks = [
+        (block_seed, min(SIMULATION_BLOCK, simulations - index * SIMULATION_BLOCK))
+        for index, block_seed in enumerate(seeds)
+    ]
+
+    if offloader is None or block_count < 2 or simulations * len(portfolio) < PARALLEL_MIN_WORK:
+        return _simulate_blocks(inputs, blocks)
+
+    # Contiguous block runs keep draw order, so the result is the same as inline
+    per_task = math.ceil(block_count / offloader.max_workers)
+    tasks = [(inputs, blocks[start:start + per_task]) for start in range(0, block_count, per_task)]
+    return np.concatenate(offloader.map(_simulate_blocks, tasks))
+
+
+def loss_distribution(losses: np.ndarray) -> LossDistribution:
+    """Mean, spread, percentiles and expected shortfall (mean loss at or beyond the percentile)"""
+    p50, p95, p99 = np.percentile(losses, [50, 95, 99]).tolist()
+    return LossDistribution(
+        mean=float(losses.mean()),
+        std=float(losses.std()),
+        min=float(losses.min()),
+        p50=p50,
+        p95=p95,
+        p99=p99,
+        max=float(losses.max()),
+        expected_shortfall_95=float(losses[losses >= p95].mean()),
+        expected_shortfall_99=float(losses[losses >= p99].mean())
+    )
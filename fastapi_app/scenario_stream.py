@@ -0,0 +1,155 @@
+"""
+Scenario Streaming
+Chunked climate stress calculation over uploaded portfolio files
+
+Portfolio records (CSV rows or JSON objects) are validated and stressed one
+chunk at a time: each chunk is encoded as PortfolioColumns, run through the
+vectorized scenario arithmetic and written out as NDJSON lines. Totals (and
+group_by aggregates) are carried in compensated accumulators and unmatched
+sectors in a per-sector tally, so memory depends on the chunk size and the
+number of distinct groups, not on the size of the upload. Invalid records
+always get an error line; result lines can be switched off.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from .models import PortfolioEntry
+from .scenario_arrays import (
+    CompensatedAccumulator, GroupAccumulator, PortfolioColumns, compute_scenario_columns, unmatched_sector_report
+)
+from .scenario_engine import ScenarioEngine
+from .streaming import ParsedRecord, encode_ndjson
+
+# Per-entry fields written for each result line, in ScenarioResult order
+RESULT_FIELDS = (
+    'company', 'sector', 'exposure', 'baseline_pd', 'baseline_lgd', 'pd_multiplier', 'adjusted_pd',
+    'lgd_change', 'adjusted_lgd', 'climate_adjusted_expected_loss', 'baseline_expected_loss',
+    'loss_increase', 'loss_increase_percentage'
+)
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'entry'}: {item['msg']}" for item in error.errors()
+    )
+
+
+class ScenarioStream:
+    """
+    Running state of one streamed scenario calculation
+    Feed record chunks to process_chunk() in order, then emit summary().
+    """
+
+    def __init__(
+        self,
+        engine: ScenarioEngine,
+        scenario_type: str,
+        group_by: Sequence[str] = (),
+        include_results: Optional[bool] = None
+    ):
+        self.engine = engine
+        self.scenario_type = scenario_type
+        # Per-entry lines default to on without group_by and off with it
+        self.include_results = not group_by if include_results is None else include_results
+        self._groups = [GroupAccumulator(field) for field in dict.fromkeys(group_by)]
+        self.entries = 0
+        self.errors = 0
+        self._exposure = CompensatedAccumulator()
+        self._baseline_expected_loss = CompensatedAccumulator()
+        self._climate_adjusted_expected_loss = CompensatedAccumulator()
+        # sector -> [entries, exposure] for sectors stressed with default multipliers
+        self._unmatched: Dict[str, List[float]] = {}
+
+    def process_chunk(self, records: Sequence[ParsedRecord], start_index: int) -> bytes:
+        """Validate and stress a chunk of records, returning its NDJSON result lines"""
+        lines: List[Tuple[int, Dict[str, Any]]] = []
+        entries: List[PortfolioEntry] = []
+        entry_indexes: List[int] = []
+        for offset, (record, parse_error) in enumerate(records):
+            index = start_index + offset
+            if parse_error:
+                lines.append((index, {"index": index, "success": False, "error": parse_error}))
+                continue
+            try:
+                entries.append(PortfolioEntry.model_validate(record))
+                entry_indexes.append(index)
+            except ValidationError as error:
+                lines.append((index, {"index": index, "success": False, "error": _validation_message(error)}))
+        chunk_errors = len(lines)
+        self.errors += chunk_errors
+
+        if entries:
+            portfolio = PortfolioColumns.from_entries(entries)
+            multipliers = self.engine.sector_multiplier_arrays(portfolio.sectors)
+            columns = compute_scenario_columns(portfolio, multipliers, self.scenario_type)
+
+            self.entries += len(entries)
+            self._exposure.add(portfolio.amount.tolist())
+            self._baseline_expected_loss.add(columns.baseline_expected_loss.tolist())
+            self._climate_adjusted_expected_loss.add(columns.climate_adjusted_expected_loss.tolist())
+            for item in unmatched_sector_report(portfolio, multipliers):
+                tally = self._unmatched.setdefault(item.sector, [0, 0.0])
+                tally[0] += item.entries
+                tally[1] += item.exposure
+            for accumulator in self._groups:
+                accumulator.add(portfolio, columns)
+
+        if entries and self.include_results:
+            values = zip(
+                portfolio.company,
+                portfolio.sector,
+                portfolio.amount.tolist(),
+                portfolio.probability_of_default.tolist(),
+                portfolio.loss_given_default.tolist(),
+                columns.pd_multiplier.tolist(),
+                columns.adjusted_pd.tolist(),
+                columns.lgd_change.tolist(),
+                columns.adjusted_lgd.tolist(),
+                columns.climate_adjusted_expected_loss.tolist(),
+                columns.baseline_expected_loss.tolist(),
+                columns.loss_increase.tolist(),
+                columns.loss_increase_percentage.tolist()
+            )
+            for index, row in zip(entry_indexes, values):
+                lines.append((index, {"index": index, "success": True, "result": dict(zip(RESULT_FIELDS, row))}))
+
+        if chunk_errors and entries and self.include_results:
+            lines.sort(key=lambda line: line[0])
+        return b"".join(encode_ndjson(line) for _, line in lines)
+
+    def summary(self, error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Final totals line (ScenarioResponse totals for the valid entries)
+        `error` is set when the stream was cut short.
+        """
+        total_baseline_expected_loss = self._baseline_expected_loss.total
+        total_climate_adjusted_expected_loss = self._climate_adjusted_expected_loss.total
+        total_loss_increase = total_climate_adjusted_expected_loss - total_baseline_expected_loss
+        if total_baseline_expected_loss > 0:
+            total_loss_increase_percentage = total_loss_increase / total_baseline_expected_loss * 100.0
+        else:
+            total_loss_increase_percentage = 0.0
+
+        unmatched_sectors = [
+            {"sector": sector, "entries": int(entries), "exposure": exposure}
+            for sector, (entries, exposure) in sorted(self._unmatched.items(), key=lambda item: -item[1][1])
+        ]
+        return {
+            "summary": {
+                "success": error is None,
+                "scenario_type": self.scenario_type,
+                "entries": self.entries,
+                "errors": self.errors,
+                "total_exposure": self._exposure.total,
+                "total_baseline_expected_loss": total_baseline_expected_loss,
+                "total_climate_adjusted_expected_loss": total_climate_adjusted_expected_loss,
+                "total_loss_increase": total_loss_increase,
+                "total_loss_increase_percentage": total_loss_increase_percentage,
+                "groups": {
+                    accumulator.field: [group.model_dump() for group in accumulator.results()]
+                    for accumulator in self._groups
+                } if self._groups else None,
+                "unmatched_sectors": unmatched_sectors,
+                "error": error
+            }
+        }
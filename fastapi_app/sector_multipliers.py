@@ -0,0 +1,238 @@
+"""
+Sector Multipliers
+Climate stress multipliers per sector, compiled once into lookup arrays
+
+The sector table is compiled into contiguous NumPy arrays (one row per
+canonical sector plus a trailing default row) and a normalized-name -> code
+index. Sector names from requests are normalized (Unicode form, case,
+whitespace, dash variants, "and" vs "&", punctuation spacing) and matched
+against canonical names and aliases; resolutions are memoized. Sectors that
+resolve to nothing get the neutral default multipliers and are reported.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+
+class SectorMultipliers(NamedTuple):
+    """Multipliers for one sector (lgd_change in percentage points)"""
+    transition_pd_multiplier: float
+    physical_pd_multiplier: float
+    lgd_change: float
+
+
+# Applied to sectors that are not in the table
+DEFAULT_SECTOR_MULTIPLIERS = SectorMultipliers(1.0, 1.0, 0.0)
+
+# Sector-specific multipliers for transition and physical risks
+SECTOR_MULTIPLIERS: Dict[str, SectorMultipliers] = {
+    "Power Generation – Fossil Fuel": SectorMultipliers(1.6, 1.1, 10.0),
+    "Power Generation – Renewable": SectorMultipliers(0.9, 1.0, 0.0),
+    "Industrial Manufacturing": SectorMultipliers(1.3, 1.1, 8.0),
+    "Transportation (Aviation & Shipping)": SectorMultipliers(1.4, 1.2, 10.0),
+    "Construction & Materials": SectorMultipliers(1.3, 1.2, 12.0),
+    "Real Estate (Commercial)": SectorMultipliers(1.1, 1.4, 15.0),
+    "Agriculture & Forestry": SectorMultipliers(1.2, 1.4, 20.0),
+    "Financial Services": SectorMultipliers(1.0, 1.0, 0.0),
+    "Power (Independent Producers)": SectorMultipliers(1.5, 1.1, 10.0),
+    "Manufacturing SMEs": SectorMultipliers(1.3, 1.1, 8.0),
+    "Transport & Logistics": SectorMultipliers(1.2, 1.2, 12.0),
+    "Real Estate (SME Developers)": SectorMultipliers(1.1, 1.3, 15.0),
+    "Agriculture / Food SMEs": SectorMultipliers(1.2, 1.4, 20.0),
+    "Oil & Gas (Upstream, Midstream, Downstream)": SectorMultipliers(1.6, 1.1, 15.0),
+    "Renewable Energy": SectorMultipliers(0.9, 1.0, 0.0),
+    "Infrastructure (Ports, Roads)": SectorMultipliers(1.2, 1.3, 20.0),
+    "Mining & Metals": SectorMultipliers(1.4, 1.2, 12.0),
+    "Residential Real Estate": SectorMultipliers(1.1, 1.4, 20.0),
+    "Commercial Real Estate": SectorMultipliers(1.1, 1.4, 15.0),
+    "Passenger Vehicles": SectorMultipliers(1.3, 1.1, 5.0),
+    "Heavy Transport": SectorMultipliers(1.4, 1.2, 10.0),
+    "Sovereign (Pakistan/UAE/etc.)": SectorMultipliers(1.1, 1.3, 5.0),
+    "Buildings (Urban)": SectorMultipliers(1.1, 1.4, 15.0),
+    # Additional mappings for sectors that might match
+    "Steel & Iron": SectorMultipliers(1.4, 1.2, 12.0),
+    "Cement": SectorMultipliers(1.3, 1.2, 12.0),
+    "Chemicals & Petrochemicals": SectorMultipliers(1.3, 1.1, 8.0),
+    "Fertilizers": SectorMultipliers(1.3, 1.1, 8.0),
+    "Pulp & Paper": SectorMultipliers(1.3, 1.1, 8.0),
+    "Textile & Apparel": SectorMultipliers(1.3, 1.1, 8.0),
+    "Automotive & Transport Equipment": SectorMultipliers(1.3, 1.1, 5.0),
+    "Electronics & Machinery": SectorMultipliers(1.3, 1.1, 8.0),
+    "Aviation": SectorMultipliers(1.4, 1.2, 10.0),
+    "Shipping / Marine Transport": SectorMultipliers(1.4, 1.2, 10.0),
+    "Rail Transport": SectorMultipliers(1.2, 1.2, 12.0),
+    "Road Freight & Logistics": SectorMultipliers(1.2, 1.2, 12.0),
+    "Public Transport & Mobility": SectorMultipliers(1.2, 1.2, 12.0),
+    "Construction & Infrastructure": SectorMultipliers(1.3, 1.2, 12.0),
+    "Agriculture": SectorMultipliers(1.2, 1.4, 20.0),
+    "Livestock & Dairy": SectorMultipliers(1.2, 1.4, 20.0),
+    "Forestry & Logging": SectorMultipliers(1.2, 1.4, 20.0),
+    "Fisheries & Aquaculture": SectorMultipliers(1.2, 1.4, 20.0),
+    "Food Processing & Packaging": SectorMultipliers(1.2, 1.4, 20.0),
+    "Banking / Financial Services": SectorMultipliers(1.0, 1.0, 0.0),
+    "Insurance & Reinsurance": SectorMultipliers(1.0, 1.0, 0.0),
+    "Asset Management / Investment": SectorMultipliers(1.0, 1.0, 0.0),
+    "Retail & Consumer Goods": SectorMultipliers(1.1, 1.1, 5.0),
+    "Hospitality & Leisure": SectorMultipliers(1.1, 1.2, 10.0),
+    "Healthcare & Pharma": SectorMultipliers(1.0, 1.1, 5.0),
+    "Telecom & Data Centers": SectorMultipliers(1.1, 1.2, 10.0),
+    "Public Sector & Sovereign": SectorMultipliers(1.1, 1.3, 5.0),
+    "Technology (IT & Cloud)": SectorMultipliers(1.0, 1.1, 5.0),
+    # Simple sector names from the frontend
+    "Energy": SectorMultipliers(1.6, 1.1, 15.0),
+    "Manufacturing": SectorMultipliers(1.3, 1.1, 8.0),
+    "Retail": SectorMultipliers(1.1, 1.2, 10.0),
+    "Technology": SectorMultipliers(1.0, 1.1, 5.0),
+    "Real Estate": SectorMultipliers(1.1, 1.4, 15.0),
+    "Healthcare": SectorMultipliers(1.0, 1.1, 5.0),
+    "Transportation": SectorMultipliers(1.4, 1.2, 10.0),
+    "Construction": SectorMultipliers(1.3, 1.2, 12.0),
+    "Other": SectorMultipliers(1.1, 1.1, 5.0),
+}
+
+# Other spellings of table sectors (matched after normalization)
+SECTOR_ALIASES: Dict[str, str] = {
+    "Power Generation - Fossil": "Power Generation – Fossil Fuel",
+    "Fossil Fuel Power": "Power Generation – Fossil Fuel",
+    "Power Generation - Renewables": "Power Generation – Renewable",
+    "Independent Power Producers": "Power (Independent Producers)",
+    "IPP": "Power (Independent Producers)",
+    "Oil & Gas": "Oil & Gas (Upstream, Midstream, Downstream)",
+    "Oil and Gas": "Oil & Gas (Upstream, Midstream, Downstream)",
+    "Renewables": "Renewable Energy",
+    "Mining": "Mining & Metals",
+    "Steel": "Steel & Iron",
+    "Iron & Steel": "Steel & Iron",
+    "Chemicals": "Chemicals & Petrochemicals",
+    "Textiles": "Textile & Apparel",
+    "Textile": "Textile & Apparel",
+    "Automotive": "Automotive & Transport Equipment",
+    "Shipping": "Shipping / Marine Transport",
+    "Marine Transport": "Shipping / Marine Transport",
+    "Rail": "Rail Transport",
+    "Logistics": "Road Freight & Logistics",
+    "Transport": "Transportation",
+    "Infrastructure": "Infrastructure (Ports, Roads)",
+    "Food Processing": "Food Processing & Packaging",
+    "Forestry": "Forestry & Logging",
+    "Fisheries": "Fisheries & Aquaculture",
+    "Banking": "Banking / Financial Services",
+    "Banks": "Banking / Financial Services",
+    "Finance": "Financial Services",
+    "Financial": "Financial Services",
+    "Insurance": "Insurance & Reinsurance",
+    "Asset Management": "Asset Management / Investment",
+    "Hospitality": "Hospitality & Leisure",
+    "Pharma": "Healthcare & Pharma",
+    "Pharmaceuticals": "Healthcare & Pharma",
+    "Telecom": "Telecom & Data Centers",
+    "Telecommunications": "Telecom & Data Centers",
+    "IT": "Technology",
+    "Information Technology": "Technology",
+    "Sovereign": "Sovereign (Pakistan/UAE/etc.)",
+    "Public Sector": "Public Sector & Sovereign",
+    "Commercial Property": "Commercial Real Estate",
+    "Residential Property": "Residential Real Estate",
+}
+
+# Hyphen/dash/minus code points treated as "-"
+_DASHES = str.maketrans({
+    char: "-" for char in "\u2010\u2011\u2012\u2013\u2014\u2015\u2212\ufe58\ufe63\uff0d"
+})
+_PUNCTUATION = re.compile(r"([-/&(),.])")
+
+# Memoized resolutions kept per table before the memo is reset
+RESOLUTION_MEMO_SIZE = 4096
+
+
+def normalize_sector(sector: str) -> str:
+    """
+    Canonical matching key for a sector name
+    "Power Generation — fossil  fuel" and "power generation - Fossil Fuel"
+    both become "power generation - fossil fuel".
+    """
+    text = unicodedata.normalize("NFKC", sector).translate(_DASHES).casefold()
+    tokens = _PUNCTUATION.sub(r" \1 ", text).split()
+    return " ".join("&" if token == "and" else token for token in tokens)
+
+
+class SectorMultiplierTable:
+    """
+    Sector multipliers as arrays indexed by sector code
+    Code i < len(sectors) is sectors[i]; code `default_code` is the trailing
+    default row used for unmatched sectors.
+    """
+
+    def __init__(
+        self,
+        multipliers: Dict[str, SectorMultipliers],
+        aliases: Optional[Dict[str, str]] = None,
+        default: SectorMultipliers = DEFAULT_SECTOR_MULTIPLIERS
+    ):
+        self.sectors: Tuple[str, ...] = tuple(multipliers)
+        self.default_code = len(self.sectors)
+        rows = np.array(list(multipliers.values()) + [default], dtype=np.float64).reshape(-1, 3)
+        self.transition_pd_multiplier = rows[:, 0].copy()
+        self.physical_pd_multiplier = rows[:, 1].copy()
+        self.lgd_change = rows[:, 2].copy()
+
+        index: Dict[str, int] = {}
+        for code, sector in enumerate(self.sectors):
+            self._add_key(index, sector, code)
+        for alias, sector in (aliases or {}).items():
+            code = index.get(normalize_sector(sector))
+            if code is None:
+                raise ValueError(f"Sector alias '{alias}' refers to unknown sector '{sector}'")
+            self._add_key(index, alias, code)
+        self._index = index
+        self._memo: Dict[str, int] = {}
+        self._memo_lock = threading.Lock()
+
+    @staticmethod
+    def _add_key(index: Dict[str, int], name: str, code: int) -> None:
+        key = normalize_sector(name)
+        if index.setdefault(key, code) != code:
+            raise ValueError(f"Sector '{name}' collides with another sector after normalization")
+
+    def __len__(self) -> int:
+        return len(self.sectors)
+
+    def resolve(self, sector: str) -> int:
+        """Sector code for a raw sector name (default_code when unmatched)"""
+        code = self._memo.get(sector)
+        if code is None:
+            code = self._index.get(normalize_sector(sector), self.default_code)
+            with self._memo_lock:
+                if len(self._memo) >= RESOLUTION_MEMO_SIZE:
+                    self._memo.clear()
+                self._memo[sector] = code
+        return code
+
+    def codes(self, sectors: Iterable[str]) -> np.ndarray:
+        """Sector codes for raw sector names"""
+        return np.fromiter((self.resolve(sector) for sector in sectors), dtype=np.int64)
+
+    def canonical_name(self, sector: str) -> Optional[str]:
+        """Table sector a raw name resolves to, or None when unmatched"""
+        code = self.resolve(sector)
+        return None if code == self.default_code else self.sectors[code]
+
+    def multipliers(self, sector: str) -> SectorMultipliers:
+        """Multipliers for one raw sector name"""
+        code = self.resolve(sector)
+        return SectorMultipliers(
+            float(self.transition_pd_multiplier[code]),
+            float(self.physical_pd_multiplier[code]),
+            float(self.lgd_change[code])
+        )
+
+    def unmatched(self, sectors: Sequence[str]) -> List[str]:
+        """Raw sector names that resolve to the default row"""
+        return [sector for sector in sectors if self.resolve(sector) == self.default_code]
+
+
+# Compiled once at import time and shared by every ScenarioEngine
+DEFAULT_SECTOR_TABLE = SectorMultiplierTable(SECTOR_MULTIPLIERS, SECTOR_ALIASES)
@@ -0,0 +1,73 @@
+"""
+Response Serialization
+Direct-to-bytes JSON encoding for engine results
+
+Endpoint results are Pydantic models the engines have already built and
+validated. FastAPI's default path validates them again against the
+response_model, walks them with jsonable_encoder and then runs json.dumps,
+which for a large ScenarioResponse costs several times the calculation
+itself. ModelResponse writes the model straight to bytes with Pydantic's
+compiled serializer (model_dump_json); since the endpoint returns a Response,
+FastAPI skips the re-validation. Routes keep their response_model for the
+OpenAPI schema.
+
+Plain records (NDJSON lines, dict payloads) are encoded with orjson when it
+is installed and with the standard json module otherwise.
+
+The JSON is equivalent to before: same fields in the same order with the
+same values, compact separators, UTF-8. Float formatting can differ (e.g.
+1e16 vs 1e+16), which parsers read as the same number. NaN / Infinity
+floats are written as null (the default path rejected them with a 500).
+"""
+
+import json
+import math
+from typing import Any
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _finite(value: Any) -> Any:
+    """Copy of a plain value with NaN / Infinity floats replaced by None, as orjson writes them"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if hasattr(value, 'tolist'):  # NumPy arrays and scalars
+        return _finite(value.tolist())
+    return value
+
+
+def dumps_json(value: Any) -> bytes:
+    """Encode a plain value (dicts, lists, numbers, strings, NumPy arrays) as compact UTF-8 JSON"""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json().encode('utf-8')
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # e.g. non-string dict keys or integers beyond 64 bits
+            pass
+    return json.dumps(_finite(value), ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+
+
+class ModelResponse(Response):
+    """
+    JSON response for a pre-validated model (or plain value)
+    Returning one from an endpoint bypasses response_model re-validation and
+    jsonable_encoder.
+    """
+
+    media_type = JSON_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -290,6 +290,20 @@ def format_calculation_step(step_name: str, value: float, formula: str) -> Calcu
     )
 
 
+def create_summary_calculation_steps(
+    attribution_factor: float,
+    financed_emissions: float,
+    emissions_label: str = 'Financed Emissions'
+) -> List[CalculationStep]:
+    """
+    Create the headline calculation steps only (no formatted formulas)
+    """
+    return [
+        CalculationStep(step='Attribution Factor', value=attribution_factor, formula=''),
+        CalculationStep(step=emissions_label, value=financed_emissions, formula='')
+    ]
+
+
 def create_emission_calculation_steps(
     outstanding_amount: float,
     denominator: float,
@@ -0,0 +1,268 @@
+"""
+Streaming Helpers
+Incremental request-body parsing and NDJSON encoding for batch endpoints
+
+Request bodies are consumed chunk by chunk, so only the record currently
+being parsed is held in memory regardless of how large the batch is.
+Bodies can be a JSON array, NDJSON, or (for upload endpoints) CSV with a
+header row.
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from .serialization import dumps_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Guard against a single record growing without bound (e.g. unterminated JSON)
+MAX_RECORD_CHARS = 1_000_000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+# (record, error) - exactly one of the two is set
+ParsedRecord = Tuple[Optional[Any], Optional[str]]
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while
+    the response streams
+
+    Starlette's StreamingResponse listens for http.disconnect by consuming
+    receive(), which would steal request body chunks from request.stream().
+    A client disconnect surfaces as a failed send instead.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def encode_ndjson(record: Any) -> bytes:
+    """Encode one record as a compact NDJSON line"""
+    return dumps_json(record) + b'\n'
+
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    async for chunk in chunks:
+        if chunk:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+async def _iter_ndjson(text_chunks: AsyncIterator[str], buffer: str) -> AsyncIterator[ParsedRecord]:
+    """Parse newline-delimited JSON; a malformed line becomes an inline error"""
+    async def lines() -> AsyncIterator[str]:
+        pending = buffer
+        while True:
+            *complete, pending = pending.split('\n')
+            for line in complete:
+                yield line
+            if len(pending) > MAX_RECORD_CHARS:
+                yield pending
+                pending = ''
+            try:
+                pending += await text_chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        yield pending
+
+    async for line in lines():
+        line = line.strip()
+        if not line:
+            continue
+        if len(line) > MAX_RECORD_CHARS:
+            yield None, f"Record exceeds {MAX_RECORD_CHARS} characters"
+            continue
+        try:
+            yield json.loads(line), None
+        except json.JSONDecodeError as error:
+            yield None, f"Invalid JSON: {error.msg}"
+
+
+async def _iter_json_array(text_chunks: AsyncIterator[str], buffer: str) -> AsyncIterator[ParsedRecord]:
+    """Parse the elements of a top-level JSON array one at a time"""
+    position = buffer.index('[') + 1
+    exhausted = False
+
+    async def fill() -> bool:
+        nonlocal buffer, position, exhausted
+        try:
+            text = await text_chunks.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + text
+        position = 0
+        return True
+
+    expect_value = True
+    while True:
+        # Skip whitespace and separators
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer) or exhausted or not await fill():
+                break
+        if position >= len(buffer):
+            yield None, "Invalid JSON: unterminated array"
+            return
+
+        char = buffer[position]
+        if char == ']':
+            return
+        if char == ',':
+            if expect_value:
+                yield None, "Invalid JSON: unexpected ','"
+                return
+            position += 1
+            expect_value = True
+            continue
+        if not expect_value:
+            yield None, "Invalid JSON: expected ',' or ']'"
+            return
+
+        # Decode the next element, reading more input until it is complete.
+        # A value ending exactly at the buffer end may be truncated (e.g. numbers).
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buffer, position)
+                if end < len(buffer) or exhausted:
+                    break
+            except json.JSONDecodeError as error:
+                if exhausted:
+                    yield None, f"Invalid JSON: {error.msg}"
+                    return
+                if len(buffer) - position > MAX_RECORD_CHARS:
+                    yield None, f"Record exceeds {MAX_RECORD_CHARS} characters"
+                    return
+            await fill()
+        yield value, None
+        position = end
+        expect_value = False
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRecord]:
+    """
+    Yield (record, error) pairs from a JSON array or NDJSON request body
+    The format is detected from the first non-whitespace character.
+    """
+    text_chunks = _iter_text(chunks).__aiter__()
+    buffer = ''
+    async for text in text_chunks:
+        buffer += text
+        if buffer.strip():
+            break
+    stripped = buffer.lstrip()
+    if not stripped:
+        return
+
+    if stripped[0] == '[':
+        async for item in _iter_json_array(text_chunks, buffer):
+            yield item
+    else:
+        async for item in _iter_ndjson(text_chunks, buffer):
+            yield item
+
+
+async def _iter_csv_lines(text_chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Split text into CSV records
+    A line break inside a quoted field (odd number of quotes so far) does not
+    end the record. Records are sliced at a read offset and the buffer is
+    trimmed once per chunk, so a body delivered as one chunk (as Mangum does)
+    is split in linear time.
+    """
+    pending = ''
+    scanned = 0  # characters of the pending record already searched
+    quotes = 0  # quotes in those characters
+    async for text in text_chunks:
+        pending += text
+        start = 0
+        position = scanned
+        while True:
+            newline = pending.find('\n', position)
+            if newline < 0:
+                break
+            quotes += pending.count('"', position, newline + 1)
+            position = newline + 1
+            if quotes % 2 == 0:
+                yield pending[start:position]
+                start = position
+                quotes = 0
+        pending = pending[start:]
+        if len(pending) > MAX_RECORD_CHARS:
+            yield pending
+            pending = ''
+            quotes = 0
+        else:
+            quotes += pending.count('"', position - start)
+        scanned = len(pending)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRecord]:
+    """
+    Yield (record, error) pairs from a CSV body with a header row
+    Each record maps header names to the raw string values; blank lines are
+    skipped and rows with the wrong number of fields become inline errors.
+    """
+    header: Optional[List[str]] = None
+    async for line in _iter_csv_lines(_iter_text(chunks)):
+        if len(line) > MAX_RECORD_CHARS:
+            yield None, f"Record exceeds {MAX_RECORD_CHARS} characters"
+            continue
+        if not line.strip():
+            continue
+        try:
+            fields = next(csv.reader([line.rstrip('\r\n')], strict=True))
+        except csv.Error as error:
+            yield None, f"Invalid CSV: {error}"
+            continue
+        if header is None:
+            header = [name.strip().lstrip('\ufeff') for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield None, f"Invalid CSV: expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield dict(zip(header, fields)), None
+
+
+def is_csv_content_type(content_type: Optional[str]) -> bool:
+    """True for text/csv (and the application/csv variant some clients send)"""
+    media_type = (content_type or '').split(';', 1)[0].strip().lower()
+    return media_type in (CSV_MEDIA_TYPE, 'application/csv')
+
+
+async def iter_upload_records(chunks: AsyncIterator[bytes], content_type: Optional[str]) -> AsyncIterator[ParsedRecord]:
+    """CSV records for CSV content types, JSON array / NDJSON records otherwise"""
+    records = iter_csv_records(chunks) if is_csv_content_type(content_type) else iter_json_records(chunks)
+    async for item in records:
+        yield item
+
+
+async def iter_chunks(records: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    """Group an async stream into lists of at most `size` items"""
+    chunk: List[Any] = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
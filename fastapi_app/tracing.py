@@ -0,0 +1,137 @@
+"""
+Calculation Tracing
+Opt-in, sampled debug traces for the calculation hot path
+
+Traces are off by default. When enabled, one in every `sample_rate` requests
+is traced, and messages use logging's lazy %-style arguments so nothing is
+formatted unless a handler actually emits the record.
+
+Environment configuration (read once at import, so a deployed function can
+turn tracing up by changing its environment, without a code change):
+    CALC_TRACE=1                  enable tracing
+    CALC_TRACE_SAMPLE_RATE=100    trace 1 in 100 requests (default 1 = every request)
+    CALC_TRACE_LEVEL=DEBUG        level trace lines are logged at (name or number);
+                                  INFO gets them past handlers filtering out DEBUG
+
+The trace logger's own level is left to the host's logging configuration;
+only an explicitly given trace level lowers it when it would drop the trace
+lines. A running server switches tracing with GET/POST /trace, which calls
+configure_tracing() (per process: each worker has its own tracer).
+"""
+
+import itertools
+import logging
+import os
+from typing import Any, Optional
+
+TRACE_LOGGER_NAME = "fastapi_app.trace"
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def parse_level(value: str) -> Optional[int]:
+    """Logging level from a name ('INFO') or number ('20'); None if invalid"""
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else None
+
+
+def _env_level(name: str) -> Optional[int]:
+    value = os.getenv(name, "").strip()
+    return parse_level(value) if value else None
+
+
+class CalculationTracer:
+    """
+    Sampled trace emitter
+
+    Usage on a hot path:
+        if tracer.sample():
+            tracer.trace('Formula ID: %s', formula_id)
+    When tracing is disabled sample() is a single attribute check.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: int = 1,
+        logger: Optional[logging.Logger] = None,
+        level: Optional[int] = None
+    ):
+        self.logger = logger or logging.getLogger(TRACE_LOGGER_NAME)
+        self._counter = itertools.count()
+        self.enabled = False
+        self.sample_rate = 1
+        self.level = logging.DEBUG
+        self.configure(enabled=enabled, sample_rate=sample_rate, level=level)
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        sample_rate: Optional[int] = None,
+        level: Optional[int] = None
+    ) -> None:
+        """
+        Switch tracing on/off or change the sampling rate or trace level at runtime
+        A given level also lowers the trace logger's level if it would drop trace lines.
+        """
+        if sample_rate is not None:
+            if sample_rate < 1:
+                raise ValueError("sample_rate must be at least 1")
+            self.sample_rate = sample_rate
+        if level is not None:
+            self.level = level
+            if not self.logger.isEnabledFor(level):
+                self.logger.setLevel(level)
+        if enabled is not None:
+            self.enabled = enabled
+
+    def sample(self) -> bool:
+        """Decide whether the current request should be traced"""
+        if not self.enabled:
+            return False
+        if self.sample_rate > 1 and next(self._counter) % self.sample_rate:
+            return False
+        return self.logger.isEnabledFor(self.level)
+
+    def trace(self, message: str, *args: Any) -> None:
+        """Emit a trace line; formatting is deferred to the logging handler"""
+        self.logger.log(self.level, message, *args)
+
+    def status(self) -> dict:
+        """Current tracing configuration"""
+        return {'enabled': self.enabled, 'sample_rate': self.sample_rate, 'level': logging.getLevelName(self.level)}
+
+
+def create_default_tracer() -> CalculationTracer:
+    """Build the tracer from environment configuration"""
+    return CalculationTracer(
+        enabled=_env_flag("CALC_TRACE"),
+        sample_rate=max(1, _env_int("CALC_TRACE_SAMPLE_RATE", 1)),
+        level=_env_level("CALC_TRACE_LEVEL")
+    )
+
+
+# Process-wide tracer used by the calculation engine
+tracer = create_default_tracer()
+
+
+def configure_tracing(
+    enabled: Optional[bool] = None,
+    sample_rate: Optional[int] = None,
+    level: Optional[int] = None
+) -> dict:
+    """Reconfigure the process-wide tracer and return its new status"""
+    tracer.configure(enabled=enabled, sample_rate=sample_rate, level=level)
+    return tracer.status()
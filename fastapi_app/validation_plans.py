@@ -0,0 +1,177 @@
+"""
+Validation Plans
+Per-formula input validation compiled once from FormulaConfig
+
+Each plan precomputes the required input names, numeric checks, min/max
+bounds, compiled regex patterns and option-code specific checks of a formula,
+and runs them as a single closure. Messages and ordering match the original
+CalculationEngine.validate_inputs / addFormulaSpecificValidations logic.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .finance_models import FormulaConfig, FormulaInputType, FormulaValidationResult
+
+# (errors, warnings, missing_inputs)
+ValidationOutcome = Tuple[List[str], List[str], List[str]]
+SpecificCheck = Callable[[Dict[str, Any], List[str], List[str]], None]
+
+NUMERIC_TYPES = (int, float)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, NUMERIC_TYPES)
+
+
+# ============================================================================
+# FORMULA-SPECIFIC CHECKS (migrated from addFormulaSpecificValidations)
+# ============================================================================
+
+def _check_outstanding_exceeds_evic(inputs: Dict[str, Any], errors: List[str], warnings: List[str]) -> None:
+    """Option 1a/1b: outstanding amount should not exceed EVIC"""
+    outstanding_amount = inputs.get('outstanding_amount', 0)
+    evic = inputs.get('evic', 0)
+    if (outstanding_amount and evic and _is_number(outstanding_amount) and _is_number(evic)
+            and outstanding_amount > evic):
+        warnings.append('Outstanding amount exceeds EVIC - please verify data')
+
+
+def _check_energy_emissions_magnitude(inputs: Dict[str, Any], errors: List[str], warnings: List[str]) -> None:
+    """Option 2a: flag implausibly large activity-based emissions"""
+    energy_consumption = inputs.get('energy_consumption', 0)
+    emission_factor = inputs.get('emission_factor', 0)
+    if energy_consumption and emission_factor and _is_number(energy_consumption) and _is_number(emission_factor):
+        calculated_emissions = energy_consumption * emission_factor
+        if calculated_emissions > 1000000:  # 1 million tCO2e
+            warnings.append('Very high calculated emissions - please verify emission factors')
+
+
+def _check_outstanding_non_negative(inputs: Dict[str, Any], errors: List[str], warnings: List[str]) -> None:
+    """General: outstanding amount must be non-negative"""
+    outstanding_amount = inputs.get('outstanding_amount', 0)
+    if outstanding_amount and _is_number(outstanding_amount) and outstanding_amount < 0:
+        errors.append('Outstanding amount must be non-negative')
+
+
+def _specific_checks_for(option_code: str) -> List[SpecificCheck]:
+    """Select formula-specific checks for an option code"""
+    checks: List[SpecificCheck] = []
+    if option_code in ('1a', '1b'):
+        checks.append(_check_outstanding_exceeds_evic)
+    if option_code == '2a':
+        checks.append(_check_energy_emissions_magnitude)
+    checks.append(_check_outstanding_non_negative)
+    return checks
+
+
+# ============================================================================
+# VALIDATION PLAN
+# ============================================================================
+
+class ValidationPlan:
+    """
+    Compiled validation for a single formula
+    Call the plan with an inputs dict to get a FormulaValidationResult.
+    """
+
+    __slots__ = ('formula_id', 'required_inputs', 'evaluate')
+
+    def __init__(self, formula_id: str, required_inputs: Tuple[str, ...], evaluate: Callable[[Dict[str, Any]], ValidationOutcome]):
+        self.formula_id = formula_id
+        self.required_inputs = required_inputs
+        self.evaluate = evaluate
+
+    def __call__(self, inputs: Dict[str, Any]) -> FormulaValidationResult:
+        errors, warnings, missing_inputs = self.evaluate(inputs)
+        return FormulaValidationResult(
+            is_valid=not errors,
+            errors=errors,
+            warnings=warnings,
+            missing_inputs=missing_inputs
+        )
+
+    def evaluate_batch(self, rows: Iterable[Dict[str, Any]]) -> List[ValidationOutcome]:
+        """Evaluate many input rows, returning raw (errors, warnings, missing) tuples"""
+        evaluate = self.evaluate
+        return [evaluate(inputs) for inputs in rows]
+
+    def validate_batch(self, rows: Iterable[Dict[str, Any]]) -> List[FormulaValidationResult]:
+        """Validate many input rows for this formula"""
+        return [self(inputs) for inputs in rows]
+
+
+def compile_validation_plan(formula: FormulaConfig) -> ValidationPlan:
+    """
+    Compile a formula's input definitions into a ValidationPlan
+    """
+    required_checks: List[Tuple[str, bool, str, str]] = []
+    rule_checks: List[Tuple[str, Optional[Any], Optional[Any], Any, str, str, str]] = []
+
+    for input_field in formula.inputs:
+        label = input_field.label
+        if input_field.required:
+            required_checks.append((
+                input_field.name,
+                input_field.type == FormulaInputType.NUMBER,
+                f"{label} is required",
+                f"{label} must be a non-negative number"
+            ))
+
+        validation = input_field.validation
+        if validation:
+            minimum = validation.get('min')
+            maximum = validation.get('max')
+            pattern = re.compile(validation['pattern']) if 'pattern' in validation else None
+            rule_checks.append((
+                input_field.name,
+                minimum,
+                maximum,
+                pattern,
+                f"{label} must be at least {minimum}",
+                f"{label} must be at most {maximum}",
+                f"{label} format is invalid"
+            ))
+
+    required_checks_t = tuple(required_checks)
+    rule_checks_t = tuple(rule_checks)
+    specific_checks = tuple(_specific_checks_for(formula.option_code))
+
+    def evaluate(inputs: Dict[str, Any]) -> ValidationOutcome:
+        errors: List[str] = []
+        warnings: List[str] = []
+        missing_inputs: List[str] = []
+        get = inputs.get
+
+        # Check required inputs
+        for name, is_number, required_message, number_message in required_checks_t:
+            value = get(name)
+            if value is None:
+                missing_inputs.append(name)
+                errors.append(required_message)
+            elif is_number and (not isinstance(value, NUMERIC_TYPES) or value < 0):
+                errors.append(number_message)
+
+        # Check input validation rules
+        for name, minimum, maximum, pattern, min_message, max_message, pattern_message in rule_checks_t:
+            value = get(name)
+            if value is None:
+                continue
+            if isinstance(value, NUMERIC_TYPES):
+                if minimum is not None and value < minimum:
+                    errors.append(min_message)
+                if maximum is not None and value > maximum:
+                    errors.append(max_message)
+            elif pattern is not None and isinstance(value, str) and not pattern.match(value):
+                errors.append(pattern_message)
+
+        # Formula-specific validations
+        for check in specific_checks:
+            check(inputs, errors, warnings)
+
+        return errors, warnings, missing_inputs
+
+    return ValidationPlan(
+        formula_id=formula.id,
+        required_inputs=tuple(name for name, _, _, _ in required_checks),
+        evaluate=evaluate
+    )
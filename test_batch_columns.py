@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the columnar batch format (?format=columns on the batch endpoints)
+
+Every column has one type whatever mix of rows a chunk holds: errors are
+None exactly where success is true, warnings are always a list.
+
+Usage: python -m pytest -q test_batch_columns.py  (or run directly)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_app.main import app
+from fastapi_app.models import BatchColumnsChunk
+
+INPUTS = {"outstanding_amount": 1000000, "evic": 5000000, "verified_emissions": 1000}
+
+LINES = [
+    json.dumps({"formula_id": "1a-listed-equity", "company_type": "listed", "inputs": INPUTS}),
+    # Outstanding amount above EVIC: succeeds with a warning
+    json.dumps({"formula_id": "1a-listed-equity", "company_type": "listed",
+                "inputs": dict(INPUTS, outstanding_amount=9000000)}),
+    "{not json}",
+    json.dumps({"formula_id": "1a-listed-equity", "inputs": INPUTS}),  # no company_type
+    json.dumps({"formula_id": "no-such-formula", "company_type": "listed", "inputs": INPUTS}),
+    json.dumps({"formula_id": "1a-listed-equity", "company_type": "listed", "inputs": {"outstanding_amount": 1}}),
+]
+
+
+def test_mixed_chunk_has_fixed_column_types():
+    client = TestClient(app)
+    response = client.post("/finance-emission/batch?format=columns", content="\n".join(LINES) + "\n")
+    assert response.status_code == 200
+    lines = response.content.splitlines()
+    assert len(lines) == 1
+
+    chunk = BatchColumnsChunk.model_validate_json(lines[0], strict=True)
+    assert chunk.start == 0 and chunk.rows == len(LINES)
+    assert chunk.success == [True, True, False, False, False, False]
+    assert [error is None for error in chunk.errors] == chunk.success
+    assert chunk.warnings[0] == []
+    assert chunk.warnings[1] == ["Outstanding amount exceeds EVIC - please verify data"]
+    assert chunk.warnings[2:] == [[], [], [], []]
+    assert chunk.errors[4] == "Formula 'no-such-formula' not found"
+    assert chunk.errors[5].startswith("Validation failed")
+    assert chunk.attribution_factor[0] == 0.2 and chunk.attribution_factor[2:] == [None] * 4
+    assert chunk.data_quality_score[2:] == [0] * 4
+    assert [chunk.formula_ids[code] for code in chunk.formula_id_codes][4] == "no-such-formula"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
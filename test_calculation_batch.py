@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test the calculation engine's batch path
+
+calculate_batch matches scalar calculate row for row (success, values and
+error messages) over every registered formula, including facilitated
+formulas given their denominator as components (share_price ×
+outstanding_shares for EVIC, total_equity + total_debt).
+
+Usage: python -m pytest -q test_calculation_batch.py  (or run directly)
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app.calculation_engine import CalculationEngine
+from fastapi_app.finance_models import CalculationStepDetail, CompanyType
+
+VALUES = [1, 2.5, 1000, 7e6, 0.3, 0]
+DENOMINATORS = ('evic', 'total_equity_plus_debt', 'total_assets')
+
+
+def _company_type(name: str) -> CompanyType:
+    return CompanyType.LISTED if name == "listed" else CompanyType.PRIVATE
+
+
+def _scalar(engine: CalculationEngine, row: dict):
+    """(result, error message) from the single-row path"""
+    try:
+        return engine.calculate(row["formula_id"], row["inputs"], _company_type(row["company_type"]),
+                                CalculationStepDetail.NONE), None
+    except Exception as error:
+        return None, str(error)
+
+
+def make_rows(engine: CalculationEngine, count: int, seed: int) -> list:
+    generator = random.Random(seed)
+    formulas = sorted(engine.formulas, key=lambda formula: formula.id)
+    rows = []
+    for _ in range(count):
+        formula = generator.choice(formulas)
+        inputs = {field.name: generator.choice(VALUES) for field in formula.inputs if generator.random() < 0.97}
+        shape = generator.random()
+        if shape < 0.25:
+            # Denominator given only as its components
+            for name in DENOMINATORS:
+                inputs.pop(name, None)
+            inputs.update(share_price=generator.choice([3, 12.5, 0]), outstanding_shares=generator.choice([1e6, 4e4]),
+                          total_equity=generator.choice([8e5, 2e6]), total_debt=generator.choice([0, 5e5]))
+        elif shape < 0.35:
+            inputs.update(share_price=3, outstanding_shares=1e6)
+        elif shape < 0.45:
+            inputs.update(total_equity=8e5, total_debt=5e5)
+        if generator.random() < 0.02:
+            inputs[generator.choice(DENOMINATORS)] = "not a number"
+        rows.append({"formula_id": formula.id, "company_type": generator.choice(["listed", "unlisted"]), "inputs": inputs})
+    rows.append({"formula_id": "no-such-formula", "company_type": "listed", "inputs": {}})
+    return rows
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_batch_matches_scalar_calculate(seed):
+    engine = CalculationEngine()
+    engine.cache = None  # compare calculations, not cache hits
+    rows = make_rows(engine, 6000, seed)
+    batch = engine.calculate_batch(rows)
+    assert len(batch) == len(rows)
+
+    component_rows = 0
+    for index, row in enumerate(rows):
+        result, error = _scalar(engine, row)
+        assert bool(batch.success[index]) == (result is not None), (row, error, batch.errors[index])
+        if result is None:
+            assert batch.errors[index] == error, row
+            continue
+        assert batch.errors[index] is None
+        assert batch.attribution_factor[index] == result.attribution_factor, row
+        assert batch.emission_factor[index] == result.emission_factor, row
+        assert batch.financed_emissions[index] == result.financed_emissions, row
+        assert batch.data_quality_score[index] == result.data_quality_score, row
+        if not any(name in row["inputs"] for name in DENOMINATORS) and "share_price" in row["inputs"]:
+            component_rows += 1
+    # The component-only denominators were actually exercised
+    assert component_rows > 50
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the lazily created async Supabase clients (no network needed)
+
+- concurrent first requests on one event loop share a single client and
+  HTTP client
+- configure_database closes the HTTP clients of the clients it drops
+
+Usage: python -m pytest -q test_database_clients.py  (or run directly)
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+supabase = pytest.importorskip("supabase")
+
+from fastapi_app import database
+from fastapi_app.database import DatabaseSettings, configure_database, get_async_supabase_client
+
+SETTINGS = DatabaseSettings(url="http://127.0.0.1:9", service_role_key="test-key")
+
+
+@pytest.fixture
+def http_clients(monkeypatch):
+    """Every pooled async HTTP client created"""
+    created = []
+    create = database.create_async_http_client
+
+    def tracked(settings):
+        client = create(settings)
+        created.append(client)
+        return client
+
+    async def slow_acreate_client(*args, **kwargs):
+        await asyncio.sleep(0.01)  # let other first requests in
+        return await acreate_client(*args, **kwargs)
+
+    acreate_client = supabase.acreate_client
+    monkeypatch.setattr(database, "create_async_http_client", tracked)
+    monkeypatch.setattr(supabase, "acreate_client", slow_acreate_client)
+    configure_database(SETTINGS)
+    yield created
+    configure_database(None)
+
+
+def test_concurrent_first_requests_share_one_client(http_clients):
+    async def main():
+        return await asyncio.gather(*(get_async_supabase_client() for _ in range(8)))
+
+    clients = asyncio.run(main())
+    assert all(client is clients[0] for client in clients)
+    assert len(http_clients) == 1
+
+
+def test_configure_database_closes_dropped_clients(http_clients):
+    async def main():
+        await get_async_supabase_client()
+        configure_database(SETTINGS)
+        await asyncio.sleep(0.05)
+        await get_async_supabase_client()
+
+    asyncio.run(main())
+    assert len(http_clients) == 2
+    assert http_clients[0].is_closed
+    assert not http_clients[1].is_closed
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test the calculation result cache
+
+Cached results are reused for equal inputs, dropped when the formula
+registry changes, and failures are never cached.
+
+Usage: python -m pytest -q test_result_cache.py  (or run directly)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app.calculation_engine import CalculationEngine
+from fastapi_app.finance_models import CompanyType
+from fastapi_app.formula_registry import FormulaRegistry, load_default_formulas
+from fastapi_app.result_cache import ResultCache
+
+
+def test_cache_is_invalidated_when_registry_changes():
+    registry = FormulaRegistry(load_default_formulas())
+    cache = ResultCache(max_entries=100)
+    engine = CalculationEngine(registry=registry, cache=cache)
+    inputs = {"outstanding_amount": 1000000, "evic": 5000000, "verified_emissions": 1000}
+
+    first = engine.calculate("1a-listed-equity", inputs, CompanyType.LISTED)
+    again = engine.calculate("1a-listed-equity", dict(inputs), CompanyType.LISTED)
+    assert again == first
+    assert cache.stats()["hits"] == 1
+
+    formula = registry.get("1a-listed-equity")
+    registry.register([formula.model_copy(update={"data_quality_score": 5})])
+    changed = engine.calculate("1a-listed-equity", inputs, CompanyType.LISTED)
+    assert changed.data_quality_score == 5
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
+    assert stats["registry_version"] == registry.version
+
+    # Failures are never cached
+    with pytest.raises(ValueError):
+        engine.calculate("1a-listed-equity", {"outstanding_amount": 1}, CompanyType.LISTED)
+    assert cache.stats()["entries"] == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
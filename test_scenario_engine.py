@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the scenario engine against the original per-entry calculation
+
+calculate_scenario per-entry results are bit-identical to the original
+per-entry loop, and totals are its exactly rounded sums.
+
+Usage: python -m pytest -q test_scenario_engine.py  (or run directly)
+"""
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app.models import PortfolioEntry
+from fastapi_app.scenario_engine import ScenarioEngine
+
+SCENARIO_TYPES = ("transition", "physical", "combined")
+
+SECTORS = [
+    "Power Generation – Fossil Fuel", "power generation - fossil fuel", "Renewable Energy", "Technology",
+    "Agriculture", "Real Estate (Commercial)", "Financial Services", "Unknown sector", "Mining & Metals",
+]
+
+
+def make_entries(count: int, seed: int = 1, prefix: str = "e") -> list:
+    generator = random.Random(seed)
+    return [
+        PortfolioEntry(
+            id=f"{prefix}{index}",
+            company=f"Company {index}",
+            amount=generator.choice([0.0, 1.0, 250_000.0, generator.uniform(1e3, 5e8)]),
+            counterparty=generator.choice(["Bank A", "Bank B", "Fund C"]),
+            sector=generator.choice(SECTORS),
+            geography=generator.choice(["PK", "AE", "GB"]),
+            probability_of_default=generator.choice([0.0, generator.uniform(0.01, 30.0)]),
+            loss_given_default=generator.choice([0.0, 100.0, generator.uniform(1.0, 95.0)]),
+            tenor=generator.randint(1, 240),
+        )
+        for index in range(count)
+    ]
+
+
+def reference_results(engine: ScenarioEngine, entries: list, scenario_type: str) -> list:
+    """The original per-entry loop, value for value"""
+    results = []
+    for entry in entries:
+        multipliers = engine.get_sector_multipliers(entry.sector)
+        if scenario_type == "transition":
+            pd_multiplier = multipliers["transition_pd_multiplier"]
+            lgd_change_transition = multipliers["lgd_change"] / 100.0
+            lgd_change_physical = 0.0
+        elif scenario_type == "physical":
+            pd_multiplier = multipliers["physical_pd_multiplier"]
+            lgd_change_transition = 0.0
+            lgd_change_physical = multipliers["lgd_change"] / 100.0
+        else:
+            pd_multiplier = multipliers["transition_pd_multiplier"] * multipliers["physical_pd_multiplier"]
+            lgd_change_transition = multipliers["lgd_change"] / 100.0
+            lgd_change_physical = multipliers["lgd_change"] / 100.0
+        baseline_pd_decimal = entry.probability_of_default / 100.0
+        baseline_lgd_decimal = entry.loss_given_default / 100.0
+        adjusted_pd = baseline_pd_decimal * pd_multiplier
+        adjusted_lgd = min(baseline_lgd_decimal + lgd_change_transition + lgd_change_physical, 1.0)
+        baseline_expected_loss = entry.amount * baseline_pd_decimal * baseline_lgd_decimal
+        climate_adjusted_expected_loss = entry.amount * adjusted_pd * adjusted_lgd
+        loss_increase = climate_adjusted_expected_loss - baseline_expected_loss
+        results.append({
+            "company": entry.company,
+            "sector": entry.sector,
+            "exposure": entry.amount,
+            "baseline_pd": entry.probability_of_default,
+            "baseline_lgd": entry.loss_given_default,
+            "pd_multiplier": pd_multiplier,
+            "adjusted_pd": adjusted_pd * 100.0,
+            "lgd_change": multipliers["lgd_change"],
+            "adjusted_lgd": adjusted_lgd * 100.0,
+            "climate_adjusted_expected_loss": climate_adjusted_expected_loss,
+            "baseline_expected_loss": baseline_expected_loss,
+            "loss_increase": loss_increase,
+            "loss_increase_percentage": (
+                loss_increase / baseline_expected_loss * 100.0 if baseline_expected_loss > 0 else 0.0
+            ),
+        })
+    return results
+
+
+@pytest.mark.parametrize("scenario_type", SCENARIO_TYPES)
+def test_scenario_columns_match_per_entry_loop(scenario_type):
+    engine = ScenarioEngine()
+    entries = make_entries(3000)
+    response = engine.calculate_scenario(entries, scenario_type)
+    assert response.success, response.error
+
+    expected = reference_results(engine, entries, scenario_type)
+    # == on floats: bit-identical apart from signed zeros
+    assert [result.model_dump() for result in response.results] == expected
+
+    assert response.total_exposure == math.fsum(row["exposure"] for row in expected)
+    assert response.total_baseline_expected_loss == math.fsum(row["baseline_expected_loss"] for row in expected)
+    assert response.total_climate_adjusted_expected_loss == math.fsum(
+        row["climate_adjusted_expected_loss"] for row in expected
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test incremental scenario sessions
+
+- deltas are atomic: a rejected delta leaves the session unchanged
+- totals and group totals after any sequence of deltas equal a fresh
+  calculation
+
+Usage: python -m pytest -q test_scenario_session.py  (or run directly)
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app.models import PortfolioDelta
+from fastapi_app.scenario_engine import ScenarioEngine
+from fastapi_app.scenario_session import ScenarioSession
+from test_scenario_engine import SCENARIO_TYPES, SECTORS, make_entries
+
+
+def _session_state(session: ScenarioSession) -> dict:
+    snapshot = session.snapshot().model_dump()
+    snapshot.pop("version")
+    return snapshot
+
+
+def test_session_rejected_delta_leaves_session_unchanged():
+    engine = ScenarioEngine()
+    entries = make_entries(50)
+    session = ScenarioSession(engine, SCENARIO_TYPES, ["sector", "tenor_bucket"])
+    session.apply_delta(PortfolioDelta(add=entries))
+    before, version = _session_state(session), session.version
+
+    rejected = [
+        PortfolioDelta(add=[entries[0]]),  # already in the session
+        PortfolioDelta(update=[make_entries(1, prefix="missing")[0]]),  # not in the session
+        PortfolioDelta(remove=["e1", "nope"]),  # one valid, one missing
+        PortfolioDelta(update=[entries[2]], remove=["e2"]),  # same id twice
+        PortfolioDelta(add=make_entries(3, seed=9, prefix="new"), remove=["e3", "missing"]),
+    ]
+    for delta in rejected:
+        with pytest.raises(ValueError):
+            session.apply_delta(delta)
+        assert session.version == version
+        assert _session_state(session) == before
+
+
+def test_session_totals_match_fresh_calculation():
+    engine = ScenarioEngine()
+    generator = random.Random(5)
+    current = {entry.id: entry for entry in make_entries(400)}
+    session = ScenarioSession(engine, SCENARIO_TYPES, ["sector"])
+    session.apply_delta(PortfolioDelta(add=list(current.values())))
+
+    for step in range(30):
+        ids = list(current)
+        removed = generator.sample(ids, 15)
+        updated = [
+            entry.model_copy(update={"amount": entry.amount * 2 + 1, "sector": generator.choice(SECTORS)})
+            for entry in (current[entry_id] for entry_id in generator.sample([i for i in ids if i not in removed], 15))
+        ]
+        added = make_entries(20, seed=100 + step, prefix=f"s{step}-")
+        session.apply_delta(PortfolioDelta(add=added, update=updated, remove=removed))
+        for entry_id in removed:
+            del current[entry_id]
+        current.update((entry.id, entry) for entry in updated + added)
+
+    snapshot = session.snapshot()
+    assert snapshot.entries == len(current)
+    for scenario_type in SCENARIO_TYPES:
+        fresh = engine.calculate_scenario(list(current.values()), scenario_type, group_by=["sector"])
+        assert snapshot.total_exposure == fresh.total_exposure
+        assert snapshot.total_baseline_expected_loss == fresh.total_baseline_expected_loss
+        totals = snapshot.totals[scenario_type]
+        assert totals.total_climate_adjusted_expected_loss == fresh.total_climate_adjusted_expected_loss
+        session_groups = {group.group: group for group in snapshot.groups[scenario_type]["sector"]}
+        fresh_groups = {group.group: group for group in fresh.groups["sector"]}
+        assert session_groups == fresh_groups
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test streamed scenario totals
+
+Totals and group_by aggregates accumulated chunk by chunk are exactly the
+totals of POST /scenario/calculate for the same portfolio, whatever the
+chunk size.
+
+Usage: python -m pytest -q test_scenario_stream.py  (or run directly)
+"""
+
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app.scenario_arrays import CompensatedAccumulator
+from fastapi_app.scenario_engine import ScenarioEngine
+from fastapi_app.scenario_stream import ScenarioStream
+from test_scenario_engine import SCENARIO_TYPES, make_entries
+
+GROUP_BY = ["sector", "tenor_bucket"]
+
+
+def test_chunked_accumulator_is_exactly_rounded():
+    generator = random.Random(3)
+    values = [generator.uniform(-1.0, 1.0) * 10.0 ** generator.randint(-20, 20) for _ in range(20_000)]
+    accumulator = CompensatedAccumulator()
+    position = 0
+    while position < len(values):
+        size = generator.randint(1, 500)
+        accumulator.add(values[position:position + size])
+        position += size
+    assert accumulator.total == math.fsum(values)
+
+
+@pytest.mark.parametrize("scenario_type", SCENARIO_TYPES)
+@pytest.mark.parametrize("chunk_size", [1, 37, 5000])
+def test_stream_summary_matches_calculate(scenario_type, chunk_size):
+    engine = ScenarioEngine()
+    entries = make_entries(2000, seed=11)
+    records = [(entry.model_dump(), None) for entry in entries]
+
+    stream = ScenarioStream(engine, scenario_type, group_by=GROUP_BY)
+    for start in range(0, len(records), chunk_size):
+        stream.process_chunk(records[start:start + chunk_size], start)
+    summary = stream.summary()["summary"]
+
+    response = engine.calculate_scenario(entries, scenario_type, group_by=GROUP_BY)
+    assert summary["entries"] == len(entries)
+    assert summary["total_exposure"] == response.total_exposure
+    assert summary["total_baseline_expected_loss"] == response.total_baseline_expected_loss
+    assert summary["total_climate_adjusted_expected_loss"] == response.total_climate_adjusted_expected_loss
+    for field in GROUP_BY:
+        assert summary["groups"][field] == [group.model_dump() for group in response.groups[field]]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test JSON response serialization
+
+- NaN / Infinity floats are written as null, with or without orjson
+- the standard json fallback and orjson produce equivalent JSON
+
+Usage: python -m pytest -q test_serialization.py  (or run directly)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from fastapi_app import serialization
+
+VALUE = {
+    "total": 1e16,
+    "missing": float("nan"),
+    "bounds": [float("inf"), -float("inf"), 0.5],
+    "rows": ({"name": "ünïcode ✓", "value": 3}, None),
+}
+
+EXPECTED = {
+    "total": 1e16,
+    "missing": None,
+    "bounds": [None, None, 0.5],
+    "rows": [{"name": "ünïcode ✓", "value": 3}, None],
+}
+
+
+def test_non_finite_floats_are_null_without_orjson(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+    encoded = serialization.dumps_json(VALUE)
+    # Strict parse: NaN / Infinity literals would be rejected
+    assert json.loads(encoded, parse_constant=pytest.fail) == EXPECTED
+
+
+def test_fallback_matches_orjson(monkeypatch):
+    if serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    with_orjson = serialization.dumps_json(VALUE)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(serialization.dumps_json(VALUE)) == json.loads(with_orjson) == EXPECTED
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the streaming request-body parsers (JSON array, NDJSON, CSV)
+
+Every body is parsed whole, as one chunk (how Mangum delivers it) and split
+at every possible byte boundary, and the records must come out the same.
+
+Usage: python -m pytest -q test_streaming_parsers.py  (or run directly)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi_app.streaming import MAX_RECORD_CHARS, iter_csv_records, iter_json_records
+
+RECORDS = [
+    {"formula_id": "1a-listed-equity", "company_type": "listed", "inputs": {"evic": 5000000}},
+    {"formula_id": "ünïcode ✓", "company_type": "unlisted", "inputs": {"note": "a \"quoted\" [value], {x}"}},
+    {"formula_id": "2b", "company_type": "listed", "inputs": {}},
+]
+
+CSV_BODY = (
+    '﻿id,company,note\r\n'
+    '1,Acme,plain\r\n'
+    '\r\n'
+    '2,"Quote ""Co""","multi\nline, with comma"\n'
+    '3,Ünïcode ✓,last'
+)
+
+CSV_EXPECTED = [
+    ({"id": "1", "company": "Acme", "note": "plain"}, None),
+    ({"id": "2", "company": 'Quote "Co"', "note": "multi\nline, with comma"}, None),
+    ({"id": "3", "company": "Ünïcode ✓", "note": "last"}, None),
+]
+
+
+def _parse(parser, chunks):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in parser(body())]
+
+    return asyncio.run(collect())
+
+
+def _splits(data: bytes):
+    """The body as one chunk, then split in two at every byte offset"""
+    yield [data]
+    for offset in range(1, len(data)):
+        yield [data[:offset], data[offset:]]
+
+
+def test_json_array_chunk_boundaries():
+    body = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode()
+    expected = [(record, None) for record in RECORDS]
+    for chunks in _splits(body):
+        assert _parse(iter_json_records, chunks) == expected
+
+
+def test_ndjson_chunk_boundaries():
+    body = ("\n".join(json.dumps(record, ensure_ascii=False) for record in RECORDS) + "\n\n").encode()
+    expected = [(record, None) for record in RECORDS]
+    for chunks in _splits(body):
+        assert _parse(iter_json_records, chunks) == expected
+
+
+def test_ndjson_invalid_line_is_inline_error():
+    records = _parse(iter_json_records, [b'{"a": 1}\n{not json}\n{"b": 2}\n'])
+    assert [record for record, _ in records] == [{"a": 1}, None, {"b": 2}]
+    assert records[1][1] is not None
+
+
+def test_csv_chunk_boundaries():
+    body = CSV_BODY.encode()
+    for chunks in _splits(body):
+        assert _parse(iter_csv_records, chunks) == CSV_EXPECTED
+    # one byte per chunk
+    assert _parse(iter_csv_records, [body[i:i + 1] for i in range(len(body))]) == CSV_EXPECTED
+
+
+def test_csv_wrong_field_count_is_inline_error():
+    records = _parse(iter_csv_records, [b'a,b\n1,2\n1,2,3\n4,5\n'])
+    assert records[0] == ({"a": "1", "b": "2"}, None)
+    assert records[1][0] is None and "expected 2 fields" in records[1][1]
+    assert records[2] == ({"a": "4", "b": "5"}, None)
+
+
+def test_csv_unterminated_quote_is_bounded():
+    body = b'a,b\n1,"' + b'x' * (MAX_RECORD_CHARS + 10)
+    records = _parse(iter_csv_records, [body])
+    assert records and records[0][0] is None
+
+
+def test_csv_large_single_chunk_is_linear():
+    """A whole upload in one chunk must not rescan the buffer per record"""
+    def parse_rows(rows: int) -> float:
+        body = ("id,company,amount\n" + "".join(f"{i},Company {i},{i * 1.5}\n" for i in range(rows))).encode()
+        start = time.perf_counter()
+        records = _parse(iter_csv_records, [body])
+        elapsed = time.perf_counter() - start
+        assert len(records) == rows
+        assert records[-1] == ({"id": str(rows - 1), "company": f"Company {rows - 1}", "amount": str((rows - 1) * 1.5)}, None)
+        return elapsed
+
+    small = parse_rows(25_000)
+    large = parse_rows(200_000)
+    # 8x the rows: linear is ~8x, the quadratic splitter was ~50x+
+    assert large < small * 20 + 0.5, (small, large)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
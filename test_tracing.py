@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test calculation tracing configuration
+
+- the trace logger's level is only changed when a trace level is given
+- POST /trace switches tracing in a running app
+
+Usage: python -m pytest -q test_tracing.py  (or run directly)
+"""
+
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_app.main import app
+from fastapi_app.tracing import CalculationTracer, tracer
+
+
+def test_host_logger_level_is_kept_unless_level_given():
+    logger = logging.getLogger("test_tracing.host")
+    logger.setLevel(logging.WARNING)
+    traced = CalculationTracer(enabled=True, logger=logger)
+    assert logger.level == logging.WARNING
+    assert not traced.sample()  # DEBUG lines would be dropped by the host's level
+
+    traced.configure(level=logging.INFO)
+    assert logger.level == logging.INFO
+    assert traced.sample()
+
+    traced.configure(level=logging.ERROR)  # already enabled: not raised
+    assert logger.level == logging.INFO
+
+
+def test_trace_endpoint_switches_tracing():
+    client = TestClient(app)
+    before = client.get("/trace").json()
+    try:
+        response = client.post("/trace", json={"enabled": True, "sample_rate": 10, "level": "info"})
+        assert response.json() == {"enabled": True, "sample_rate": 10, "level": "INFO"}
+        assert tracer.enabled and tracer.sample_rate == 10 and tracer.level == logging.INFO
+
+        assert client.post("/trace", json={"level": "loud"}).status_code == 422
+        assert client.post("/trace", json={"sample_rate": 0}).status_code == 422
+        assert client.post("/trace", json={"enabled": False}).json()["sample_rate"] == 10
+    finally:
+        tracer.configure(enabled=before["enabled"], sample_rate=before["sample_rate"],
+                         level=logging.getLevelName(before["level"]))
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))